@@ -0,0 +1,19 @@
+from redis.asyncio import Redis
+
+from app import getLogger
+from app.settings import config
+
+logging = getLogger("RedisClient")
+
+
+async def get_redis_injection():
+    """Клиент Redis брокера для DI.
+
+    Для прямой работы с Redis Streams: XREADGROUP, XACK, XAUTOCLAIM.
+    """
+    client = Redis.from_url(config.broker.uri.get_secret_value())
+    try:
+        yield client
+    finally:
+        await client.aclose()
+        logging.info("Disconnected from Redis")
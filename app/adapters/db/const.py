@@ -6,5 +6,7 @@ class MongoCollections:
     events = "events"
     rules = "rules"
     users = "users"
+    metrics = "metrics"
     index_metrics = "index_metrics"
     profiler_stat = "profiler_stat"
+    event_catalogue = "event_catalogue"
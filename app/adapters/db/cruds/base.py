@@ -2,12 +2,30 @@ from datetime import datetime, timezone
 from typing import Any, Dict, Generic, List, TypeVar
 
 from bson.objectid import ObjectId
+from pymongo import (
+    DeleteMany,
+    DeleteOne,
+    InsertOne,
+    ReplaceOne,
+    UpdateMany,
+    UpdateOne,
+)
 from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.write_concern import WriteConcern
+from pymongo.errors import BulkWriteError
 from pymongo.results import DeleteResult, InsertOneResult, UpdateResult
 
 from app import getLogger
+from app.adapters.db.utils.pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+    merge_filters,
+)
 from app.adapters.schemas.base import BaseSchema
 from app.entities.base import DataBaseEntity
+from app.entities.bulk import BulkResult
+from app.entities.page import Page
 from app.utils.decorators import insert_created_updated
 from app.utils.type_hints import ItemID
 
@@ -17,6 +35,12 @@ logging = getLogger(__name__)
 S_in = TypeVar("S_in", bound=BaseSchema)
 S_out = TypeVar("S_out", bound=DataBaseEntity)
 
+DUPLICATE_KEY_ERROR = 11000
+
+WriteOperation = (
+    InsertOne | UpdateOne | UpdateMany | ReplaceOne | DeleteOne | DeleteMany
+)
+
 
 class BaseCRUD(Generic[S_in, S_out]):
     _in: type[S_in]
@@ -28,7 +52,16 @@ class BaseCRUD(Generic[S_in, S_out]):
         self.table = self.db[self._table]
 
     @insert_created_updated
-    async def create(self, data: S_in | dict[str, Any]) -> S_out:
+    async def create(self, data: S_in | dict[str, Any], verify: bool = False) -> S_out:
+        """Создание документа.
+
+        По умолчанию сущность собирается из отправленного документа
+        и сгенерированного _id, без повторного чтения из MongoDB.
+
+        Args:
+            data (S_in | dict[str, Any]): данные документа
+            verify (bool): перечитать документ из MongoDB (копия с сервера)
+        """
         if not data:
             # TODO: raise exception NotFoundError
             return None
@@ -38,6 +71,9 @@ class BaseCRUD(Generic[S_in, S_out]):
 
         item: InsertOneResult = await self.table.insert_one(data)
 
+        if not verify:
+            return self._out.from_dict({**data, "_id": item.inserted_id})
+
         created_doc = await self.table.find_one({"_id": item.inserted_id})
         if not created_doc:
             # TODO: raise exception DataNotCreated
@@ -76,6 +112,65 @@ class BaseCRUD(Generic[S_in, S_out]):
 
         return [self._out.from_dict(doc) for doc in documents]
 
+    async def get_page(
+        self,
+        filters: dict[str, Any] | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        sort: list[tuple[str, int]] | None = None,
+        cursor: str | None = None,
+    ) -> Page[S_out]:
+        """Страница документов с токеном продолжения.
+
+        С cursor выборка начинается сразу после последней строки
+        предыдущей страницы (keyset), поэтому глубокая страница стоит
+        столько же, сколько первая. Без cursor работает как get_all
+        со смещением.
+
+        Args:
+            filters (dict[str, Any] | None): MongoDB фильтр
+            limit (int | None): размер страницы
+            offset (int | None): номер страницы, начинается с 1. Игнорируется с cursor
+            sort (list[tuple[str, int]] | None): сортировка, учитывается первое поле
+            cursor (str | None): токен из предыдущей страницы
+
+        Raises:
+            InvalidCursorError: токен поврежден или выдан для другой сортировки
+
+        Returns:
+            Page[S_out]:
+        """
+        sort_field, sort_order = (sort or [("_id", 1)])[0]
+        filters = filters or {}
+        previous = None
+
+        if cursor:
+            previous = decode_cursor(cursor, sort_field, sort_order)
+            position = keyset_filter(sort_field, sort_order, previous)
+            filters = merge_filters(filters, position)
+            offset = None
+
+        db_cursor = self.table.find(filters).sort([(sort_field, sort_order)])
+        if offset is not None:
+            # оффсет начинается с 1 (первая страница на вебе)
+            db_cursor = db_cursor.skip(offset - 1)
+
+        if limit is None:
+            documents = await db_cursor.to_list(length=None)
+            return Page(items=[self._out.from_dict(doc) for doc in documents])
+
+        # Лишний документ показывает, есть ли следующая страница
+        documents = await db_cursor.limit(limit + 1).to_list(length=limit + 1)
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            next_cursor = encode_cursor(sort_field, sort_order, documents, previous)
+
+        return Page(
+            items=[self._out.from_dict(doc) for doc in documents],
+            next_cursor=next_cursor,
+        )
+
     async def update(self, item_id: ItemID, data: dict[str, Any]) -> S_out:
         item_id = self.convert_id_to_ObjectId(item_id)
         data["updated_at"] = datetime.now(timezone.utc)
@@ -105,14 +200,162 @@ class BaseCRUD(Generic[S_in, S_out]):
         return count > 0
 
     @insert_created_updated
-    async def bulk_create(self, data_list: List[Dict[str, Any]]) -> List[str]:
-        """Массовое создание документов"""
+    async def bulk_create(
+        self,
+        data_list: List[Dict[str, Any]],
+        ordered: bool = True,
+        skip_duplicates: bool = False,
+        write_concern: WriteConcern | None = None,
+    ) -> List[str]:
+        """Массовое создание документов
+
+        Args:
+            data_list (List[Dict[str, Any]]): документы для вставки
+            ordered (bool): при False MongoDB вставляет документы параллельно
+                и не останавливается на первой ошибке
+            skip_duplicates (bool): документы, нарушившие уникальный индекс,
+                пропускаются, остальные ошибки пробрасываются
+            write_concern (WriteConcern | None): подтверждение записи
+                вместо заданного для клиента (w: majority)
+
+        Returns:
+            List[str]: _id вставленных документов
+        """
         if not data_list:
             return []
 
-        result = await self.table.insert_many(data_list)
+        table = self.table
+        if write_concern is not None:
+            table = table.with_options(write_concern=write_concern)
+
+        try:
+            result = await table.insert_many(data_list, ordered=ordered)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if not skip_duplicates or any(
+                error.get("code") != DUPLICATE_KEY_ERROR for error in errors
+            ):
+                raise
+
+            # insert_many проставляет _id в документы до отправки,
+            # вставлены все, кроме дублей (и, для ordered, всех после первого)
+            failed = {error["index"] for error in errors}
+            last = min(failed) if ordered else len(data_list)
+            logging.debug(
+                f"Table: <{self._table}>. Skipped {len(failed)} duplicates"
+            )
+            return [
+                str(doc["_id"])
+                for index, doc in enumerate(data_list[:last])
+                if index not in failed
+            ]
+
         return [str(obj_id) for obj_id in result.inserted_ids]
 
+    async def bulk_create_entities(
+        self,
+        data_list: List[Dict[str, Any]],
+        ordered: bool = True,
+        verify: bool = False,
+    ) -> list[S_out]:
+        """Массовое создание документов с возвратом сущностей.
+
+        insert_many проставляет _id в переданные документы,
+        поэтому сущности собираются из них без повторного чтения.
+
+        Args:
+            data_list (List[Dict[str, Any]]): документы для вставки
+            ordered (bool): упорядоченная вставка
+            verify (bool): перечитать документы из MongoDB (копии с сервера)
+        """
+        ids = await self.bulk_create(data_list, ordered=ordered)
+        if verify:
+            object_ids = list(map(self.convert_id_to_ObjectId, ids))
+            return await self.get_all({"_id": {"$in": object_ids}})
+
+        inserted = set(ids)
+        return [
+            self._out.from_dict(doc)
+            for doc in data_list
+            if str(doc.get("_id")) in inserted
+        ]
+
+    async def update_many_by_ids(
+        self, item_ids: list[ItemID], data: dict[str, Any]
+    ) -> int:
+        """Одинаковое обновление для списка документов одним запросом.
+
+        Args:
+            item_ids (list[ItemID]): _id документов
+            data (dict[str, Any]): поля для $set
+
+        Returns:
+            int: к-во измененных документов
+        """
+        if not item_ids:
+            return 0
+
+        result: UpdateResult = await self.table.update_many(
+            {"_id": {"$in": list(map(self.convert_id_to_ObjectId, item_ids))}},
+            {"$set": {**data, "updated_at": datetime.now(timezone.utc)}},
+        )
+        return result.modified_count
+
+    async def bulk_update(
+        self, updates: list[tuple[ItemID, dict[str, Any]]], ordered: bool = False
+    ) -> BulkResult:
+        """Разные обновления для разных документов одной пачкой.
+
+        Args:
+            updates (list[tuple[ItemID, dict[str, Any]]]): пары (_id, поля для $set)
+            ordered (bool): остановиться на первой ошибке
+
+        Returns:
+            BulkResult: счетчики и ошибки по индексу в updates
+        """
+        now = datetime.now(timezone.utc)
+        return await self.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": self.convert_id_to_ObjectId(item_id)},
+                    {"$set": {**data, "updated_at": now}},
+                )
+                for item_id, data in updates
+            ],
+            ordered=ordered,
+        )
+
+    async def bulk_write(
+        self, operations: list[WriteOperation], ordered: bool = False
+    ) -> BulkResult:
+        """Смешанная пачка операций (InsertOne, UpdateOne, UpdateMany, DeleteOne...).
+
+        По умолчанию неупорядоченная: MongoDB выполняет все операции,
+        а ошибки отдельных операций возвращаются в BulkResult.errors
+        вместо исключения на всю пачку.
+
+        Args:
+            operations (list[WriteOperation]): операции pymongo
+            ordered (bool): остановиться на первой ошибке
+
+        Returns:
+            BulkResult: счетчики и ошибки по индексу операции
+        """
+        if not operations:
+            return BulkResult()
+
+        try:
+            result = await self.table.bulk_write(operations, ordered=ordered)
+        except BulkWriteError as e:
+            result = BulkResult.from_details(e.details)
+            logging.warning(
+                f"Table: <{self._table}>. Bulk write: {len(result.errors)} "
+                f"of {len(operations)} operations failed"
+            )
+            return result
+
+        return BulkResult.from_details(result.bulk_api_result)
+
     @staticmethod
     def convert_id_to_ObjectId(item_id: ItemID) -> ObjectId:
         if not isinstance(item_id, ObjectId):
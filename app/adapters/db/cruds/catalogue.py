@@ -0,0 +1,135 @@
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any
+
+from pymongo import UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+
+from app import getLogger
+from app.adapters.db.const import MongoCollections
+from app.adapters.db.cruds.base import BaseCRUD
+from app.adapters.db.utils.catalogue_cache import CatalogueCache
+from app.adapters.schemas.base import BaseSchema
+from app.entities.base import DataBaseEntity
+from app.utils.enums import CatalogueKindEnum
+
+logging = getLogger("CatalogueCRUD")
+
+
+class CatalogueCRUD(BaseCRUD[BaseSchema, DataBaseEntity]):
+    """Справочник типов и источников событий.
+
+    Одна запись на значение:
+    {"kind": "type", "value": "PAYMENT_FAILED", "count": 10,
+     "first_seen": ISODate, "last_seen": ISODate}
+
+    Обновляется при записи событий, поэтому чтение справочника
+    стоит O(к-во типов), а не distinct по всей коллекции events.
+    """
+
+    _in = None
+    _out = None
+    _table = MongoCollections.event_catalogue
+
+    def __init__(self, db: AsyncDatabase):
+        super().__init__(db)
+        self.cache = CatalogueCache()
+
+    async def register_events(self, events: list[dict[str, Any]]) -> None:
+        """Учесть записанные события в справочнике.
+
+        Args:
+            events (list[dict[str, Any]]): записанные документы событий
+        """
+        now = datetime.now(timezone.utc)
+        operations = []
+
+        for kind in CatalogueKindEnum:
+            counts = Counter(
+                event.get(kind) for event in events if event.get(kind)
+            )
+            operations.extend(
+                UpdateOne(
+                    {"kind": str(kind), "value": value},
+                    {
+                        "$inc": {"count": count},
+                        "$min": {"first_seen": now},
+                        "$max": {"last_seen": now},
+                    },
+                    upsert=True,
+                )
+                for value, count in counts.items()
+            )
+            self.cache.add(kind, set(counts))
+
+        if operations:
+            await self.table.bulk_write(operations, ordered=False)
+
+    async def get_values(self, kind: CatalogueKindEnum) -> list[str]:
+        """Значения справочника: сначала из кэша процесса, потом из коллекции.
+
+        Args:
+            kind (CatalogueKindEnum): вид значений
+
+        Returns:
+            list[str]: отсортированные значения
+        """
+        if (values := self.cache.get(kind)) is not None:
+            return values
+
+        cursor = self.table.find({"kind": str(kind)}, {"value": 1, "_id": 0})
+        values = [doc["value"] for doc in await cursor.to_list(length=None)]
+        if not values:
+            # Справочник еще не заполнялся: собираем его по существующим событиям
+            values = await self.rebuild(kind)
+
+        self.cache.store(kind, values)
+        return sorted(values)
+
+    async def rebuild(self, kind: CatalogueKindEnum) -> list[str]:
+        """Пересобрать справочник по коллекции events.
+
+        Тяжелая операция по всей коллекции, нужна один раз
+        для событий, записанных до появления справочника.
+
+        Args:
+            kind (CatalogueKindEnum): вид значений
+
+        Returns:
+            list[str]: значения справочника
+        """
+        logging.info(f"Rebuilding event catalogue for <{kind}>")
+        pipeline = [
+            {"$match": {str(kind): {"$type": "string"}}},
+            {
+                "$group": {
+                    "_id": f"${kind}",
+                    "count": {"$sum": 1},
+                    "first_seen": {"$min": "$created_at"},
+                    "last_seen": {"$max": "$created_at"},
+                }
+            },
+            {
+                "$project": {
+                    "_id": 0,
+                    "kind": {"$literal": str(kind)},
+                    "value": "$_id",
+                    "count": 1,
+                    "first_seen": 1,
+                    "last_seen": 1,
+                }
+            },
+            {
+                "$merge": {
+                    "into": self._table,
+                    "on": ["kind", "value"],
+                    "whenMatched": "replace",
+                    "whenNotMatched": "insert",
+                }
+            },
+        ]
+        cursor = await self.db[MongoCollections.events].aggregate(pipeline)
+        await cursor.to_list(length=None)
+
+        cursor = self.table.find({"kind": str(kind)}, {"value": 1, "_id": 0})
+        return [doc["value"] for doc in await cursor.to_list(length=None)]
@@ -1,7 +1,11 @@
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, AsyncIterator
+from uuid import uuid4
 
+from pymongo import UpdateMany
 from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.results import UpdateResult
+from pymongo.write_concern import WriteConcern
 
 from app import getLogger
 from app.adapters.db.const import MongoCollections
@@ -9,6 +13,8 @@ from app.adapters.db.cruds.base import BaseCRUD
 from app.adapters.db.utils.mongo_filter import EventFilters
 from app.adapters.schemas.events import EventCreateSchema
 from app.entities.event import Event
+from app.entities.page import Lease, Page
+from app.utils.type_hints import ItemID
 
 logging = getLogger("EventCRUD")
 
@@ -61,76 +67,164 @@ class EventCRUD(BaseCRUD[EventCreateSchema, Event]):
         logging.debug(f"Table: <{self._table}>. Found {len(res)} events since: {since}")
         return res
 
-    async def aggregate_events_by_type(self) -> list[dict[str, Any]]:
-        """Агрегация событий по типам.
+    async def bulk_create(
+        self,
+        data_list: list[dict[str, Any]],
+        ordered: bool = True,
+        skip_duplicates: bool = False,
+        write_concern: WriteConcern | None = None,
+    ) -> list[str]:
+        """Массовое создание событий.
+
+        Явный processed=False нужен частичному индексу очереди
+        постобработки: $ne и $exists в partialFilterExpression недоступны.
+        """
+        for data in data_list:
+            data.setdefault("processed", False)
+        return await super().bulk_create(
+            data_list,
+            ordered=ordered,
+            skip_duplicates=skip_duplicates,
+            write_concern=write_concern,
+        )
+
+    async def create(
+        self, data: EventCreateSchema | dict[str, Any], verify: bool = False
+    ) -> Event:
+        if isinstance(data, dict):
+            data.setdefault("processed", False)
+        return await super().create(data, verify=verify)
+
+    async def claim_unprocessed_events(
+        self, limit: int = 100, lease_seconds: float = 60.0
+    ) -> Lease[Event]:
+        """Захватить пачку необработанных событий на время lease_seconds.
+
+        Кандидаты читаются по частичному индексу idx_events_unprocessed
+        в порядке created_at, затем захватываются одним update_many
+        с тем же условием доступности. Если другой воркер успел захватить
+        часть событий, они не пройдут условие, и в пачку попадут только
+        события с нашим lease_id. Пачку, не подтвержденную до lease_until,
+        захватит следующий воркер.
+
+        Args:
+            limit (int): макс размер пачки
+            lease_seconds (float): время на обработку пачки
 
         Returns:
-            list[dict[str, Any]]:
+            Lease[Event]: lease_id для ack_events и захваченные события
         """
-        pipeline = [
+        now = datetime.now(timezone.utc)
+        lease = Lease(
+            lease_id=uuid4().hex,
+            lease_until=now + timedelta(seconds=lease_seconds),
+        )
+        available = {
+            "processed": False,
+            "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}],
+        }
+
+        cursor = (
+            self.table.find(available, {"_id": 1})
+            .sort([("created_at", 1)])
+            .limit(limit)
+        )
+        ids = [doc["_id"] for doc in await cursor.to_list(length=limit)]
+        if not ids:
+            return lease
+
+        result: UpdateResult = await self.table.update_many(
+            {"_id": {"$in": ids}, **available},
             {
-                "$group": {
-                    "_id": "$event_type",
-                    "count": {"$sum": 1},
-                    "last_event": {"$max": "$created_at"},
+                "$set": {
+                    "lease_id": lease.lease_id,
+                    "lease_until": lease.lease_until,
+                    "updated_at": now,
                 }
             },
-            {"$sort": {"count": -1}},
-        ]
+        )
+        if result.modified_count:
+            lease.items = await self.get_all(
+                {"_id": {"$in": ids}, "lease_id": lease.lease_id},
+                sort=[("created_at", 1)],
+            )
 
-        cursor = await self.table.aggregate(pipeline)
-        return await cursor.to_list(length=None)
+        logging.debug(
+            f"Lease {lease.lease_id}: claimed {len(lease.items)} of {len(ids)} events"
+        )
+        return lease
+
+    async def ack_events(
+        self,
+        lease_id: str,
+        processed_ids: list[ItemID],
+        released_ids: list[ItemID] | None = None,
+    ) -> int:
+        """Подтвердить обработку и вернуть в очередь необработанные события.
 
-    async def aggregate_daily_statistics(self, days: int = 7) -> list[dict[str, Any]]:
-        """Статистика событий по дням.
+        Одним bulk_write: обработанные отмечаются processed=True и выходят
+        из частичного индекса, отпущенные сразу доступны другим воркерам.
+        События, чья аренда истекла и перехвачена, не изменяются.
 
         Args:
-            days (int): days
+            lease_id (str): идентификатор аренды из claim_unprocessed_events
+            processed_ids (list[ItemID]): обработанные события
+            released_ids (list[ItemID] | None): события, которые надо обработать снова
 
         Returns:
-            list[dict[str, Any]]:
+            int: к-во измененных событий. Меньше переданных - аренда
+                части событий истекла, их обработает другой воркер
         """
-        since = datetime.now(timezone.utc) - timedelta(days=days)
-
-        pipeline = [
-            {"$match": {"created_at": {"$gte": since}}},
-            {
-                "$group": {
-                    "_id": {
-                        "year": {"$year": "$created_at"},
-                        "month": {"$month": "$created_at"},
-                        "day": {"$dayOfMonth": "$created_at"},
-                    },
-                    "count": {"$sum": 1},
-                    "types": {"$addToSet": "$event_type"},
-                }
-            },
-            {"$sort": {"_id": 1}},
+        now = datetime.now(timezone.utc)
+        release_lease = {"$unset": {"lease_id": "", "lease_until": ""}}
+        operations = [
+            UpdateMany(
+                {
+                    "_id": {"$in": list(map(self.convert_id_to_ObjectId, ids))},
+                    "lease_id": lease_id,
+                },
+                {"$set": {**changes, "updated_at": now}, **release_lease},
+            )
+            for ids, changes in (
+                (processed_ids, {"processed": True}),
+                (released_ids, {}),
+            )
+            if ids
         ]
+        result = await self.bulk_write(operations)
+        return result.modified
 
-        cursor = await self.table.aggregate(pipeline)
-        return await cursor.to_list(length=None)
+    async def backfill_processed_flag(self) -> int:
+        """Проставить processed=False событиям, записанным до очереди.
 
-    async def mark_as_processed(self, event_id: str) -> Event | None:
-        """Отметить событие как обработанное.
-
-        Args:
-            event_id (str): event_id
+        Разовая миграция: без явного поля событие не попадает
+        в частичный индекс и не будет захвачено воркерами.
 
         Returns:
-            Event | None:
+            int: к-во обновленных событий
         """
-        return await self.update(event_id, {"processed": True})
+        result: UpdateResult = await self.table.update_many(
+            {"processed": {"$exists": False}}, {"$set": {"processed": False}}
+        )
+        logging.info(f"Processed flag backfilled: {result.modified_count} events")
+        return result.modified_count
 
-    async def get_unprocessed_events(self) -> list[Event]:
-        """Получить необработанные события.
+    async def get_existing_event_ids(self, event_ids: list[str]) -> set[str]:
+        """Какие из event_id уже записаны (по уникальному индексу event_id).
+
+        Args:
+            event_ids (list[str]): event_id для проверки
 
         Returns:
-            list[Event]:
+            set[str]: уже записанные event_id
         """
-        return await self.get_all(
-            filters={"processed": {"$ne": True}}, sort=[("created_at", 1)]
+        if not event_ids:
+            return set()
+
+        cursor = self.table.find(
+            {"event_id": {"$in": event_ids}}, {"event_id": 1, "_id": 0}
         )
+        return {doc["event_id"] for doc in await cursor.to_list(length=None)}
 
     async def get_event_types(self) -> list[str]:
         """Получить типы событий.
@@ -138,21 +232,58 @@ class EventCRUD(BaseCRUD[EventCreateSchema, Event]):
         Returns:
             list[str]:
         """
-        res = await self.table.find({}, {"type": 1, "_id": 0}).distinct("type")
-        return res
+        return await self.table.distinct("type")
 
     async def get_event_sources(self) -> list[str]:
-        """Получить типы событий.
+        """Получить источники событий.
 
         Returns:
             list[str]:
         """
-        res = await self.table.find({}, {"source": 1, "_id": 0}).distinct("source")
-        return res
+        return await self.table.distinct("source")
+
+    async def iter_filtered_events(
+        self,
+        filter: dict[str, Any],
+        projection: dict[str, int] | None = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Потоковое чтение событий по фильтрам.
+
+        Документы отдаются по одному прямо из курсора, без to_list
+        и без сборки сущностей, поэтому память не зависит от размера выборки.
+
+        Args:
+            filter (dict[str, Any]): параметры EventFilters
+            projection (dict[str, int] | None): проекция MongoDB
+            batch_size (int): к-во документов в одном ответе сервера
+
+        Yields:
+            dict[str, Any]: сырой документ
+        """
+        filters = EventFilters(**filter)
+        cursor = self.table.find(
+            filters.to_mongo_filter(), projection, batch_size=batch_size
+        ).sort(filters.sort_options)
+
+        try:
+            async for document in cursor:
+                yield document
+        finally:
+            await cursor.close()
 
     async def get_filtered_events(
-        self, filter: dict[str, Any], pagination: dict[str, int | None]
-    ) -> list[Event]:
+        self, filter: dict[str, Any], pagination: dict[str, int | str | None]
+    ) -> Page[Event]:
+        """Получить страницу событий по фильтрам.
+
+        Args:
+            filter (dict[str, Any]): параметры EventFilters
+            pagination (dict[str, int | str | None]): limit, offset, cursor
+
+        Returns:
+            Page[Event]:
+        """
         logging.debug(f"Incoming filter: {filter}")
 
         filters = EventFilters(**filter)
@@ -163,6 +294,6 @@ class EventCRUD(BaseCRUD[EventCreateSchema, Event]):
             f"Table: <{self._table}>. Filters: {mongo_filter} Sorting: {sort}"
         )
 
-        events = await self.get_all(filters=mongo_filter, sort=sort, **pagination)
-        logging.debug(f"Found {len(events)} events")
-        return events
+        page = await self.get_page(filters=mongo_filter, sort=sort, **pagination)
+        logging.debug(f"Found {len(page.items)} events")
+        return page
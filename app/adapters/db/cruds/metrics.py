@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from pymongo import UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+
+from app import getLogger
+from app.adapters.db.const import MongoCollections
+from app.adapters.db.cruds.base import BaseCRUD
+from app.adapters.db.utils.rollup import bucket_start, rollup_events
+from app.adapters.schemas.base import BaseSchema
+from app.entities.base import DataBaseEntity
+from app.settings import config
+from app.utils.enums import MetricPeriodEnum, MetricTypeEnum
+
+logging = getLogger("MetricsCRUD")
+
+
+class MetricsCRUD(BaseCRUD[BaseSchema, DataBaseEntity]):
+    """Rollup-метрики событий по временным корзинам.
+
+    Одна запись на корзину:
+    {"metric_type": "EVENTS_COUNT", "period": "1h", "timestamp": ISODate,
+     "dimensions": {"event_type": ..., "source": ..., "severity_band": ...},
+     "value": 150, "severity_sum": 600, "last_event": ISODate,
+     "created_at": ISODate, "expires_at": ISODate}
+
+    Счетчики наращиваются при записи событий, поэтому аналитика
+    читает корзины, а не группирует всю коллекцию events.
+    """
+
+    _in = None
+    _out = None
+    _table = MongoCollections.metrics
+
+    def __init__(self, db: AsyncDatabase):
+        super().__init__(db)
+
+    async def register_events(self, events: list[dict[str, Any]]) -> None:
+        """Нарастить счетчики корзин по записанным событиям.
+
+        Args:
+            events (list[dict[str, Any]]): записанные документы событий
+        """
+        now = datetime.now(timezone.utc)
+        ttl_days = config.mongo.metrics_ttl_days
+        operations = [
+            UpdateOne(
+                {
+                    "metric_type": str(MetricTypeEnum.events_count),
+                    "period": str(key.period),
+                    "timestamp": key.timestamp,
+                    "dimensions.event_type": key.event_type,
+                    "dimensions.source": key.source,
+                    "dimensions.severity_band": str(key.severity_band),
+                },
+                {
+                    "$inc": {
+                        "value": counter.count,
+                        "severity_sum": counter.severity_sum,
+                    },
+                    "$max": {"last_event": counter.last_event},
+                    "$setOnInsert": {
+                        "created_at": now,
+                        "expires_at": key.timestamp
+                        + timedelta(days=ttl_days[key.period]),
+                    },
+                },
+                upsert=True,
+            )
+            for key, counter in rollup_events(events).items()
+        ]
+
+        if operations:
+            await self.table.bulk_write(operations, ordered=False)
+
+    async def aggregate_events_by_type(self) -> list[dict[str, Any]]:
+        """Агрегация событий по типам из дневных корзин.
+
+        Returns:
+            list[dict[str, Any]]: [{"type", "count", "last_event"}]
+        """
+        pipeline = [
+            {"$match": self._period_filter(MetricPeriodEnum.day)},
+            {
+                "$group": {
+                    "_id": "$dimensions.event_type",
+                    "count": {"$sum": "$value"},
+                    "last_event": {"$max": "$last_event"},
+                }
+            },
+            {"$sort": {"count": -1}},
+            {"$project": {"_id": 0, "type": "$_id", "count": 1, "last_event": 1}},
+        ]
+
+        cursor = await self.table.aggregate(pipeline)
+        return await cursor.to_list(length=None)
+
+    async def aggregate_daily_statistics(self, days: int = 7) -> list[dict[str, Any]]:
+        """Статистика событий по дням из дневных корзин.
+
+        Первый день берется целиком, с полуночи UTC.
+
+        Args:
+            days (int): days
+
+        Returns:
+            list[dict[str, Any]]: [{"date", "count", "types"}]
+        """
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+
+        pipeline = [
+            {
+                "$match": self._period_filter(
+                    MetricPeriodEnum.day, bucket_start(since, MetricPeriodEnum.day)
+                )
+            },
+            {
+                "$group": {
+                    "_id": "$timestamp",
+                    "count": {"$sum": "$value"},
+                    "types": {"$addToSet": "$dimensions.event_type"},
+                }
+            },
+            {"$sort": {"_id": 1}},
+            {"$project": {"_id": 0, "date": "$_id", "count": 1, "types": 1}},
+        ]
+
+        cursor = await self.table.aggregate(pipeline)
+        return await cursor.to_list(length=None)
+
+    @staticmethod
+    def _period_filter(
+        period: MetricPeriodEnum, since: datetime | None = None
+    ) -> dict[str, Any]:
+        mongo_filter = {
+            "metric_type": str(MetricTypeEnum.events_count),
+            "period": str(period),
+        }
+        if since:
+            mongo_filter["timestamp"] = {"$gte": since}
+        return mongo_filter
@@ -0,0 +1,40 @@
+from datetime import datetime, timezone
+from typing import Any
+
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.results import InsertOneResult
+
+from app import getLogger
+from app.adapters.db.const import MongoCollections
+from app.adapters.db.cruds.base import BaseCRUD
+from app.adapters.schemas.rules import RuleCreateSchema
+from app.entities.rule import Rule
+
+logging = getLogger("RuleCRUD")
+
+
+class RuleCRUD(BaseCRUD[RuleCreateSchema, Rule]):
+    _in = RuleCreateSchema
+    _out = Rule
+    _table = MongoCollections.rules
+
+    def __init__(self, db: AsyncDatabase):
+        super().__init__(db)
+
+    async def create(self, data: RuleCreateSchema | dict[str, Any]) -> Rule:
+        """Создание правила.
+
+        Без insert_created_updated: у правил нет срока жизни,
+        expires_at по severity им не нужен.
+        """
+        if isinstance(data, self._in):
+            data = data.dict()
+
+        now = datetime.now(timezone.utc)
+        data = {**data, "created_at": now, "updated_at": now}
+        item: InsertOneResult = await self.table.insert_one(data)
+        return self._out.from_dict({**data, "_id": item.inserted_id})
+
+    async def get_enabled_rules(self) -> list[Rule]:
+        """Включенные правила по убыванию приоритета (индекс enabled/priority)"""
+        return await self.get_all({"enabled": True}, sort=[("priority", -1)])
@@ -44,6 +44,19 @@ def get_events_indexes() -> List[Dict]:
             "name": "idx_events_combined_text",
             "default_language": "english",
         },
+        # 9. Идемпотентный прием: повторная доставка события не создает копию
+        {
+            "keys": [("event_id", 1)],
+            "unique": True,
+            "name": "idx_events_event_id_unique",
+        },
+        # 10. Очередь постобработки: в индексе только необработанные события,
+        # поэтому claim не зависит от размера коллекции
+        {
+            "keys": [("created_at", 1), ("lease_until", 1)],
+            "partialFilterExpression": {"processed": False},
+            "name": "idx_events_unprocessed",
+        },
     ]
 
 
@@ -75,6 +88,19 @@ def get_metrics_indexes() -> List[Dict]:
             "keys": [("expires_at", 1)],
             "expireAfterSeconds": 0,
         },
+        # 4. Ключ rollup-корзины: upsert при записи и выборка периода по времени
+        {
+            "keys": [
+                ("metric_type", 1),
+                ("period", 1),
+                ("timestamp", -1),
+                ("dimensions.event_type", 1),
+                ("dimensions.source", 1),
+                ("dimensions.severity_band", 1),
+            ],
+            "name": "idx_metrics_rollup_bucket",
+            "unique": True,
+        },
     ]
 
 
@@ -98,10 +124,20 @@ def get_index_metrics_indexes() -> List[Dict]:
     ]
 
 
+def get_event_catalogue_indexes() -> List[Dict]:
+    """Индексы для справочника типов и источников событий"""
+    return [
+        # 1. Одна запись на пару (вид, значение): ключ для upsert и $merge
+        {"keys": [("kind", 1), ("value", 1)], "unique": True},
+    ]
+
+
 # Основная конфигурация всех индексов
 COLLECTIONS_INDEXES: Dict[str, List[Dict]] = {
     MongoCollections.events: get_events_indexes(),
-    # MongoCollections.rules: get_rules_indexes(),
+    MongoCollections.metrics: get_metrics_indexes(),
+    MongoCollections.rules: get_rules_indexes(),
     # MongoCollections.users: get_users_indexes(),
     MongoCollections.index_metrics: get_index_metrics_indexes(),
+    MongoCollections.event_catalogue: get_event_catalogue_indexes(),
 }
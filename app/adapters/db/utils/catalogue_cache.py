@@ -0,0 +1,57 @@
+import time
+
+from app import getLogger
+from app.settings import config
+
+logging = getLogger("CatalogueCache")
+
+
+class CatalogueCache:
+    """Внутрипроцессный кэш справочника типов и источников событий.
+
+    Один на процесс. Значения живут catalogue_ttl_seconds, после чего
+    перечитываются из коллекции event_catalogue. Новые значения,
+    принятые этим же процессом, добавляются в кэш сразу.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._entries = {}
+        return cls._instance
+
+    @property
+    def ttl(self) -> float:
+        return config.cache.catalogue_ttl_seconds
+
+    def get(self, kind: str) -> list[str] | None:
+        """Значения справочника или None, если кэш пуст или устарел"""
+        entry = self._entries.get(kind)
+        if entry is None:
+            return None
+
+        values, loaded_at = entry
+        if time.monotonic() - loaded_at > self.ttl:
+            del self._entries[kind]
+            return None
+        return sorted(values)
+
+    def store(self, kind: str, values: list[str]):
+        self._entries[kind] = (set(values), time.monotonic())
+
+    def add(self, kind: str, values: set[str]):
+        """Добавляет новые значения, не продлевая время жизни"""
+        entry = self._entries.get(kind)
+        if entry is None:
+            return
+
+        cached, _ = entry
+        new_values = values - cached
+        if new_values:
+            logging.debug(f"New {kind} values: {new_values}")
+            cached.update(new_values)
+
+    def clear(self):
+        self._entries.clear()
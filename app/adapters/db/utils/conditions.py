@@ -0,0 +1,241 @@
+import re
+from typing import Any, Callable
+
+Predicate = Callable[[dict[str, Any]], bool]
+
+# Поля нет в документе (в отличие от поля со значением None)
+MISSING = object()
+
+
+class RuleConditionError(ValueError):
+    """Условие правила не может быть скомпилировано"""
+
+
+def compile_path(path: str) -> Callable[[dict[str, Any]], Any]:
+    """Функция чтения поля по пути через точку: "payload.amount".
+
+    Returns:
+        Callable: document -> значение поля или MISSING
+    """
+    keys = path.split(".")
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda document: document.get(key, MISSING)
+
+    def resolve(document: dict[str, Any]) -> Any:
+        value: Any = document
+        for key in keys:
+            if not isinstance(value, dict):
+                return MISSING
+            value = value.get(key, MISSING)
+            if value is MISSING:
+                return MISSING
+        return value
+
+    return resolve
+
+
+def _values(value: Any) -> list[Any]:
+    """Как в MongoDB: условие на массив проверяется для каждого элемента"""
+    if isinstance(value, list):
+        return [value, *value]
+    return [value]
+
+
+def _equals(expected: Any) -> Callable[[Any], bool]:
+    return lambda value: any(item == expected for item in _values(value))
+
+
+def _compare(op: Callable[[Any, Any], bool], expected: Any) -> Callable[[Any], bool]:
+    def check(value: Any) -> bool:
+        for item in _values(value):
+            # Разные типы не сравниваются: "abc" >= 5 - не совпадение, а не ошибка
+            try:
+                if item is not None and op(item, expected):
+                    return True
+            except TypeError:
+                continue
+        return False
+
+    return check
+
+
+def _in(expected: Any) -> Callable[[Any], bool]:
+    if not isinstance(expected, list):
+        raise RuleConditionError("$in/$nin requires a list")
+    try:
+        hashed = frozenset(expected)
+    except TypeError:
+        return lambda value: any(item in expected for item in _values(value))
+
+    def check(value: Any) -> bool:
+        for item in _values(value):
+            try:
+                if item in hashed:
+                    return True
+            except TypeError:
+                continue
+        return False
+
+    return check
+
+
+def _regex(pattern: Any, options: str = "") -> Callable[[Any], bool]:
+    flags = 0
+    for option in options:
+        flags |= {"i": re.IGNORECASE, "m": re.MULTILINE, "s": re.DOTALL}.get(
+            option, 0
+        )
+    try:
+        compiled = re.compile(pattern, flags)
+    except (re.error, TypeError) as e:
+        raise RuleConditionError(f"Invalid $regex {pattern!r}: {e}")
+
+    return lambda value: any(
+        isinstance(item, str) and compiled.search(item) for item in _values(value)
+    )
+
+
+def _compile_operators(spec: dict[str, Any]) -> Callable[[Any], bool]:
+    """Операторы одного поля: {"$gte": 5, "$lt": 10} -> value -> bool"""
+    checks: list[Callable[[Any], bool]] = []
+    for op, expected in spec.items():
+        if op == "$eq":
+            checks.append(_equals(expected))
+        elif op == "$ne":
+            eq = _equals(expected)
+            checks.append(lambda value, eq=eq: value is MISSING or not eq(value))
+        elif op == "$gt":
+            checks.append(_compare(lambda a, b: a > b, expected))
+        elif op == "$gte":
+            checks.append(_compare(lambda a, b: a >= b, expected))
+        elif op == "$lt":
+            checks.append(_compare(lambda a, b: a < b, expected))
+        elif op == "$lte":
+            checks.append(_compare(lambda a, b: a <= b, expected))
+        elif op == "$in":
+            checks.append(_in(expected))
+        elif op == "$nin":
+            contains = _in(expected)
+            checks.append(
+                lambda value, contains=contains: value is MISSING
+                or not contains(value)
+            )
+        elif op == "$exists":
+            should_exist = bool(expected)
+            checks.append(
+                lambda value, should_exist=should_exist: (value is not MISSING)
+                == should_exist
+            )
+        elif op == "$regex":
+            checks.append(_regex(expected, spec.get("$options", "")))
+        elif op == "$options":
+            if "$regex" not in spec:
+                raise RuleConditionError("$options without $regex")
+        elif op == "$not":
+            if not isinstance(expected, dict):
+                raise RuleConditionError("$not requires an operator expression")
+            inner = _compile_operators(expected)
+            checks.append(lambda value, inner=inner: not inner(value))
+        else:
+            raise RuleConditionError(f"Unsupported operator: {op}")
+
+    if len(checks) == 1:
+        return checks[0]
+    return lambda value: all(check(value) for check in checks)
+
+
+def _is_operator_spec(value: Any) -> bool:
+    return (
+        isinstance(value, dict)
+        and bool(value)
+        and all(key.startswith("$") for key in value)
+    )
+
+
+def _compile_field(path: str, expected: Any) -> Predicate:
+    resolve = compile_path(path)
+    if _is_operator_spec(expected):
+        check = _compile_operators(expected)
+    else:
+        check = _equals(expected)
+        if expected is None:
+            # {"field": None} совпадает и с отсутствующим полем
+            return lambda document: resolve(document) in (None, MISSING)
+    return lambda document: check(resolve(document))
+
+
+def _compile_logical(op: str, clauses: Any) -> Predicate:
+    if not isinstance(clauses, list) or not clauses:
+        raise RuleConditionError(f"{op} requires a non-empty list")
+    predicates = [compile_conditions(clause) for clause in clauses]
+
+    if op == "$and":
+        return lambda document: all(p(document) for p in predicates)
+    if op == "$or":
+        return lambda document: any(p(document) for p in predicates)
+    return lambda document: not any(p(document) for p in predicates)
+
+
+def compile_conditions(conditions: dict[str, Any]) -> Predicate:
+    """Скомпилировать условия в стиле MongoDB в функцию-предикат.
+
+    Условия разбираются один раз, после чего проверка события - это
+    вызов замыканий без разбора словаря условий.
+
+    Поддерживается: равенство, $eq, $ne, $gt, $gte, $lt, $lte, $in, $nin,
+    $exists, $regex/$options, $not, $and, $or, $nor и пути через точку.
+
+    Usage:
+
+    matches = compile_conditions({"type": "PAYMENT_FAILED", "payload.amount": {"$gte": 1000}})
+    matches(event)  # True | False
+
+    Args:
+        conditions (dict[str, Any]): условия правила
+
+    Raises:
+        RuleConditionError: неизвестный оператор или неверный аргумент
+
+    Returns:
+        Predicate: event -> bool
+    """
+    if not isinstance(conditions, dict):
+        raise RuleConditionError("Conditions must be an object")
+
+    predicates: list[Predicate] = []
+    for key, value in conditions.items():
+        if key in ("$and", "$or", "$nor"):
+            predicates.append(_compile_logical(key, value))
+        elif key.startswith("$"):
+            raise RuleConditionError(f"Unsupported top-level operator: {key}")
+        else:
+            predicates.append(_compile_field(key, value))
+
+    if not predicates:
+        return lambda document: True
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda document: all(p(document) for p in predicates)
+
+
+def indexed_values(conditions: dict[str, Any], field: str) -> list[Any] | None:
+    """Значения поля, которые условие допускает, если их можно перечислить.
+
+    {"type": "A"} -> ["A"], {"type": {"$in": ["A", "B"]}} -> ["A", "B"],
+    иначе None: правило может подойти событию с любым значением поля.
+    """
+    expected = conditions.get(field, MISSING)
+    if expected is MISSING or expected is None:
+        return None
+
+    if not _is_operator_spec(expected):
+        return None if isinstance(expected, (dict, list)) else [expected]
+
+    if "$eq" in expected and not isinstance(expected["$eq"], (dict, list)):
+        return [expected["$eq"]]
+    if "$in" in expected and isinstance(expected["$in"], list):
+        values = expected["$in"]
+        if all(not isinstance(value, (dict, list)) for value in values):
+            return values
+    return None
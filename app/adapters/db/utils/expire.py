@@ -2,36 +2,56 @@ from datetime import datetime, timedelta, timezone
 
 from app import getLogger
 from app.settings import config
+from app.utils.enums import SeverityBandEnum
 
 logging = getLogger("TTL")
 
 
-def get_ttl_days_by_severity(severity: int | None) -> int:
-    """Вычисляет количество дней хранения события.
+def get_severity_band(severity: int | None) -> SeverityBandEnum:
+    """Полоса критичности события.
+
+    По ней считается срок хранения события и ключ rollup-метрик.
 
     Args:
         severity (int): Уровень события
 
     Returns:
-        int:
+        SeverityBandEnum:
     """
     if severity is None:
-        return config.mongo.expire_at_ttl_days_low
+        return SeverityBandEnum.low
 
     try:
         severity = int(severity)
     except ValueError:
         logging.warning(f"Invalid severity value: {severity}")
-        return config.mongo.expire_at_ttl_days_low
+        return SeverityBandEnum.low
 
     if severity >= 8:
-        return config.mongo.expire_at_ttl_days_critical
+        return SeverityBandEnum.critical
 
     elif severity >= 5:
-        return config.mongo.expire_at_ttl_days_medium
+        return SeverityBandEnum.medium
 
     else:
-        return config.mongo.expire_at_ttl_days_low
+        return SeverityBandEnum.low
+
+
+def get_ttl_days_by_severity(severity: int | None) -> int:
+    """Вычисляет количество дней хранения события.
+
+    Args:
+        severity (int): Уровень события
+
+    Returns:
+        int:
+    """
+    ttl_days = {
+        SeverityBandEnum.critical: config.mongo.expire_at_ttl_days_critical,
+        SeverityBandEnum.medium: config.mongo.expire_at_ttl_days_medium,
+        SeverityBandEnum.low: config.mongo.expire_at_ttl_days_low,
+    }
+    return ttl_days[get_severity_band(severity)]
 
 
 def calculate_expires_at_by_severity(severity: int | None) -> datetime:
@@ -1,9 +1,22 @@
+import re
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
 from app.utils.enums import PirorityLevelEnum
 
+# Поля текстового индекса idx_events_combined_text
+TEXT_SEARCH_FIELDS = (
+    "payload.card_brand",
+    "payload.processor",
+    "payload.payment_method",
+    "payload.currency",
+    "payload.transaction_id",
+    "user_id",
+    "session_id",
+    "trace_id",
+)
+
 
 @dataclass(frozen=True, slots=True)
 class EventFilters:
@@ -37,6 +50,26 @@ class EventFilters:
 
         return mongo_filter
 
+    def to_match_filter(self) -> dict[str, Any]:
+        """Фильтр для проверки отдельного документа в процессе (live tail).
+
+        Без окна hours: новые события в него всегда попадают.
+        $text работает только в запросе к коллекции, поэтому поиск
+        заменен на $regex по каждому слову и полям текстового индекса.
+        """
+        mongo_filter = self.to_mongo_filter()
+        mongo_filter.pop("created_at", None)
+        mongo_filter.pop("$text", None)
+
+        if self.search and (words := self.search.split()):
+            mongo_filter["$or"] = [
+                {field: {"$regex": re.escape(word), "$options": "i"}}
+                for word in words
+                for field in TEXT_SEARCH_FIELDS
+            ]
+
+        return mongo_filter
+
     def _get_severity_filter(self) -> dict:
         severity_map = {
             PirorityLevelEnum.low: {"severity": {"$lte": 3}},
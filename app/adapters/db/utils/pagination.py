@@ -0,0 +1,114 @@
+import base64
+from typing import Any
+
+from bson import json_util
+from bson.errors import InvalidId
+from bson.objectid import ObjectId
+
+
+class InvalidCursorError(ValueError):
+    """Токен продолжения поврежден или не подходит к текущей сортировке"""
+
+
+def get_by_path(document: dict[str, Any], path: str) -> Any:
+    """Значение поля документа по пути через точку: "payload.amount"."""
+    value: Any = document
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def encode_cursor(
+    sort_field: str,
+    sort_order: int,
+    documents: list[dict[str, Any]],
+    previous: dict[str, Any] | None = None,
+) -> str:
+    """Токен продолжения по последней строке страницы.
+
+    В токене хранится значение поля сортировки последней строки
+    и _id всех строк с этим же значением. Следующая страница
+    начинается с этого значения и исключает уже отданные строки,
+    поэтому сортировка остается только по sort_field и ложится
+    на существующие индексы (type/created_at/severity, source/created_at).
+
+    Args:
+        sort_field (str): поле сортировки
+        sort_order (int): направление сортировки
+        documents (list[dict[str, Any]]): документы текущей страницы
+        previous (dict[str, Any] | None): позиция из предыдущего токена
+
+    Returns:
+        str: непрозрачный токен
+    """
+    value = get_by_path(documents[-1], sort_field)
+    ids = [doc["_id"] for doc in documents if get_by_path(doc, sort_field) == value]
+    if previous and previous["value"] == value:
+        # Группа одинаковых значений больше страницы
+        ids = previous["ids"] + ids
+
+    position = {"f": sort_field, "o": sort_order, "v": value, "ids": ids}
+    raw = json_util.dumps(position).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(token: str, sort_field: str, sort_order: int) -> dict[str, Any]:
+    """Разбор токена продолжения.
+
+    Args:
+        token (str): токен из предыдущего ответа
+        sort_field (str): поле сортировки текущего запроса
+        sort_order (int): направление сортировки текущего запроса
+
+    Raises:
+        InvalidCursorError: токен поврежден или выдан для другой сортировки
+
+    Returns:
+        dict[str, Any]: {"value": ..., "ids": [...]}
+    """
+    try:
+        position = json_util.loads(base64.urlsafe_b64decode(token.encode()))
+        ids = [ObjectId(item_id) for item_id in position["ids"]]
+        field, order, value = position["f"], position["o"], position["v"]
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise InvalidCursorError("Malformed pagination cursor")
+
+    if field != sort_field or order != sort_order:
+        raise InvalidCursorError("Pagination cursor was issued for another sorting")
+
+    return {"value": value, "ids": ids}
+
+
+def keyset_filter(
+    sort_field: str, sort_order: int, position: dict[str, Any]
+) -> dict[str, Any]:
+    """Условие "строки после позиции курсора".
+
+    Args:
+        sort_field (str): поле сортировки
+        sort_order (int): направление сортировки
+        position (dict[str, Any]): позиция из decode_cursor
+
+    Returns:
+        dict[str, Any]: MongoDB фильтр
+    """
+    if sort_field == "_id":
+        operator = "$lt" if sort_order < 0 else "$gt"
+        return {"_id": {operator: position["value"]}}
+
+    operator = "$lte" if sort_order < 0 else "$gte"
+    return {
+        sort_field: {operator: position["value"]},
+        "_id": {"$nin": position["ids"]},
+    }
+
+
+def merge_filters(base: dict[str, Any], extra: dict[str, Any]) -> dict[str, Any]:
+    """Объединение двух фильтров по И без потери условий на одно поле."""
+    if not base:
+        return extra
+    if set(base) & set(extra):
+        return {"$and": [base, extra]}
+    return {**base, **extra}
@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from app.adapters.db.utils.expire import get_severity_band
+from app.utils.enums import MetricPeriodEnum
+
+# Размер корзины в секундах
+ROLLUP_PERIODS: dict[MetricPeriodEnum, int] = {
+    MetricPeriodEnum.minute: 60,
+    MetricPeriodEnum.five_minutes: 5 * 60,
+    MetricPeriodEnum.hour: 60 * 60,
+    MetricPeriodEnum.day: 24 * 60 * 60,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class BucketKey:
+    period: MetricPeriodEnum
+    timestamp: datetime
+    event_type: str
+    source: str
+    severity_band: str
+
+
+@dataclass(slots=True)
+class BucketCounter:
+    count: int = 0
+    severity_sum: int = 0
+    last_event: datetime | None = None
+
+    def add(self, severity: int, moment: datetime):
+        self.count += 1
+        self.severity_sum += severity
+        if self.last_event is None or moment > self.last_event:
+            self.last_event = moment
+
+
+def as_utc(moment: datetime) -> datetime:
+    """Naive datetime MongoDB хранит как UTC, приводим к тому же виду"""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def bucket_start(moment: datetime, period: MetricPeriodEnum) -> datetime:
+    """Начало корзины, в которую попадает момент времени.
+
+    Args:
+        moment (datetime): момент времени
+        period (MetricPeriodEnum): размер корзины
+
+    Returns:
+        datetime: начало корзины в UTC
+    """
+    seconds = int(as_utc(moment).timestamp())
+    return datetime.fromtimestamp(
+        seconds - seconds % ROLLUP_PERIODS[period], tz=timezone.utc
+    )
+
+
+def rollup_events(events: list[dict[str, Any]]) -> dict[BucketKey, BucketCounter]:
+    """Свертка пачки событий в счетчики по корзинам.
+
+    Каждое событие попадает в одну корзину каждого периода
+    с ключом (тип, источник, полоса критичности).
+
+    Args:
+        events (list[dict[str, Any]]): записанные документы событий
+
+    Returns:
+        dict[BucketKey, BucketCounter]:
+    """
+    now = datetime.now(timezone.utc)
+    counters: dict[BucketKey, BucketCounter] = {}
+
+    for event in events:
+        created_at = event.get("created_at")
+        moment = as_utc(created_at) if isinstance(created_at, datetime) else now
+        band = get_severity_band(event.get("severity"))
+        try:
+            severity = int(event.get("severity") or 0)
+        except ValueError:
+            severity = 0
+
+        for period in ROLLUP_PERIODS:
+            key = BucketKey(
+                period=period,
+                timestamp=bucket_start(moment, period),
+                event_type=event.get("type"),
+                source=event.get("source"),
+                severity_band=band,
+            )
+            counters.setdefault(key, BucketCounter()).add(severity, moment)
+
+    return counters
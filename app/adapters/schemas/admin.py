@@ -66,3 +66,92 @@ class ProfilerStatusSchema(BaseSchema):
         example=(datetime.now(tz=timezone.utc) + timedelta(minutes=10)).isoformat(),
         description="Время окончания профилирования",
     )
+
+
+class QueryCacheStatsSchema(BaseSchema):
+    size: int = Field(example=120, description="Количество результатов в кэше")
+    max_entries: int = Field(example=1024, description="Максимальный размер кэша")
+    hits: int = Field(example=900, description="Запросы, отданные из кэша")
+    misses: int = Field(example=100, description="Запросы, выполненные в MongoDB")
+    evictions: int = Field(example=0, description="Вытеснено по размеру кэша")
+    invalidations: int = Field(
+        example=30, description="Сокращено по записи подходящих событий"
+    )
+
+
+class SingleFlightStatsSchema(BaseSchema):
+    in_flight: int = Field(example=2, description="Запросы, выполняющиеся сейчас")
+    calls: int = Field(example=500, description="Всего вызовов")
+    executions: int = Field(example=40, description="Запросы, ушедшие в MongoDB")
+    collapsed: int = Field(
+        example=460, description="Вызовы, дождавшиеся чужого запроса"
+    )
+
+
+class DeduplicationStatsSchema(BaseSchema):
+    checked: int = Field(example=10000, description="Событий проверено")
+    batch_duplicates: int = Field(example=3, description="Дубли внутри одной пачки")
+    filter_duplicates: int = Field(
+        example=120, description="Дубли, пойманные фильтром Блума"
+    )
+    false_positives: int = Field(
+        example=1, description="Ложные срабатывания фильтра (событие новое)"
+    )
+    db_duplicates: int = Field(
+        example=2, description="Дубли, отсеченные уникальным индексом"
+    )
+    filter_rotations: int = Field(example=4, description="Смены поколений фильтра")
+    filter_memory_bytes: int = Field(
+        example=3594000, description="Память фильтра в байтах"
+    )
+
+
+class IngestStatsSchema(BaseSchema):
+    pending: int = Field(example=12, description="События в буфере")
+    flushed_batches: int = Field(example=200, description="Записано пачек")
+    flushed_events: int = Field(example=100000, description="Записано событий")
+    failed_events: int = Field(example=0, description="Потеряно событий")
+    degraded: bool = Field(
+        example=False, description="MongoDB недоступна, пачки пишутся в журнал"
+    )
+    saturated: int = Field(
+        example=3, description="Пачки, ушедшие в журнал из-за медленной записи"
+    )
+    spooled_events: int = Field(example=1500, description="Записано в журнал")
+    spool_depth: int = Field(example=500, description="События, ждущие дозаписи")
+    spool_segments: int = Field(example=1, description="Сегменты журнала")
+    spool_bytes: int = Field(example=250000, description="Размер журнала в байтах")
+    replayed_events: int = Field(
+        example=1000, description="Дозаписано из журнала в MongoDB"
+    )
+    replay_rate: float = Field(
+        example=16.6, description="Скорость дозаписи за минуту, событий в секунду"
+    )
+    replay_failures: int = Field(
+        example=2, description="Неудачные попытки дозаписи журнала"
+    )
+
+
+class StreamConsumerStatsSchema(BaseSchema):
+    consumer: str = Field(example="worker-1-4242", description="Имя в группе")
+    running: bool = Field(example=True, description="Чтение stream запущено")
+    received: int = Field(example=10000, description="Прочитано сообщений")
+    acked: int = Field(example=9990, description="Подтверждено XACK")
+    invalid: int = Field(example=2, description="Некорректные сообщения")
+    failed: int = Field(example=0, description="Потеряно из-за ошибок данных")
+    unacked: int = Field(
+        example=8, description="Оставлено в PEL: не удалось записать"
+    )
+    claimed: int = Field(
+        example=8, description="Забрано зависших сообщений других потребителей"
+    )
+
+
+class IngestShardStatsSchema(BaseSchema):
+    shard: int = Field(example=3, description="Номер шарда")
+    depth: int = Field(example=12, description="События в очереди шарда")
+    max_depth: int = Field(
+        example=4000, description="Макс. глубина очереди: горячий ключ"
+    )
+    processed: int = Field(example=100000, description="Записано событий")
+    failed: int = Field(example=0, description="Не удалось записать")
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from pydantic import Field
+
+from app.adapters.schemas.base import BaseSchema
+
+
+class TypeStatisticsSchema(BaseSchema):
+    type: str = Field(example="PAYMENT_FAILED", description="Тип события")
+    count: int = Field(example=150, description="Количество событий")
+    last_event: datetime | None = Field(
+        None, description="Время последнего события этого типа"
+    )
+
+
+class DailyStatisticsSchema(BaseSchema):
+    date: datetime = Field(description="Начало дня, UTC")
+    count: int = Field(example=150, description="Количество событий за день")
+    types: list[str] = Field(description="Типы событий за день")
+
+
+class DailyStatisticsFilterSchema(BaseSchema):
+    days: int = Field(7, gt=0, le=365, example=7, description="Период в днях")
@@ -8,7 +8,8 @@ from pydantic import Field, model_validator
 
 from app.adapters.db.utils.expire import calculate_expires_at_by_severity
 from app.adapters.schemas.base import BaseInsertSchemaMixin, BaseSchema, DBSchemaMixin
-from app.utils.enums import PirorityLevelEnum
+from app.settings import config
+from app.utils.enums import ExportFormatEnum, PirorityLevelEnum
 
 
 class BaseEventSchema(BaseSchema):
@@ -72,7 +73,65 @@ class EventsFilterSchema(BaseSchema):
     search: str | None = None
 
 
+class EventsExportSchema(BaseSchema):
+    format: ExportFormatEnum = Field(
+        ExportFormatEnum.ndjson,
+        example=ExportFormatEnum.ndjson,
+        description="Формат выгрузки: ndjson | csv",
+    )
+    batch_size: int = Field(
+        500,
+        gt=0,
+        le=10000,
+        example=500,
+        description="Количество документов, которое курсор MongoDB читает за раз",
+    )
+    fields: str | None = Field(
+        None,
+        example="type,source,severity,created_at",
+        description="Поля через запятую. По умолчанию все поля",
+    )
+
+
 class GeneratedEventsSchema(BaseSchema):
     created_events: EventsCharacteristicsSchema
     created: int
     success: bool
+
+
+class EventsClaimSchema(BaseSchema):
+    limit: int = Field(
+        config.processing.claim_batch_size,
+        gt=0,
+        le=1000,
+        example=100,
+        description="Макс количество событий в пачке",
+    )
+    lease_seconds: float = Field(
+        config.processing.lease_seconds,
+        gt=0,
+        le=3600,
+        example=60,
+        description="Время на обработку пачки, потом ее захватит другой воркер",
+    )
+
+
+class EventsLeaseSchema(BaseSchema):
+    lease_id: str
+    lease_until: datetime
+    items: list[EventSchema]
+
+
+class EventsAckSchema(BaseSchema):
+    lease_id: str
+    processed_ids: list[str] = Field(default_factory=list)
+    released_ids: list[str] = Field(
+        default_factory=list,
+        description="События, которые нужно вернуть в очередь",
+    )
+
+
+class EventsAckResultSchema(BaseSchema):
+    modified: int = Field(
+        description="Меньше переданных - аренда части событий истекла"
+    )
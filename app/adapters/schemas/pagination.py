@@ -8,3 +8,10 @@ class PaginationSchema(BaseSchema):
     offset: int | None = Field(
         1, ge=1, example=0, description="Смещение. Начинается с 1"
     )
+    cursor: str | None = Field(
+        None,
+        description=(
+            "Токен продолжения из заголовка X-Next-Cursor предыдущего ответа. "
+            "Если передан, offset игнорируется"
+        ),
+    )
@@ -0,0 +1,80 @@
+from typing import Any
+
+from pydantic import Field, field_validator
+
+from app.adapters.db.utils.conditions import compile_conditions
+from app.adapters.schemas.base import BaseSchema, DBSchemaMixin
+
+
+class RuleActionSchema(BaseSchema):
+    type: str = Field(example="SEND_NOTIFICATION", description="Тип действия")
+    config: dict[str, Any] = Field(
+        default_factory=dict,
+        example={
+            "queue": "notifications.critical",
+            "template": "payment_failure_alert",
+        },
+        description="Параметры действия",
+    )
+
+
+class RuleWindowSchema(BaseSchema):
+    """Правило срабатывает на count подходящих событий за minutes минут"""
+
+    count: int = Field(gt=0, le=10000, example=5, description="Порог событий")
+    minutes: float = Field(gt=0, le=1440, example=10, description="Окно в минутах")
+    group_by: str | None = Field(
+        None,
+        example="user_id",
+        description="Поле, по которому считаются события (user_id, session_id, source)."
+        " Без поля - одно окно на правило",
+    )
+
+
+class RuleBaseSchema(BaseSchema):
+    name: str = Field(example="Critical Payment Failures")
+    description: str | None = Field(
+        None, example="Notify on multiple payment failures"
+    )
+    conditions: dict[str, Any] = Field(
+        example={
+            "type": "PAYMENT_FAILED",
+            "severity": {"$gte": 7},
+            "payload.amount": {"$gte": 1000},
+        },
+        description="Условия в стиле MongoDB",
+    )
+    actions: list[RuleActionSchema] = Field(default_factory=list)
+    priority: int = Field(0, example=1, description="Чем больше, тем раньше")
+    enabled: bool = True
+    window: RuleWindowSchema | None = None
+
+
+class RuleCreateSchema(RuleBaseSchema):
+    @field_validator("conditions")
+    @classmethod
+    def validate_conditions(cls, v: dict[str, Any]):
+        """Неверное условие отклоняется сразу, а не при проверке событий"""
+        compile_conditions(v)
+        return v
+
+
+class RuleUpdateSchema(BaseSchema):
+    name: str | None = None
+    description: str | None = None
+    conditions: dict[str, Any] | None = None
+    actions: list[RuleActionSchema] | None = None
+    priority: int | None = None
+    enabled: bool | None = None
+    window: RuleWindowSchema | None = None
+
+    @field_validator("conditions")
+    @classmethod
+    def validate_conditions(cls, v: dict[str, Any] | None):
+        if v is not None:
+            compile_conditions(v)
+        return v
+
+
+class RuleSchema(DBSchemaMixin, RuleBaseSchema):
+    pass
@@ -4,8 +4,10 @@ from app import getLogger
 from app.adapters.schemas.events import BaseEventSchema
 from app.adapters.schemas.notifications import NotificationSchema
 from app.dependencies.containers import Container
-from app.services.events_service import EventService
+from app.services.ingest_lanes import IngestLanes
+from app.services.ingest_shards import IngestShards
 from app.settings import config
+from app.utils.enums import BrokerTypeEnum
 
 logging = getLogger("Broker")
 
@@ -13,16 +15,69 @@ logging = getLogger("Broker")
 router = config.broker.router_instance
 
 
-@router.subscriber(config.broker.incoming_event_channel)
 async def handle_incoming_message(
     message: BaseEventSchema,
-    service: EventService = Depends(Container.event_service),
+    ingest: IngestLanes | IngestShards = Depends(Container.ingest_sink),
 ):
     logging.debug("Received message")
-    res = await service.create_event(message.dict())
-    logging.debug(f"Created event: {res._id}")
+    await ingest.put(message.dict())
+
+
+async def handle_incoming_batch(
+    messages: list[BaseEventSchema],
+    ingest_lanes: IngestLanes = Depends(Container.ingest_lanes),
+):
+    """Пачка из poll Kafka: смещение фиксируется после записи пачки"""
+    logging.debug(f"Received batch: {len(messages)}")
+    # Порядок внутри партиции сохраняется, если он нужен (шарды включены)
+    await ingest_lanes.write(
+        [message.dict() for message in messages],
+        ordered=config.ingest.shards_enabled,
+    )
+
+
+async def handle_acked_message(
+    message: BaseEventSchema,
+    ingest: IngestLanes | IngestShards = Depends(Container.ingest_sink),
+):
+    """Сообщение RabbitMQ подтверждается после записи его пачки.
+
+    Пачку собирают обработчики, работающие одновременно (prefetch).
+    """
+    logging.debug("Received message")
+    await ingest.put(message.dict(), wait=True)
+
+
+if config.broker.type == BrokerTypeEnum.kafka:
+    router.subscriber(
+        config.broker.incoming_event_channel,
+        group_id=config.broker.consumer_group,
+        batch=True,
+        max_records=config.broker.batch_size,
+        batch_timeout_ms=config.broker.batch_timeout_ms,
+        # Ошибка записи возвращает смещение назад: пачка будет прочитана снова
+        auto_commit=False,
+    )(handle_incoming_batch)
+
+elif config.broker.type == BrokerTypeEnum.rabbit:
+    from faststream.rabbit import RabbitQueue
+
+    router.subscriber(
+        RabbitQueue(config.broker.incoming_event_channel, durable=True),
+        # Ошибка записи возвращает сообщение в очередь
+        retry=True,
+    )(handle_acked_message)
+
+# В режиме Redis Streams входящие события читает RedisStreamConsumer
+elif not config.broker.use_redis_streams:
+    router.subscriber(config.broker.incoming_event_channel)(handle_incoming_message)
+
+
+notify_publisher = router.publisher(
+    config.broker.outgoing_notify_channel, schema=NotificationSchema
+)
 
 
-@router.publisher(config.broker.outgoing_notify_channel, schema=NotificationSchema)
 async def send_message(message: NotificationSchema):
     logging.debug(f"Sending message: {message}")
+    await notify_publisher.publish(message)
@@ -1,8 +1,24 @@
 from fastapi import APIRouter, Depends
 
-from app.adapters.schemas.admin import ProfilerStartSchema, ProfilerStatusSchema
+from app.adapters.schemas.admin import (
+    DeduplicationStatsSchema,
+    IngestShardStatsSchema,
+    IngestStatsSchema,
+    ProfilerStartSchema,
+    ProfilerStatusSchema,
+    QueryCacheStatsSchema,
+    SingleFlightStatsSchema,
+    StreamConsumerStatsSchema,
+)
 from app.dependencies.containers import Container
 from app.services.admin_service import AdminService
+from app.services.event_deduplicator import EventDeduplicator
+from app.services.events_service import EventService
+from app.services.ingest_lanes import IngestLanes
+from app.services.ingest_shards import IngestShards
+from app.services.stream_consumer import RedisStreamConsumer
+from app.utils.query_cache import QueryCache
+from app.utils.single_flight import SingleFlight
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -50,3 +66,79 @@ async def profiler_raw_data(
     service: AdminService = Depends(Container.admin_service),
 ):
     return await service.get_raw_profiler_data()
+
+
+@router.get(
+    "/cache/stats/",
+    summary="Get query cache statistics",
+    response_model=QueryCacheStatsSchema,
+)
+async def query_cache_stats(
+    cache: QueryCache = Depends(Container.query_cache),
+):
+    return cache.stats()
+
+
+@router.get(
+    "/single-flight/stats/",
+    summary="Get collapsed query statistics",
+    response_model=SingleFlightStatsSchema,
+)
+async def single_flight_stats(
+    single_flight: SingleFlight = Depends(Container.single_flight),
+):
+    return single_flight.stats()
+
+
+@router.post(
+    "/events/backfill-processed/",
+    summary="Add processed flag to events created before the processing queue",
+)
+async def backfill_processed_flag(
+    service: EventService = Depends(Container.event_service),
+):
+    return {"modified": await service.backfill_processed_flag()}
+
+
+@router.get(
+    "/dedup/stats/",
+    summary="Get event deduplication statistics",
+    response_model=DeduplicationStatsSchema,
+)
+async def dedup_stats(
+    dedup: EventDeduplicator = Depends(Container.event_deduplicator),
+):
+    return dedup.stats()
+
+
+@router.get(
+    "/ingest/stats/",
+    summary="Get ingest lanes and spool statistics",
+    response_model=dict[str, IngestStatsSchema],
+)
+async def ingest_stats(
+    ingest_lanes: IngestLanes = Depends(Container.ingest_lanes),
+):
+    return ingest_lanes.stats()
+
+
+@router.get(
+    "/ingest/stream/stats/",
+    summary="Get Redis Streams consumer statistics",
+    response_model=StreamConsumerStatsSchema,
+)
+async def stream_consumer_stats(
+    consumer: RedisStreamConsumer = Depends(Container.stream_consumer),
+):
+    return consumer.stats()
+
+
+@router.get(
+    "/ingest/shards/stats/",
+    summary="Get per-shard ingest queue statistics",
+    response_model=list[IngestShardStatsSchema],
+)
+async def ingest_shards_stats(
+    ingest_shards: IngestShards = Depends(Container.ingest_shards),
+):
+    return ingest_shards.stats()
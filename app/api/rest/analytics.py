@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends
+
+from app.adapters.schemas.analytics import (
+    DailyStatisticsFilterSchema,
+    DailyStatisticsSchema,
+    TypeStatisticsSchema,
+)
+from app.dependencies.containers import Container
+from app.services.events_service import EventService
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+@router.get("/types/", response_model=list[TypeStatisticsSchema])
+async def get_types_statistics(
+    service: EventService = Depends(Container.event_service),
+):
+    return await service.get_types_statistics()
+
+
+@router.get("/daily/", response_model=list[DailyStatisticsSchema])
+async def get_daily_statistics(
+    filter: DailyStatisticsFilterSchema = Depends(),
+    service: EventService = Depends(Container.event_service),
+):
+    return await service.get_daily_statistics(filter.days)
@@ -1,35 +1,94 @@
-from fastapi import APIRouter, Depends
+from bson.errors import InvalidId
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
 
 from app import getLogger
+from app.adapters.db.utils.pagination import InvalidCursorError
 from app.adapters.schemas.events import (
+    EventsAckResultSchema,
+    EventsAckSchema,
     EventsCharacteristicsSchema,
+    EventsClaimSchema,
+    EventsExportSchema,
     EventSchema,
     EventsFilterSchema,
+    EventsLeaseSchema,
     GeneratedEventsSchema,
 )
 from app.adapters.schemas.pagination import PaginationSchema
 from app.dependencies.containers import Container
 from app.services.events_service import EventService
 from app.utils.data_generator import critical_event_generator, random_event_generator
+from app.utils.export import MEDIA_TYPES
 
 logging = getLogger(__name__)
 
 
 router = APIRouter(prefix="/events", tags=["Events"])
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 @router.get("/", response_model=list[EventSchema])
 async def get_events(
+    response: Response,
     filter: EventsFilterSchema = Depends(),
     pagination: PaginationSchema = Depends(),
     service: EventService = Depends(Container.event_service),
 ):
-    return await service.get_events_list(
-        filter.dict(exclude_unset=True),
-        pagination.dict(exclude_unset=True),
+    try:
+        page = await service.get_events_list(
+            filter.dict(exclude_unset=True),
+            pagination.dict(exclude_unset=True),
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
+
+
+@router.get("/export/")
+async def export_events(
+    filter: EventsFilterSchema = Depends(),
+    export: EventsExportSchema = Depends(),
+    service: EventService = Depends(Container.event_service),
+):
+    chunks = service.export_events(filter.dict(exclude_unset=True), export.dict())
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[export.format],
+        headers={
+            "Content-Disposition": f'attachment; filename="events.{export.format}"'
+        },
     )
 
 
+@router.post("/claim/", response_model=EventsLeaseSchema)
+async def claim_events(
+    claim: EventsClaimSchema,
+    service: EventService = Depends(Container.event_service),
+):
+    """Захватить пачку необработанных событий для постобработки"""
+    return await service.claim_events(claim.limit, claim.lease_seconds)
+
+
+@router.post("/ack/", response_model=EventsAckResultSchema)
+async def ack_events(
+    ack: EventsAckSchema,
+    service: EventService = Depends(Container.event_service),
+):
+    """Подтвердить обработку захваченных событий"""
+    try:
+        modified = await service.ack_events(
+            ack.lease_id, ack.processed_ids, ack.released_ids
+        )
+    except InvalidId as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"modified": modified}
+
+
 @router.get("/types/", response_model=list[str])
 async def get_event_types(
     service: EventService = Depends(Container.event_service),
@@ -0,0 +1,74 @@
+from bson.errors import InvalidId
+from fastapi import APIRouter, Depends, HTTPException
+
+from app import getLogger
+from app.adapters.schemas.rules import RuleCreateSchema, RuleSchema, RuleUpdateSchema
+from app.dependencies.containers import Container
+from app.services.rules_service import RuleService
+
+logging = getLogger("Rules.API")
+
+
+router = APIRouter(prefix="/rules", tags=["Rules"])
+
+
+def rule_not_found(rule_id: str) -> HTTPException:
+    return HTTPException(status_code=404, detail=f"Rule {rule_id} not found")
+
+
+@router.get("/", response_model=list[RuleSchema])
+async def get_rules(
+    service: RuleService = Depends(Container.rule_service),
+):
+    return await service.get_rules()
+
+
+@router.post("/", response_model=RuleSchema)
+async def create_rule(
+    rule: RuleCreateSchema,
+    service: RuleService = Depends(Container.rule_service),
+):
+    return await service.create_rule(rule.dict())
+
+
+@router.get("/{rule_id}/", response_model=RuleSchema)
+async def get_rule(
+    rule_id: str,
+    service: RuleService = Depends(Container.rule_service),
+):
+    try:
+        rule = await service.get_rule(rule_id)
+    except InvalidId:
+        rule = None
+    if rule is None:
+        raise rule_not_found(rule_id)
+    return rule
+
+
+@router.put("/{rule_id}/", response_model=RuleSchema)
+async def update_rule(
+    rule_id: str,
+    data: RuleUpdateSchema,
+    service: RuleService = Depends(Container.rule_service),
+):
+    try:
+        rule = await service.update_rule(rule_id, data.dict(exclude_unset=True))
+    except InvalidId:
+        rule = None
+    if rule is None:
+        raise rule_not_found(rule_id)
+    return rule
+
+
+@router.delete("/{rule_id}/")
+async def delete_rule(
+    rule_id: str,
+    service: RuleService = Depends(Container.rule_service),
+):
+    try:
+        deleted = await service.delete_rule(rule_id)
+    except InvalidId:
+        deleted = False
+    if not deleted:
+        raise rule_not_found(rule_id)
+    return {"success": True}
@@ -0,0 +1,110 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app import getLogger
+from app.adapters.schemas.events import EventsFilterSchema
+from app.dependencies.containers import Container
+from app.services.event_stream import (
+    EventStreamHub,
+    StreamSubscription,
+    TooManySubscribersError,
+)
+from app.settings import config
+
+logging = getLogger("Stream.API")
+
+
+router = APIRouter(prefix="/stream", tags=["Stream"])
+
+
+async def next_message(subscription: StreamSubscription) -> tuple[str, int] | None:
+    """Следующее событие или None, если за heartbeat_seconds событий не было"""
+    try:
+        return await asyncio.wait_for(
+            subscription.get(), timeout=config.stream.heartbeat_seconds
+        )
+    except asyncio.TimeoutError:
+        return None
+
+
+@router.get("/events/")
+async def stream_events(
+    filter: EventsFilterSchema = Depends(),
+    hub: EventStreamHub = Depends(Container.event_stream),
+):
+    """Live tail событий в формате Server-Sent Events.
+
+    event: event - новое событие, event: dropped - сколько событий
+    пропущено, пока клиент не успевал читать.
+    """
+    try:
+        subscription = hub.subscribe(filter.dict(exclude_unset=True))
+    except TooManySubscribersError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    async def events():
+        try:
+            while True:
+                item = await next_message(subscription)
+                if item is None:
+                    yield ": keepalive\n\n"
+                    continue
+
+                message, dropped = item
+                if dropped:
+                    yield f'event: dropped\ndata: {{"dropped": {dropped}}}\n\n'
+                yield f"event: event\ndata: {message}\n\n"
+        finally:
+            await hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/events/ws/")
+async def stream_events_ws(
+    websocket: WebSocket,
+    filter: EventsFilterSchema = Depends(),
+    hub: EventStreamHub = Depends(Container.event_stream),
+):
+    """Live tail событий через WebSocket: {"type": "event" | "dropped", ...}"""
+    await websocket.accept()
+    try:
+        subscription = hub.subscribe(filter.dict(exclude_unset=True))
+    except TooManySubscribersError as e:
+        await websocket.close(code=1013, reason=str(e))
+        return
+
+    # Клиент ничего не присылает, receive нужен только чтобы заметить отключение
+    disconnected = asyncio.create_task(websocket.receive())
+    try:
+        while True:
+            getter = asyncio.create_task(next_message(subscription))
+            done, _ = await asyncio.wait(
+                {getter, disconnected}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if disconnected in done:
+                getter.cancel()
+                break
+
+            item = getter.result()
+            if item is None:
+                await websocket.send_text('{"type": "keepalive"}')
+                continue
+
+            message, dropped = item
+            if dropped:
+                await websocket.send_text(
+                    f'{{"type": "dropped", "dropped": {dropped}}}'
+                )
+            await websocket.send_text(f'{{"type": "event", "data": {message}}}')
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        await hub.unsubscribe(subscription)
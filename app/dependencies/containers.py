@@ -1,19 +1,105 @@
 from that_depends import BaseContainer, providers
 
+from app.adapters.clients.redis_client import get_redis_injection
 from app.adapters.db import get_database_injection
 from app.adapters.db.cruds.admin import AdminCRUD
+from app.adapters.db.cruds.catalogue import CatalogueCRUD
 from app.adapters.db.cruds.event import EventCRUD
 from app.adapters.db.cruds.health_crud import HealthCRUD
+from app.adapters.db.cruds.metrics import MetricsCRUD
+from app.adapters.db.cruds.rule import RuleCRUD
 from app.services.admin_service import AdminService
+from app.services.event_deduplicator import EventDeduplicator
+from app.services.event_stream import EventStreamHub
 from app.services.events_service import EventService
 from app.services.health_service import HealthService
+from app.services.ingest_lanes import build_ingest_lanes
+from app.services.ingest_shards import IngestShards
+from app.services.rules_engine import RulesEngine
+from app.services.rules_service import RuleService
+from app.services.stream_consumer import RedisStreamConsumer
+from app.settings import config
+from app.utils.query_cache import QueryCache
+from app.utils.single_flight import SingleFlight
 
 
 class Container(BaseContainer):
     db = providers.Resource(get_database_injection)
 
     events_crud = providers.Factory(EventCRUD, db)
-    event_service = providers.Factory(EventService, events_crud)
+    catalogue_crud = providers.Factory(CatalogueCRUD, db)
+    metrics_crud = providers.Factory(MetricsCRUD, db)
+    rules_crud = providers.Factory(RuleCRUD, db)
+    # Один движок на процесс: скомпилированные правила живут между запросами
+    rules_engine = providers.Singleton(
+        RulesEngine,
+        rules_crud,
+        reload_interval=config.rules.reload_interval_seconds,
+        window_max_keys=config.rules.window_max_keys,
+    )
+    # Один кэш на процесс, общий для всех запросов
+    query_cache = providers.Singleton(
+        QueryCache,
+        max_entries=config.cache.query_max_entries,
+        ttl=config.cache.query_ttl_seconds,
+        invalidation_window=config.cache.query_invalidation_window_seconds,
+    )
+    single_flight = providers.Singleton(SingleFlight)
+    # Память о недавних event_id общая для всех пачек процесса
+    event_deduplicator = providers.Singleton(
+        EventDeduplicator,
+        capacity=config.ingest.dedup_capacity,
+        error_rate=config.ingest.dedup_error_rate,
+        window=config.ingest.dedup_window_seconds,
+    )
+    event_service = providers.Factory(
+        EventService,
+        events_crud,
+        catalogue_crud,
+        metrics_crud,
+        query_cache,
+        single_flight,
+        rules_engine if config.rules.enabled else None,
+        event_deduplicator if config.ingest.dedup_enabled else None,
+    )
+    # Один набор буферов на процесс: копит события из брокера
+    # и пишет их пачками, по полосе на уровень критичности
+    ingest_lanes = providers.Singleton(build_ingest_lanes, event_service)
+    # Очереди по ключу партиционирования перед полосами (INGEST_SHARDS_ENABLED)
+    ingest_shards = providers.Singleton(
+        IngestShards,
+        ingest_lanes,
+        shards=config.ingest.shards,
+        queue_size=config.ingest.shard_queue_size,
+        batch_size=config.ingest.batch_size,
+    )
+    # Куда подписчики брокера кладут события
+    ingest_sink = ingest_shards if config.ingest.shards_enabled else ingest_lanes
+
+    redis = providers.Resource(get_redis_injection)
+    # Чтение входящих событий из Redis Streams (BROKER_REDIS_STREAMS)
+    stream_consumer = providers.Singleton(
+        RedisStreamConsumer,
+        redis,
+        ingest_lanes,
+        stream=config.broker.incoming_event_channel,
+        group=config.broker.consumer_group,
+        batch_size=config.broker.batch_size,
+        block_ms=config.broker.stream_block_ms,
+        claim_idle_ms=config.broker.stream_claim_idle_ms,
+        claim_interval=config.broker.stream_claim_interval_ms / 1000.0,
+    )
+
+    rule_service = providers.Factory(RuleService, rules_crud, rules_engine)
+
+    # Один change stream на процесс, общий для всех клиентов live tail
+    event_stream = providers.Singleton(
+        EventStreamHub,
+        db,
+        queue_size=config.stream.queue_size,
+        max_clients=config.stream.max_clients,
+        reconnect_delay=config.stream.reconnect_delay_seconds,
+    )
 
     health_crud = providers.Factory(HealthCRUD, db)
     health_service = providers.Factory(HealthService, health_crud)
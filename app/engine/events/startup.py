@@ -4,6 +4,9 @@ from fastapi import FastAPI
 
 from app.adapters.db import close_mongodb, init_mongodb
 from app.adapters.db.index import init_indexes
+from app.api.asyncapi.events import send_message
+from app.dependencies.containers import Container
+from app.settings import config
 
 
 @asynccontextmanager
@@ -11,7 +14,26 @@ async def startup_application(app: FastAPI):
     # startup
     await init_mongodb()
     await init_indexes()
+    # Совпадения правил публикуются через брокер из слоя API
+    rules_engine = await Container.rules_engine()
+    rules_engine.set_publisher(send_message)
+    ingest_lanes = await Container.ingest_lanes()
+    await ingest_lanes.start()
+    if config.ingest.shards_enabled:
+        ingest_shards = await Container.ingest_shards()
+        await ingest_shards.start()
+    if config.broker.use_redis_streams:
+        stream_consumer = await Container.stream_consumer()
+        await stream_consumer.start()
 
     yield
     # shutdown
+    # Сначала дописываем накопленные события, потом закрываем соединение
+    if config.broker.use_redis_streams:
+        await stream_consumer.stop()
+        await Container.redis.tear_down()
+    if config.ingest.shards_enabled:
+        await ingest_shards.stop()
+    await ingest_lanes.stop()
+    await (await Container.event_stream()).close()
     await close_mongodb()
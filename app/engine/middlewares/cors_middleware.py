@@ -17,4 +17,6 @@ def add_corse_middleware(app: FastAPI):
             "Access-Control-Allow-Origin",
             "Authorization",
         ],
+        # Токен следующей страницы для keyset-пагинации GET /events/
+        expose_headers=["X-Next-Cursor"],
     )
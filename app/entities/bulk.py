@@ -0,0 +1,46 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class BulkItemError:
+    """Ошибка одной операции пачки"""
+
+    index: int  # позиция операции в переданном списке
+    code: int
+    message: str
+
+
+@dataclass
+class BulkResult:
+    """Итог bulk_write: счетчики без повторного чтения документов"""
+
+    inserted: int = 0
+    matched: int = 0
+    modified: int = 0
+    upserted: int = 0
+    deleted: int = 0
+    errors: list[BulkItemError] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @classmethod
+    def from_details(cls, details: dict[str, Any]) -> "BulkResult":
+        """Из BulkWriteResult.bulk_api_result или BulkWriteError.details"""
+        return cls(
+            inserted=details.get("nInserted", 0),
+            matched=details.get("nMatched", 0),
+            modified=details.get("nModified", 0),
+            upserted=details.get("nUpserted", 0),
+            deleted=details.get("nRemoved", 0),
+            errors=[
+                BulkItemError(
+                    index=error.get("index", -1),
+                    code=error.get("code", 0),
+                    message=error.get("errmsg", ""),
+                )
+                for error in details.get("writeErrors", [])
+            ],
+        )
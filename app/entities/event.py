@@ -18,3 +18,8 @@ class Event(DataBaseEntity):
     trace_id: str | None = None
     payload: dict | None = None
     metadata: dict | None = None
+
+    # Очередь постобработки: см. EventCRUD.claim_unprocessed_events
+    processed: bool = False
+    lease_id: str | None = None
+    lease_until: datetime | None = None
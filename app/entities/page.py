@@ -0,0 +1,22 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class Page(Generic[T]):
+    """Страница выборки и токен для запроса следующей страницы"""
+
+    items: list[T] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
+@dataclass
+class Lease(Generic[T]):
+    """Пачка документов, захваченная воркером до lease_until"""
+
+    lease_id: str
+    lease_until: datetime
+    items: list[T] = field(default_factory=list)
@@ -0,0 +1,15 @@
+from dataclasses import dataclass, field
+
+from app.entities.base import DataBaseEntity
+
+
+@dataclass
+class Rule(DataBaseEntity):
+    name: str
+    conditions: dict
+    actions: list[dict] = field(default_factory=list)
+    priority: int = 0
+    enabled: bool = True
+    description: str | None = None
+    # {"count": 5, "minutes": 10, "group_by": "user_id"} - оконное правило
+    window: dict | None = None
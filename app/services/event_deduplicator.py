@@ -0,0 +1,84 @@
+from typing import Any, Awaitable, Callable
+
+from app import getLogger
+from app.utils.bloom_filter import RotatingBloomFilter
+
+logging = getLogger("EventDeduplicator")
+
+ExistingLookup = Callable[[list[str]], Awaitable[set[str]]]
+
+
+class EventDeduplicator:
+    """Отсечение повторных доставок событий по event_id до записи в MongoDB.
+
+    Фильтр Блума помнит недавние event_id. Отрицательный ответ точный:
+    такое событие пишется сразу. Положительный может быть ложным, поэтому
+    подозрительные event_id проверяются одним запросом по уникальному
+    индексу, и новое событие никогда не теряется. Дубли, которые фильтр
+    не застал (другой воркер, рестарт), отсекает уникальный индекс.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+        window: float = 3600.0,
+    ):
+        self.seen = RotatingBloomFilter(capacity, error_rate, window)
+
+        self.checked = 0
+        self.batch_duplicates = 0
+        self.filter_duplicates = 0
+        self.false_positives = 0
+        self.db_duplicates = 0
+
+    async def filter_new(
+        self, events: list[dict[str, Any]], find_existing: ExistingLookup
+    ) -> list[dict[str, Any]]:
+        """События, которых еще нет в MongoDB.
+
+        Args:
+            events (list[dict[str, Any]]): пачка из брокера
+            find_existing (ExistingLookup): event_id -> уже записанные event_id
+
+        Returns:
+            list[dict[str, Any]]: новые события в исходном порядке
+        """
+        self.checked += len(events)
+        unique: dict[str, dict[str, Any]] = {}
+        without_id = []
+        for event in events:
+            event_id = event.get("event_id")
+            if event_id is None:
+                without_id.append(event)
+            elif event_id not in unique:
+                unique[event_id] = event
+        self.batch_duplicates += len(events) - len(unique) - len(without_id)
+
+        suspects = [event_id for event_id in unique if event_id in self.seen]
+        if suspects:
+            existing = await find_existing(suspects)
+            self.filter_duplicates += len(existing)
+            self.false_positives += len(suspects) - len(existing)
+            for event_id in existing:
+                del unique[event_id]
+
+        return [*unique.values(), *without_id]
+
+    def remember(self, events: list[dict[str, Any]], inserted: int) -> None:
+        """Запомнить записанную пачку и учесть дубли, отсеченные индексом"""
+        self.db_duplicates += len(events) - inserted
+        for event in events:
+            if (event_id := event.get("event_id")) is not None:
+                self.seen.add(event_id)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "checked": self.checked,
+            "batch_duplicates": self.batch_duplicates,
+            "filter_duplicates": self.filter_duplicates,
+            "false_positives": self.false_positives,
+            "db_duplicates": self.db_duplicates,
+            "filter_rotations": self.seen.rotations,
+            "filter_memory_bytes": self.seen.memory_bytes,
+        }
@@ -0,0 +1,197 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app import getLogger
+from app.adapters.db.const import MongoCollections
+from app.adapters.db.utils.conditions import compile_conditions
+from app.adapters.db.utils.mongo_filter import EventFilters
+from app.utils.export import default_serializer
+
+logging = getLogger("EventStream")
+
+
+class TooManySubscribersError(RuntimeError):
+    """Достигнут лимит подписчиков live tail на воркер"""
+
+
+class StreamSubscription:
+    """Подписчик live tail: фильтр и ограниченная очередь.
+
+    Если клиент не успевает читать, старые события вытесняются
+    новыми, а число пропущенных отдается клиенту вместе со следующим
+    событием. Change stream при этом никогда не ждет клиента.
+    """
+
+    def __init__(self, filter: dict[str, Any] | None = None, queue_size: int = 100):
+        filters = EventFilters(**(filter or {}))
+        self.matches = compile_conditions(filters.to_match_filter())
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self._dropped = 0
+
+        self.delivered = 0
+        self.dropped = 0
+
+    def offer(self, message: str) -> None:
+        """Положить событие в очередь, не блокируя поток изменений"""
+        if self._queue.full():
+            self._queue.get_nowait()
+            self._dropped += 1
+            self.dropped += 1
+        self._queue.put_nowait(message)
+
+    async def get(self) -> tuple[str, int]:
+        """Следующее событие и сколько событий пропущено перед ним"""
+        message = await self._queue.get()
+        dropped, self._dropped = self._dropped, 0
+        self.delivered += 1
+        return message, dropped
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+
+class EventStreamHub:
+    """Один change stream по events на воркер, раздаваемый всем клиентам.
+
+    Change stream открывается с первым подписчиком и закрывается
+    с последним: клиенты не занимают соединения из пула MongoDB
+    (max_pool_size), а фильтры клиентов проверяются в процессе.
+    Документ сериализуется в JSON один раз на все подходящие подписки.
+
+    Usage:
+
+    async with hub.subscription({"event_type": "PAYMENT_FAILED"}) as subscription:
+        message, dropped = await subscription.get()
+    """
+
+    def __init__(
+        self,
+        db: AsyncDatabase,
+        queue_size: int = 100,
+        max_clients: int = 500,
+        reconnect_delay: float = 1.0,
+    ):
+        self.db = db
+        self.queue_size = queue_size
+        self.max_clients = max_clients
+        self.reconnect_delay = reconnect_delay
+
+        self._subscriptions: set[StreamSubscription] = set()
+        self._task: asyncio.Task | None = None
+        self._resume_token: dict | None = None
+
+        self.received = 0
+        self.reconnects = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @asynccontextmanager
+    async def subscription(
+        self, filter: dict[str, Any] | None = None
+    ) -> AsyncIterator[StreamSubscription]:
+        subscription = self.subscribe(filter)
+        try:
+            yield subscription
+        finally:
+            await self.unsubscribe(subscription)
+
+    def subscribe(self, filter: dict[str, Any] | None = None) -> StreamSubscription:
+        """Добавить подписчика и открыть change stream, если он закрыт.
+
+        Raises:
+            TooManySubscribersError: достигнут max_clients
+        """
+        if len(self._subscriptions) >= self.max_clients:
+            raise TooManySubscribersError(
+                f"Live tail subscribers limit reached: {self.max_clients}"
+            )
+
+        subscription = StreamSubscription(filter, self.queue_size)
+        self._subscriptions.add(subscription)
+        if not self.is_running:
+            self._task = asyncio.create_task(
+                self._watch(), name="Events change stream"
+            )
+        return subscription
+
+    async def unsubscribe(self, subscription: StreamSubscription) -> None:
+        self._subscriptions.discard(subscription)
+        if not self._subscriptions:
+            await self.close()
+
+    async def close(self) -> None:
+        """Закрыть change stream"""
+        # Подписчик, пришедший во время закрытия, откроет новый поток
+        task, self._task = self._task, None
+        # Следующий подписчик начинает с текущего момента, а не с пропущенного
+        self._resume_token = None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def publish(self, document: dict[str, Any]) -> int:
+        """Раздать документ подходящим подписчикам.
+
+        Returns:
+            int: к-во подписчиков, получивших документ
+        """
+        self.received += 1
+        message = None
+        delivered = 0
+        for subscription in tuple(self._subscriptions):
+            if not subscription.matches(document):
+                continue
+            if message is None:
+                message = json.dumps(
+                    document, default=default_serializer, ensure_ascii=False
+                )
+            subscription.offer(message)
+            delivered += 1
+        return delivered
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "running": int(self.is_running),
+            "subscribers": len(self._subscriptions),
+            "received": self.received,
+            "reconnects": self.reconnects,
+            "delivered": sum(s.delivered for s in self._subscriptions),
+            "dropped": sum(s.dropped for s in self._subscriptions),
+        }
+
+    async def _watch(self) -> None:
+        pipeline = [{"$match": {"operationType": "insert"}}]
+        logging.info("Opening events change stream")
+
+        while True:
+            try:
+                stream = await self.db[MongoCollections.events].watch(
+                    pipeline, resume_after=self._resume_token
+                )
+                async with stream:
+                    async for change in stream:
+                        self._resume_token = change["_id"]
+                        self.publish(change["fullDocument"])
+            except OperationFailure as e:
+                # Токен устарел (oplog перезаписан) или нет replica set:
+                # продолжаем с текущего момента
+                self._resume_token = None
+                self.reconnects += 1
+                logging.error(f"Events change stream failed: {e}")
+                await asyncio.sleep(self.reconnect_delay)
+            except PyMongoError as e:
+                # Обрыв соединения: продолжаем с последнего токена
+                self.reconnects += 1
+                logging.error(f"Events change stream failed: {e}")
+                await asyncio.sleep(self.reconnect_delay)
@@ -1,39 +1,151 @@
-from typing import Any
+import asyncio
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable
+
+from pymongo.write_concern import WriteConcern
 
 from app import getLogger
+from app.adapters.db.cruds.catalogue import CatalogueCRUD
 from app.adapters.db.cruds.event import EventCRUD
+from app.adapters.db.cruds.metrics import MetricsCRUD
 from app.services.base import BaseService
+from app.services.event_deduplicator import EventDeduplicator
+from app.services.rules_engine import RulesEngine
+from app.utils.enums import CatalogueKindEnum
+from app.utils.export import EXPORTERS
+from app.utils.query_cache import QueryCache, make_query_key
+from app.utils.single_flight import SingleFlight
 
 logging = getLogger("EventService")
 
 
 class EventService(BaseService):
-    def __init__(self, repository: EventCRUD):
+    def __init__(
+        self,
+        repository: EventCRUD,
+        catalogue: CatalogueCRUD | None = None,
+        metrics: MetricsCRUD | None = None,
+        cache: QueryCache | None = None,
+        single_flight: SingleFlight | None = None,
+        rules: RulesEngine | None = None,
+        dedup: EventDeduplicator | None = None,
+    ):
         super().__init__(repository)
+        self.catalogue = catalogue
+        self.metrics = metrics
+        self.cache = cache
+        self.single_flight = single_flight
+        self.rules = rules
+        self.dedup = dedup
+        # Производные данные и реакции, которые выполняются при записи событий
+        self._ingest_hooks = [hook for hook in (catalogue, metrics, rules) if hook]
 
-    async def create_event(self, event: dict[str, Any]):
+    async def create_event(self, event: dict[str, Any], verify: bool = False):
         logging.debug(f"Start creating event. Type: {event.get('type')}")
-        return await self.repo.create(event)
+        res = await self.repo.create(event, verify=verify)
+        await self._after_ingest([event])
+        return res
 
-    async def create_events(self, data_list: list[dict[str, Any]]):
+    async def create_events(
+        self, data_list: list[dict[str, Any]], verify: bool = False
+    ):
         logging.debug(f"Start creating {len(data_list)} events")
-        ids = await self.repo.bulk_create(data_list)
-        ids = list(map(self.repo.convert_id_to_ObjectId, ids))
-        logging.debug(f"Created events: {len(ids)}")
-        res = await self.repo.get_all({"_id": {"$in": ids}})
+        res = await self.repo.bulk_create_entities(data_list, verify=verify)
+        logging.debug(f"Created events: {len(res)}")
+        await self._after_ingest(data_list)
         return [event.to_dict() for event in res]
 
+    async def ingest_events(
+        self,
+        data_list: list[dict[str, Any]],
+        write_concern: WriteConcern | None = None,
+    ) -> int:
+        """Запись пачки событий из брокера.
+
+        Вставка неупорядоченная и без повторного чтения документов:
+        подписчику нужен только факт записи. Повторные доставки
+        (тот же event_id) пропускаются и не считаются ошибкой.
+
+        Args:
+            data_list (list[dict[str, Any]]): события из брокера
+            write_concern (WriteConcern | None): подтверждение записи пачки,
+                по умолчанию - заданное для клиента
+
+        Returns:
+            int: количество записанных событий
+        """
+        events = data_list
+        if self.dedup is not None:
+            events = await self.dedup.filter_new(
+                data_list, self.repo.get_existing_event_ids
+            )
+
+        ids = await self.repo.bulk_create(
+            events, ordered=False, skip_duplicates=True, write_concern=write_concern
+        )
+        logging.debug(f"Ingested events: {len(ids)} of {len(data_list)}")
+
+        if self.dedup is not None:
+            self.dedup.remember(events, len(ids))
+        if len(ids) < len(events):
+            # Производные данные только по действительно записанным событиям
+            inserted = set(ids)
+            events = [event for event in events if str(event.get("_id")) in inserted]
+
+        await self._after_ingest(events)
+        return len(ids)
+
+    async def _after_ingest(self, events: list[dict[str, Any]]) -> None:
+        """Обновление производных данных после записи событий.
+
+        События к этому моменту уже в MongoDB,
+        поэтому ошибки здесь логируются и не прерывают запись.
+
+        Args:
+            events (list[dict[str, Any]]): записанные документы
+        """
+        if self.cache is not None:
+            self.cache.invalidate(
+                types={event.get("type") for event in events},
+                sources={event.get("source") for event in events},
+            )
+
+        results = await asyncio.gather(
+            *(hook.register_events(events) for hook in self._ingest_hooks),
+            return_exceptions=True,
+        )
+        for hook, result in zip(self._ingest_hooks, results):
+            if isinstance(result, Exception):
+                hook_name = hook.__class__.__name__
+                logging.error(f"Ingest hook {hook_name} failed: {result}")
+
     async def get_recent_events(self, hours: int = 24):
         res = await self.repo.get_recent_events(hours)
         logging.debug(f"Got recent events: {len(res)}")
         return [event.to_dict() for event in res]
 
     async def get_event_types(self):
+        if self.catalogue is not None:
+            return await self.catalogue.get_values(CatalogueKindEnum.type)
         return await self.repo.get_event_types()
 
     async def get_event_sources(self):
+        if self.catalogue is not None:
+            return await self.catalogue.get_values(CatalogueKindEnum.source)
         return await self.repo.get_event_sources()
 
+    async def get_types_statistics(self):
+        return await self._cached(
+            make_query_key("types_statistics"),
+            self.metrics.aggregate_events_by_type,
+        )
+
+    async def get_daily_statistics(self, days: int = 7):
+        return await self._cached(
+            make_query_key("daily_statistics", {"days": days}),
+            lambda: self.metrics.aggregate_daily_statistics(days),
+        )
+
     async def get_events_by_type(self, event_type: str):
         return await self.repo.get_events_by_type(event_type)
 
@@ -42,4 +154,74 @@ class EventService(BaseService):
         filter: dict[str, Any],
         pagination: dict[str, Any],
     ):
-        return await self.repo.get_filtered_events(filter, pagination)
+        return await self._cached(
+            make_query_key("events_list", filter, pagination),
+            lambda: self.repo.get_filtered_events(filter, pagination),
+            filter,
+        )
+
+    async def _cached(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        filter: dict[str, Any] | None = None,
+    ):
+        """Выполнить запрос через кэш результатов и схлопывание дублей.
+
+        Промах кэша идет через SingleFlight: одновременные одинаковые
+        запросы делают один поход в MongoDB.
+        """
+        if self.single_flight is not None:
+            loader = partial(self.single_flight.do, key, loader)
+
+        if self.cache is None:
+            return await loader()
+        return await self.cache.get_or_load(key, loader, filter)
+
+    async def claim_events(self, limit: int, lease_seconds: float):
+        """Захватить пачку необработанных событий для постобработки"""
+        lease = await self.repo.claim_unprocessed_events(limit, lease_seconds)
+        logging.debug(f"Lease {lease.lease_id}: {len(lease.items)} events")
+        return lease
+
+    async def ack_events(
+        self,
+        lease_id: str,
+        processed_ids: list[str],
+        released_ids: list[str] | None = None,
+    ) -> int:
+        """Подтвердить обработку пачки и вернуть в очередь остальное"""
+        modified = await self.repo.ack_events(lease_id, processed_ids, released_ids)
+        expected = len(processed_ids) + len(released_ids or [])
+        if modified < expected:
+            logging.warning(
+                f"Lease {lease_id}: {expected - modified} events were not acknowledged"
+            )
+        return modified
+
+    async def backfill_processed_flag(self) -> int:
+        return await self.repo.backfill_processed_flag()
+
+    def export_events(
+        self, filter: dict[str, Any], export: dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Потоковая выгрузка событий кусками NDJSON или CSV.
+
+        Args:
+            filter (dict[str, Any]): параметры EventFilters, как у списка событий
+            export (dict[str, Any]): format, batch_size, fields
+
+        Returns:
+            AsyncIterator[str]: куски ответа
+        """
+        fields = [
+            field.strip()
+            for field in (export.get("fields") or "").split(",")
+            if field.strip()
+        ]
+        projection = dict.fromkeys(fields, 1) if fields else None
+        batch_size = export["batch_size"]
+
+        documents = self.repo.iter_filtered_events(filter, projection, batch_size)
+        exporter = EXPORTERS[export["format"]]
+        return exporter(documents, fields or None, batch_size)
@@ -0,0 +1,390 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any
+
+from pymongo.errors import (
+    ConnectionFailure,
+    ExecutionTimeout,
+    PyMongoError,
+    WTimeoutError,
+)
+from pymongo.write_concern import WriteConcern
+
+from app import getLogger
+from app.services.events_service import EventService
+from app.utils.spool import SegmentSpool
+
+logging = getLogger("IngestBuffer")
+
+# Окно, за которое считается скорость дозаписи из журнала
+REPLAY_RATE_WINDOW = 60.0
+
+
+def is_unavailable(error: Exception) -> bool:
+    """MongoDB недоступна или перегружена: запись стоит повторить позже.
+
+    Ошибки самих данных (валидация, BulkWriteError) повтором не лечатся.
+    """
+    if isinstance(error, (ConnectionFailure, ExecutionTimeout, WTimeoutError)):
+        return True
+    return isinstance(error, PyMongoError) and error.has_error_label(
+        "RetryableWriteError"
+    )
+
+
+class IngestBuffer:
+    """Буфер микро-батчей между подписчиком брокера и MongoDB.
+
+    Копит входящие события и сбрасывает их одной неупорядоченной вставкой,
+    как только набралось batch_size событий или прошло flush_interval секунд.
+    Вместо insert_one + find_one на каждое сообщение - один insert_many на пачку.
+
+    С журналом (spool) пачка не теряется, если MongoDB недоступна
+    (failover, обрыв сети) или не успевает: предыдущая пачка пишется
+    дольше saturation_timeout секунд. Такая пачка дописывается в локальный
+    журнал на диске, а фоновая задача дозаписывает журнал в MongoDB,
+    когда она снова отвечает. Пока MongoDB недоступна, новые пачки
+    сразу идут в журнал, а попытки дозаписи реже (до replay_max_backoff).
+    Повторная запись безопасна: дубли отсекаются по event_id.
+
+    write_concern задает подтверждение записи пачек этого буфера
+    (см. IngestLanes), по умолчанию - заданное для клиента MongoDB.
+
+    Usage:
+
+    buffer = IngestBuffer(service, batch_size=500, flush_interval=0.05)
+    await buffer.start()
+    await buffer.put(event)
+    ...
+    await buffer.stop()  # дописывает все, что осталось в буфере
+    """
+
+    def __init__(
+        self,
+        service: EventService,
+        batch_size: int = 500,
+        flush_interval: float = 0.05,
+        spool: SegmentSpool | None = None,
+        saturation_timeout: float = 0.5,
+        replay_interval: float = 1.0,
+        replay_max_backoff: float = 30.0,
+        replay_concurrency: int = 4,
+        write_concern: WriteConcern | None = None,
+        name: str = "default",
+    ):
+        self.service = service
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spool = spool
+        self.saturation_timeout = saturation_timeout
+        self.replay_interval = replay_interval
+        self.replay_max_backoff = replay_max_backoff
+        self.replay_concurrency = replay_concurrency
+        self.write_concern = write_concern
+        self.name = name
+
+        self._buffer: list[dict[str, Any]] = []
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._replay_task: asyncio.Task | None = None
+        # Завершается записью текущей пачки, если ее ждут (put с wait=True)
+        self._batch_done: asyncio.Future | None = None
+        # (время, к-во событий) дозаписанных сегментов за REPLAY_RATE_WINDOW
+        self._replayed: deque[tuple[float, int]] = deque()
+
+        # MongoDB недоступна: пачки пишутся сразу в журнал
+        self.degraded = False
+
+        self.flushed_batches = 0
+        self.flushed_events = 0
+        self.failed_events = 0
+        self.spooled_events = 0
+        self.saturated = 0
+        self.replayed_events = 0
+        self.replay_failures = 0
+
+    @property
+    def pending(self) -> int:
+        """Количество событий, ожидающих записи"""
+        return len(self._buffer)
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def replay_rate(self) -> float:
+        """Событий в секунду, дозаписанных из журнала за последнюю минуту"""
+        self._trim_replayed()
+        return sum(count for _, count in self._replayed) / REPLAY_RATE_WINDOW
+
+    async def start(self) -> None:
+        """Запуск фонового сброса буфера по времени и дозаписи журнала"""
+        if self.is_running:
+            logging.warning(f"Ingest buffer <{self.name}> already started")
+            return
+
+        self._task = asyncio.create_task(
+            self._flush_periodically(), name="Ingest buffer flusher"
+        )
+        if self.spool is not None:
+            await self.spool.open()
+            self._replay_task = asyncio.create_task(
+                self._replay_periodically(), name="Ingest spool replay"
+            )
+        logging.info(
+            f"Ingest buffer <{self.name}> started. Batch size: {self.batch_size}, "
+            f"flush interval: {self.flush_interval}s, "
+            f"write concern: {self.write_concern or 'default'}, "
+            f"spool: {self.spool.directory if self.spool else None}"
+        )
+
+    async def stop(self) -> None:
+        """Остановка фоновых задач и запись оставшихся событий.
+
+        Недописанный журнал остается на диске до следующего запуска.
+        """
+        for task in (self._task, self._replay_task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._task = self._replay_task = None
+
+        await self.flush()
+        if self.spool is not None:
+            await self.spool.close()
+        logging.info(f"Ingest buffer <{self.name}> stopped. Stats: {self.stats()}")
+
+    async def put(self, event: dict[str, Any], wait: bool = False) -> None:
+        """Добавить событие в буфер.
+
+        Если буфер заполнен, пачка записывается сразу,
+        а вызывающий ждет окончания записи (backpressure на подписчика).
+        С журналом ожидание ограничено saturation_timeout.
+
+        Args:
+            event (dict[str, Any]): событие
+            wait (bool): дождаться записи пачки с этим событием в MongoDB
+                или в журнал (с fsync) - для брокеров, подтверждающих
+                сообщение после возврата из обработчика
+
+        Raises:
+            Exception: пачку не удалось записать (только при wait)
+        """
+        self._buffer.append(event)
+        done = None
+        if wait:
+            if self._batch_done is None:
+                self._batch_done = asyncio.get_running_loop().create_future()
+            done = self._batch_done
+
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+        if done is not None:
+            # Пачку ждут несколько обработчиков: отмена одного не отменяет ее
+            await asyncio.shield(done)
+
+    async def flush(self) -> int:
+        """Записать накопленные события.
+
+        Returns:
+            int: количество событий в записанной пачке
+        """
+        if self.spool is None:
+            async with self._lock:
+                return await self._write()
+
+        try:
+            await asyncio.wait_for(self._lock.acquire(), self.saturation_timeout)
+        except TimeoutError:
+            # Предыдущая пачка еще пишется: MongoDB не успевает
+            if not self._buffer:
+                return 0
+            self.saturated += 1
+            await self._spill(*self._take())
+            return 0
+
+        try:
+            return await self._write()
+        finally:
+            self._lock.release()
+
+    async def write(self, batch: list[dict[str, Any]], sync: bool = True) -> int:
+        """Записать пачку сразу, минуя буфер.
+
+        Для транспорта с подтверждением доставки (Redis Streams):
+        когда вызов вернулся, пачка записана в MongoDB или в журнал
+        на диске (с fsync), и сообщения можно подтверждать.
+
+        Args:
+            batch (list[dict[str, Any]]): события
+            sync (bool): fsync журнала сразу, а не раз в fsync_interval
+
+        Returns:
+            int: количество событий, записанных в MongoDB
+
+        Raises:
+            PyMongoError: MongoDB недоступна, а журнала нет
+            OSError: не удалось записать журнал
+        """
+        if not batch:
+            return 0
+
+        if not self.degraded:
+            try:
+                await self.service.ingest_events(batch, self.write_concern)
+            except Exception as e:
+                if self.spool is None or not is_unavailable(e):
+                    raise
+                logging.error(f"MongoDB is unavailable, spooling events: {e}")
+                self.degraded = True
+            else:
+                self.flushed_batches += 1
+                self.flushed_events += len(batch)
+                return len(batch)
+
+        await self.spool.append(batch)
+        if sync:
+            await self.spool.sync()
+        self.spooled_events += len(batch)
+        return 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "pending": self.pending,
+            "flushed_batches": self.flushed_batches,
+            "flushed_events": self.flushed_events,
+            "failed_events": self.failed_events,
+            "degraded": self.degraded,
+            "saturated": self.saturated,
+            "spooled_events": self.spooled_events,
+            "spool_depth": self.spool.depth if self.spool else 0,
+            "spool_segments": self.spool.segments if self.spool else 0,
+            "spool_bytes": self.spool.size_bytes if self.spool else 0,
+            "replayed_events": self.replayed_events,
+            "replay_rate": self.replay_rate,
+            "replay_failures": self.replay_failures,
+        }
+
+    async def replay(self) -> int:
+        """Дозаписать журнал в MongoDB, от старых сегментов к новым.
+
+        Сегмент пишется пачками по batch_size, не больше replay_concurrency
+        одновременно, и удаляется после записи всех пачек.
+        Если MongoDB снова недоступна, дозапись прерывается,
+        а сегмент остается в журнале целиком.
+
+        Returns:
+            int: к-во событий в дозаписанных сегментах
+
+        Raises:
+            PyMongoError: MongoDB недоступна
+        """
+        replayed = 0
+        semaphore = asyncio.Semaphore(self.replay_concurrency)
+
+        async def replay_batch(batch: list[dict[str, Any]]) -> None:
+            async with semaphore:
+                try:
+                    await self.service.ingest_events(batch, self.write_concern)
+                except Exception as e:
+                    if is_unavailable(e):
+                        raise
+                    # Пачку не записать и повтором: не блокируем журнал
+                    self.failed_events += len(batch)
+                    logging.error(f"Failed to replay {len(batch)} events: {e}")
+
+        while (segment := await self.spool.oldest_segment()) is not None:
+            events = await self.spool.read(segment)
+            results = await asyncio.gather(
+                *(
+                    replay_batch(events[i : i + self.batch_size])
+                    for i in range(0, len(events), self.batch_size)
+                ),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+
+            await self.spool.remove(segment)
+            self.degraded = False
+            replayed += len(events)
+            self.replayed_events += len(events)
+            self._replayed.append((time.monotonic(), len(events)))
+            logging.info(f"Replayed spool segment {segment.name}: {len(events)}")
+
+        return replayed
+
+    def _take(self) -> tuple[list[dict[str, Any]], asyncio.Future | None]:
+        """Забрать пачку из буфера вместе с ожидающими ее записи"""
+        batch, self._buffer = self._buffer, []
+        done, self._batch_done = self._batch_done, None
+        return batch, done
+
+    async def _write(self) -> int:
+        if not self._buffer:
+            return 0
+
+        batch, done = self._take()
+        try:
+            written = await self.write(batch, sync=done is not None)
+        except Exception as e:
+            self.failed_events += len(batch)
+            logging.error(f"Failed to flush {len(batch)} events: {e}")
+            if done is not None:
+                done.set_exception(e)
+            return 0
+
+        if done is not None:
+            done.set_result(written)
+        return written
+
+    async def _spill(
+        self, batch: list[dict[str, Any]], done: asyncio.Future | None = None
+    ) -> None:
+        """Дописать пачку в журнал вместо MongoDB"""
+        try:
+            await self.spool.append(batch)
+            if done is not None:
+                await self.spool.sync()
+        except Exception as e:
+            self.failed_events += len(batch)
+            logging.error(f"Failed to spool {len(batch)} events: {e}")
+            if done is not None:
+                done.set_exception(e)
+            return
+
+        self.spooled_events += len(batch)
+        if done is not None:
+            done.set_result(0)
+
+    def _trim_replayed(self) -> None:
+        threshold = time.monotonic() - REPLAY_RATE_WINDOW
+        while self._replayed and self._replayed[0][0] < threshold:
+            self._replayed.popleft()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def _replay_periodically(self) -> None:
+        delay = self.replay_interval
+        while True:
+            await asyncio.sleep(delay)
+            if not self.spool.depth:
+                continue
+            try:
+                await self.replay()
+                delay = self.replay_interval
+            except Exception as e:
+                # Следующая попытка реже, пока MongoDB не поднимется
+                self.replay_failures += 1
+                delay = min(delay * 2, self.replay_max_backoff)
+                logging.warning(f"Spool replay failed, retry in {delay}s: {e}")
@@ -0,0 +1,157 @@
+from itertools import groupby
+from pathlib import Path
+from typing import Any
+
+from pymongo.write_concern import WriteConcern
+
+from app import getLogger
+from app.adapters.db.utils.expire import get_severity_band
+from app.services.events_service import EventService
+from app.services.ingest_buffer import IngestBuffer
+from app.settings import config
+from app.utils.enums import SeverityBandEnum
+from app.utils.spool import SegmentSpool
+
+logging = getLogger("IngestLanes")
+
+
+class IngestLanes:
+    """Прием событий полосами по критичности (get_severity_band).
+
+    У каждой полосы свой буфер: очередь, размер пачки, интервал сброса,
+    подтверждение записи, журнал и метрики. Критичные события идут
+    маленькими пачками с w: majority и не ждут, пока наберется пачка
+    шумных событий, а низкокритичный поток пишется крупными пачками
+    с w: 1 и не платит за репликацию на большинство узлов.
+
+    Несколько полос могут делить один буфер (например, если полосы
+    выключены - все события идут в один буфер).
+
+    Usage:
+
+    lanes = IngestLanes({
+        SeverityBandEnum.critical: critical_buffer,
+        SeverityBandEnum.medium: bulk_buffer,
+        SeverityBandEnum.low: bulk_buffer,
+    })
+    await lanes.start()
+    await lanes.put(event)
+    """
+
+    def __init__(self, lanes: dict[SeverityBandEnum, IngestBuffer]):
+        missing = set(SeverityBandEnum) - set(lanes)
+        if missing:
+            raise ValueError(f"No ingest lane for severity bands: {missing}")
+        self.lanes = lanes
+
+    @property
+    def buffers(self) -> list[IngestBuffer]:
+        """Уникальные буферы полос"""
+        return list({id(buffer): buffer for buffer in self.lanes.values()}.values())
+
+    @property
+    def pending(self) -> int:
+        return sum(buffer.pending for buffer in self.buffers)
+
+    def lane(self, event: dict[str, Any]) -> IngestBuffer:
+        return self.lanes[get_severity_band(event.get("severity"))]
+
+    async def start(self) -> None:
+        for buffer in self.buffers:
+            await buffer.start()
+
+    async def stop(self) -> None:
+        """Остановка всех полос, критичная дописывается первой"""
+        for buffer in self.buffers:
+            await buffer.stop()
+
+    async def put(self, event: dict[str, Any], wait: bool = False) -> None:
+        """Добавить событие в буфер его полосы (см. IngestBuffer.put)"""
+        await self.lane(event).put(event, wait=wait)
+
+    async def write(self, events: list[dict[str, Any]], ordered: bool = False) -> int:
+        """Записать события сразу, пачкой на полосу (см. IngestBuffer.write)
+
+        Args:
+            events (list[dict[str, Any]]): события
+            ordered (bool): сохранить порядок событий - подряд идущие события
+                одной полосы пишутся пачкой, пачки по очереди
+
+        Returns:
+            int: количество событий, записанных в MongoDB
+        """
+        if ordered:
+            written = 0
+            for buffer, batch in groupby(events, key=self.lane):
+                written += await buffer.write(list(batch))
+            return written
+
+        batches: dict[int, list[dict[str, Any]]] = {}
+        for event in events:
+            batches.setdefault(id(self.lane(event)), []).append(event)
+
+        written = 0
+        for buffer in self.buffers:
+            if batch := batches.get(id(buffer)):
+                written += await buffer.write(batch)
+        return written
+
+    async def flush(self) -> int:
+        flushed = 0
+        for buffer in self.buffers:
+            flushed += await buffer.flush()
+        return flushed
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {buffer.name: buffer.stats() for buffer in self.buffers}
+
+
+def _build_lane(
+    service: EventService, name: str, lane: dict[str, Any], spool_dir: Path
+) -> IngestBuffer:
+    settings = config.ingest
+    spool = None
+    if settings.spool_enabled:
+        spool = SegmentSpool(
+            spool_dir,
+            segment_max_bytes=settings.spool_segment_max_bytes,
+            fsync_interval=settings.spool_fsync_interval,
+        )
+    return IngestBuffer(
+        service,
+        batch_size=lane["batch_size"],
+        flush_interval=lane["flush_interval"],
+        spool=spool,
+        saturation_timeout=settings.spool_saturation_timeout,
+        replay_interval=settings.spool_replay_interval,
+        replay_max_backoff=settings.spool_replay_max_backoff_seconds,
+        replay_concurrency=settings.spool_replay_concurrency,
+        write_concern=WriteConcern(
+            w=lane["w"], wtimeout=settings.write_concern_timeout_ms
+        ),
+        name=name,
+    )
+
+
+def build_ingest_lanes(service: EventService) -> IngestLanes:
+    """Полосы приема по настройкам ingest.
+
+    Журнал у каждой полосы свой (подкаталог spool_dir),
+    чтобы дозапись шла с подтверждением своей полосы.
+    """
+    settings = config.ingest
+    spool_dir = Path(settings.spool_dir)
+    if not settings.lanes_enabled:
+        buffer = _build_lane(service, "default", settings.lanes["medium"], spool_dir)
+        return IngestLanes({band: buffer for band in SeverityBandEnum})
+
+    # Критичная полоса первой запускается и первой дописывается при остановке
+    bands = [SeverityBandEnum.critical, SeverityBandEnum.medium, SeverityBandEnum.low]
+    return IngestLanes(
+        {
+            band: _build_lane(
+                service, str(band), settings.lanes[str(band)], spool_dir / str(band)
+            )
+            for band in bands
+        }
+    )
@@ -0,0 +1,167 @@
+import asyncio
+from typing import Any
+from zlib import crc32
+
+from app import getLogger
+from app.services.ingest_lanes import IngestLanes
+
+logging = getLogger("IngestShards")
+
+# Поля ключа партиционирования по убыванию приоритета
+PARTITION_KEY_FIELDS = ("user_id", "session_id", "source")
+
+QueueItem = tuple[dict[str, Any], asyncio.Future | None]
+
+
+def partition_key(event: dict[str, Any]) -> str:
+    """Ключ, в пределах которого сохраняется порядок событий"""
+    for field in PARTITION_KEY_FIELDS:
+        if value := event.get(field):
+            return f"{field}:{value}"
+    return ""
+
+
+class ShardWorker:
+    """Очередь шарда и ее статистика"""
+
+    def __init__(self, index: int, queue_size: int):
+        self.index = index
+        self.queue: asyncio.Queue[QueueItem] = asyncio.Queue(maxsize=queue_size)
+
+        self.max_depth = 0
+        self.processed = 0
+        self.failed = 0
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "shard": self.index,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "processed": self.processed,
+            "failed": self.failed,
+        }
+
+
+class IngestShards:
+    """Параллельная запись событий с порядком внутри ключа.
+
+    Событие попадает в шард по crc32 ключа партиционирования (user_id,
+    если его нет - session_id, затем source). У каждого шарда своя
+    очередь и одна задача-обработчик, которая забирает из очереди все
+    накопившееся (до batch_size) и пишет пачку с сохранением порядка
+    (IngestLanes.write с ordered=True). События одного ключа пишутся
+    строго по очереди, разные шарды - параллельно: оконные правила и
+    восстановление сессий видят события пользователя в порядке прихода.
+
+    Очереди ограничены queue_size: горячий ключ тормозит только свой шард,
+    его видно по depth/max_depth в stats().
+
+    Usage:
+
+    shards = IngestShards(lanes, shards=8)
+    await shards.start()
+    await shards.put(event)
+    ...
+    await shards.stop()  # дописывает очереди
+    """
+
+    def __init__(
+        self,
+        lanes: IngestLanes,
+        shards: int = 8,
+        queue_size: int = 10000,
+        batch_size: int = 500,
+    ):
+        self.lanes = lanes
+        self.batch_size = batch_size
+        self.workers = [ShardWorker(index, queue_size) for index in range(shards)]
+
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def is_running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    @property
+    def pending(self) -> int:
+        return sum(worker.depth for worker in self.workers)
+
+    def shard(self, event: dict[str, Any]) -> ShardWorker:
+        key = partition_key(event)
+        return self.workers[crc32(key.encode()) % len(self.workers)]
+
+    async def start(self) -> None:
+        if self.is_running:
+            logging.warning("Ingest shards already started")
+            return
+
+        self._tasks = [
+            asyncio.create_task(self._process(worker), name=f"Ingest shard {index}")
+            for index, worker in enumerate(self.workers)
+        ]
+        logging.info(f"Ingest shards started: {len(self.workers)}")
+
+    async def stop(self) -> None:
+        """Дождаться записи очередей и остановить обработчики"""
+        if self.is_running:
+            await asyncio.gather(*(worker.queue.join() for worker in self.workers))
+        for task in self._tasks:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        logging.info(f"Ingest shards stopped. Stats: {self.stats()}")
+
+    async def put(self, event: dict[str, Any], wait: bool = False) -> None:
+        """Поставить событие в очередь его шарда.
+
+        Если очередь шарда заполнена, вызывающий ждет (backpressure).
+
+        Args:
+            event (dict[str, Any]): событие
+            wait (bool): дождаться записи события (см. IngestBuffer.put)
+
+        Raises:
+            Exception: событие не удалось записать (только при wait)
+        """
+        worker = self.shard(event)
+        done = asyncio.get_running_loop().create_future() if wait else None
+        await worker.queue.put((event, done))
+        worker.max_depth = max(worker.max_depth, worker.depth)
+        if done is not None:
+            await done
+
+    def stats(self) -> list[dict[str, int]]:
+        return [worker.stats() for worker in self.workers]
+
+    async def _process(self, worker: ShardWorker) -> None:
+        queue = worker.queue
+        while True:
+            items = [await queue.get()]
+            while len(items) < self.batch_size and not queue.empty():
+                items.append(queue.get_nowait())
+
+            try:
+                await self.lanes.write([event for event, _ in items], ordered=True)
+            except Exception as e:
+                worker.failed += len(items)
+                logging.error(
+                    f"Shard {worker.index} failed to write {len(items)} events: {e}"
+                )
+                for _, done in items:
+                    if done is not None and not done.done():
+                        done.set_exception(e)
+            else:
+                worker.processed += len(items)
+                for _, done in items:
+                    if done is not None and not done.done():
+                        done.set_result(None)
+            finally:
+                for _ in items:
+                    queue.task_done()
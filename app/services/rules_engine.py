@@ -0,0 +1,290 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from app import getLogger
+from app.adapters.db.cruds.rule import RuleCRUD
+from app.adapters.db.utils.conditions import (
+    MISSING,
+    Predicate,
+    RuleConditionError,
+    compile_conditions,
+    compile_path,
+    indexed_values,
+)
+from app.adapters.schemas.notifications import NotificationSchema
+from app.entities.rule import Rule
+from app.utils.sliding_window import SlidingWindowCounter
+
+logging = getLogger("RulesEngine")
+
+Publisher = Callable[[NotificationSchema], Awaitable[Any]]
+
+
+@dataclass(slots=True)
+class CompiledRule:
+    rule: Rule
+    matches: Predicate
+    # Только у оконных правил
+    window: SlidingWindowCounter | None = None
+    group_by: Callable[[dict[str, Any]], Any] | None = None
+
+    @property
+    def priority(self) -> int:
+        return self.rule.priority
+
+    def window_key(self, event: dict[str, Any]) -> Any:
+        """Значение поля группировки или MISSING, если его нет в событии"""
+        if self.group_by is None:
+            return None
+        key = self.group_by(event)
+        return MISSING if key is None else key
+
+    def fires(self, event: dict[str, Any]) -> bool:
+        """Событие подходит под условия и, для оконного правила, добивает порог"""
+        if not self.matches(event):
+            return False
+        if self.window is None:
+            return True
+
+        key = self.window_key(event)
+        if key is MISSING:
+            return False
+        try:
+            return self.window.hit(key)
+        except TypeError:
+            # Нехешируемое значение поля (dict, list) ключом окна быть не может
+            return False
+
+
+def window_signature(rule: Rule) -> tuple | None:
+    """Счетчики переживают перезагрузку правил, пока не изменилось окно"""
+    if not rule.window:
+        return None
+    return (
+        rule.id,
+        rule.window["count"],
+        rule.window["minutes"],
+        rule.window.get("group_by"),
+    )
+
+
+class RulesIndex:
+    """Скомпилированные правила, разложенные по conditions.type.
+
+    Событию достаются только правила его типа и правила без условия
+    на тип, поэтому стоимость проверки зависит от числа кандидатов,
+    а не от общего числа правил.
+    """
+
+    def __init__(
+        self,
+        rules: list[Rule],
+        windows: dict[tuple, SlidingWindowCounter] | None = None,
+        window_max_keys: int = 10000,
+    ):
+        self.size = 0
+        self.skipped = 0
+        # Счетчики оконных правил по window_signature
+        self.windows: dict[tuple, SlidingWindowCounter] = {}
+        previous_windows = windows or {}
+        by_type: dict[Any, list[CompiledRule]] = {}
+        any_type: list[CompiledRule] = []
+
+        for rule in rules:
+            try:
+                compiled = CompiledRule(rule, compile_conditions(rule.conditions))
+            except RuleConditionError as e:
+                self.skipped += 1
+                logging.error(f"Rule <{rule.name}> ({rule.id}) skipped: {e}")
+                continue
+
+            if signature := window_signature(rule):
+                _, count, minutes, group_by = signature
+                compiled.window = previous_windows.get(
+                    signature
+                ) or SlidingWindowCounter(count, minutes * 60, window_max_keys)
+                compiled.group_by = compile_path(group_by) if group_by else None
+                self.windows[signature] = compiled.window
+
+            self.size += 1
+            types = indexed_values(rule.conditions, "type")
+            if types is None:
+                any_type.append(compiled)
+                continue
+            for event_type in types:
+                by_type.setdefault(event_type, []).append(compiled)
+
+        def by_priority(rule: CompiledRule) -> int:
+            return -rule.priority
+
+        # Кандидаты по типу собираются заранее, с учетом правил без типа
+        self._any_type = sorted(any_type, key=by_priority)
+        self._by_type = {
+            event_type: sorted(candidates + any_type, key=by_priority)
+            for event_type, candidates in by_type.items()
+        }
+
+    def candidates(self, event_type: Any) -> list[CompiledRule]:
+        try:
+            return self._by_type.get(event_type, self._any_type)
+        except TypeError:
+            return self._any_type
+
+    def match(self, event: dict[str, Any]) -> list[CompiledRule]:
+        """Правила, которым соответствует событие, по убыванию приоритета"""
+        return [
+            rule for rule in self.candidates(event.get("type")) if rule.fires(event)
+        ]
+
+    @property
+    def window_keys(self) -> int:
+        return sum(len(window) for window in self.windows.values())
+
+
+class RulesEngine:
+    """Проверка записанных событий правилами из коллекции rules.
+
+    Правила загружаются и компилируются один раз, затем перечитываются
+    раз в reload_interval секунд (изменения из других процессов)
+    или сразу через reload() после изменения в этом процессе.
+
+    Оконные правила ("5 USER_LOGIN_FAILED на user_id за 10 минут")
+    считаются в памяти процесса счетчиками SlidingWindowCounter,
+    без периодических агрегаций по events. Окна у каждого воркера свои:
+    события, принятые другим процессом, в них не попадают.
+
+    Совпадения публикуются в outgoing_notify_channel:
+    одно уведомление на пару (правило, событие), действия правила
+    передаются в params для обработчика уведомлений.
+
+    Usage:
+
+    engine = RulesEngine(rules_crud, publisher=send_message)
+    await engine.register_events(events)
+    """
+
+    def __init__(
+        self,
+        repository: RuleCRUD,
+        publisher: Publisher | None = None,
+        reload_interval: float = 30.0,
+        window_max_keys: int = 10000,
+    ):
+        self.repo = repository
+        self.publisher = publisher
+        self.reload_interval = reload_interval
+        self.window_max_keys = window_max_keys
+
+        self._index: RulesIndex | None = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+        self.evaluated_events = 0
+        self.matched = 0
+        self.published = 0
+        self.failed = 0
+
+    def set_publisher(self, publisher: Publisher):
+        self.publisher = publisher
+
+    @property
+    def is_stale(self) -> bool:
+        return (
+            self._index is None
+            or time.monotonic() - self._loaded_at > self.reload_interval
+        )
+
+    async def reload(self) -> RulesIndex:
+        """Перечитать и скомпилировать включенные правила"""
+        async with self._lock:
+            rules = await self.repo.get_enabled_rules()
+            self._index = RulesIndex(
+                rules,
+                windows=self._index.windows if self._index else None,
+                window_max_keys=self.window_max_keys,
+            )
+            self._loaded_at = time.monotonic()
+
+        logging.info(
+            f"Rules loaded: {self._index.size}, skipped: {self._index.skipped}"
+        )
+        return self._index
+
+    async def get_index(self) -> RulesIndex:
+        if self.is_stale:
+            if self._lock.locked() and self._index is not None:
+                # Правила уже перечитываются, пока проверяем по старым
+                return self._index
+            return await self.reload()
+        return self._index
+
+    async def register_events(self, events: list[dict[str, Any]]) -> None:
+        """Проверить записанные события и опубликовать совпадения.
+
+        Args:
+            events (list[dict[str, Any]]): записанные документы событий
+        """
+        index = await self.get_index()
+        notifications = [
+            self.build_notification(compiled, event)
+            for event in events
+            for compiled in index.match(event)
+        ]
+        self.evaluated_events += len(events)
+        self.matched += len(notifications)
+
+        if not notifications:
+            return
+        if self.publisher is None:
+            logging.warning(f"No publisher, {len(notifications)} matches dropped")
+            return
+
+        results = await asyncio.gather(
+            *(self.publisher(notification) for notification in notifications),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                self.failed += 1
+                logging.error(f"Failed to publish rule match: {result}")
+            else:
+                self.published += 1
+
+    @staticmethod
+    def build_notification(
+        compiled: CompiledRule, event: dict[str, Any]
+    ) -> NotificationSchema:
+        rule = compiled.rule
+        params = {
+            "rule_id": rule.id,
+            "rule_name": rule.name,
+            "priority": rule.priority,
+            "actions": rule.actions,
+            "event": {
+                "id": str(event.get("_id")),
+                "event_id": event.get("event_id"),
+                "type": event.get("type"),
+                "source": event.get("source"),
+                "severity": event.get("severity"),
+                "user_id": event.get("user_id"),
+                "timestamp": event.get("timestamp"),
+            },
+        }
+        if compiled.window is not None:
+            # Событие, на котором сработал порог, и окно, в котором он набран
+            params["window"] = {**rule.window, "key": compiled.window_key(event)}
+
+        return NotificationSchema(message=rule.name, params=params)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "rules": self._index.size if self._index else 0,
+            "skipped_rules": self._index.skipped if self._index else 0,
+            "window_keys": self._index.window_keys if self._index else 0,
+            "evaluated_events": self.evaluated_events,
+            "matched": self.matched,
+            "published": self.published,
+            "failed": self.failed,
+        }
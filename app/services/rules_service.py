@@ -0,0 +1,45 @@
+from typing import Any
+
+from app import getLogger
+from app.adapters.db.cruds.rule import RuleCRUD
+from app.services.base import BaseService
+from app.services.rules_engine import RulesEngine
+from app.utils.type_hints import ItemID
+
+logging = getLogger("RuleService")
+
+
+class RuleService(BaseService):
+    """Управление правилами.
+
+    После каждого изменения движок этого процесса перечитывает правила,
+    остальные процессы увидят изменения через reload_interval.
+    """
+
+    def __init__(self, repository: RuleCRUD, engine: RulesEngine):
+        super().__init__(repository)
+        self.engine = engine
+
+    async def get_rules(self):
+        return await self.repo.get_all(sort=[("priority", -1)])
+
+    async def get_rule(self, rule_id: ItemID):
+        return await self.repo.get_by_id(rule_id)
+
+    async def create_rule(self, data: dict[str, Any]):
+        rule = await self.repo.create(data)
+        logging.info(f"Rule created: {rule.name}")
+        await self.engine.reload()
+        return rule
+
+    async def update_rule(self, rule_id: ItemID, data: dict[str, Any]):
+        rule = await self.repo.update(rule_id, data)
+        if rule is not None:
+            await self.engine.reload()
+        return rule
+
+    async def delete_rule(self, rule_id: ItemID) -> bool:
+        deleted = await self.repo.delete(rule_id)
+        if deleted:
+            await self.engine.reload()
+        return deleted
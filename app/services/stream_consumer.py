@@ -0,0 +1,260 @@
+import asyncio
+import json
+import os
+import socket
+from typing import Any
+
+from faststream.redis.parser import JSONMessageFormat
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+
+from app import getLogger
+from app.adapters.schemas.events import BaseEventSchema
+from app.services.ingest_buffer import is_unavailable
+from app.services.ingest_lanes import IngestLanes
+
+logging = getLogger("RedisStreamConsumer")
+
+# Поле, в которое faststream кладет сообщение при публикации в stream
+DATA_FIELD = b"__data__"
+STREAM_START = "0-0"
+
+StreamEntry = tuple[bytes, dict[bytes, bytes] | None]
+
+
+def decode_entry(fields: dict[bytes, bytes]) -> dict[str, Any]:
+    """Событие из записи stream.
+
+    Понимает формат faststream (JSON в поле __data__, с заголовками
+    или без) и плоские поля, добавленные XADD напрямую.
+    """
+    data = fields.get(DATA_FIELD)
+    if data is None:
+        return {key.decode(): value.decode() for key, value in fields.items()}
+    body, _ = JSONMessageFormat.parse(data)
+    return json.loads(body)
+
+
+def default_consumer_name() -> str:
+    """Имя потребителя в группе: свое у каждого процесса uvicorn"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class RedisStreamConsumer:
+    """Прием событий из Redis Streams группой потребителей.
+
+    В отличие от pub/sub, каждое сообщение группы достается одному
+    потребителю: num_workers процессов делят поток, а не дублируют его.
+    Сообщения читаются пачками XREADGROUP и подтверждаются XACK только
+    после записи пачки (в MongoDB или в журнал на диске, см.
+    IngestBuffer.write). Если записать не удалось, сообщения остаются
+    в списке ожидающих (PEL) группы.
+
+    Раз в claim_interval секунд потребитель забирает XAUTOCLAIM
+    сообщения, которые висят неподтвержденными дольше claim_idle_ms:
+    их владелец упал или не смог их записать. Повторная запись
+    безопасна: дубли отсекаются по event_id.
+
+    Некорректные сообщения подтверждаются сразу и считаются в invalid,
+    чтобы не забираться повторно бесконечно.
+
+    Usage:
+
+    consumer = RedisStreamConsumer(redis, lanes, "events-channel", "aggregator")
+    await consumer.start()
+    ...
+    await consumer.stop()
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        lanes: IngestLanes,
+        stream: str,
+        group: str,
+        consumer: str | None = None,
+        batch_size: int = 500,
+        block_ms: int = 1000,
+        claim_idle_ms: int = 60000,
+        claim_interval: float = 30.0,
+        retry_delay: float = 1.0,
+    ):
+        self.redis = redis
+        self.lanes = lanes
+        self.stream = stream
+        self.group = group
+        self.consumer = consumer or default_consumer_name()
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.claim_interval = claim_interval
+        self.retry_delay = retry_delay
+
+        self._tasks: list[asyncio.Task] = []
+
+        self.received = 0
+        self.acked = 0
+        self.invalid = 0
+        self.failed = 0
+        self.unacked = 0
+        self.claimed = 0
+
+    @property
+    def is_running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    async def start(self) -> None:
+        """Создать группу (если ее нет) и запустить чтение и забор зависших"""
+        if self.is_running:
+            logging.warning("Stream consumer already started")
+            return
+
+        await self.create_group()
+        self._tasks = [
+            asyncio.create_task(self._consume(), name="Redis stream consumer"),
+            asyncio.create_task(self._claim_periodically(), name="Redis stream claim"),
+        ]
+        logging.info(
+            f"Consuming stream <{self.stream}>, group: {self.group}, "
+            f"consumer: {self.consumer}"
+        )
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        logging.info(f"Stream consumer stopped. Stats: {self.stats()}")
+
+    async def create_group(self) -> None:
+        """Группа читает stream с начала: сообщения до старта не теряются"""
+        try:
+            await self.redis.xgroup_create(
+                self.stream, self.group, id=STREAM_START, mkstream=True
+            )
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def read(self) -> int:
+        """Прочитать и записать одну пачку новых сообщений.
+
+        Returns:
+            int: к-во подтвержденных сообщений
+        """
+        response = await self.redis.xreadgroup(
+            self.group,
+            self.consumer,
+            {self.stream: ">"},
+            count=self.batch_size,
+            block=self.block_ms,
+        )
+        acked = 0
+        for _, entries in response or []:
+            acked += await self.process(entries)
+        return acked
+
+    async def claim_pending(self) -> int:
+        """Забрать и записать сообщения, зависшие у других потребителей.
+
+        Returns:
+            int: к-во забранных сообщений
+        """
+        claimed = 0
+        start = STREAM_START
+        while True:
+            next_start, entries, *_ = await self.redis.xautoclaim(
+                self.stream,
+                self.group,
+                self.consumer,
+                min_idle_time=self.claim_idle_ms,
+                start_id=start,
+                count=self.batch_size,
+            )
+            if entries:
+                claimed += len(entries)
+                await self.process(entries)
+
+            if isinstance(next_start, bytes):
+                next_start = next_start.decode()
+            if next_start == STREAM_START:
+                break
+            start = next_start
+
+        if claimed:
+            self.claimed += claimed
+            logging.warning(f"Claimed {claimed} pending messages")
+        return claimed
+
+    async def process(self, entries: list[StreamEntry]) -> int:
+        """Записать пачку сообщений и подтвердить ее.
+
+        Returns:
+            int: к-во подтвержденных сообщений
+        """
+        ids = []
+        events = []
+        for entry_id, fields in entries:
+            ids.append(entry_id)
+            if fields is None:
+                # Сообщение удалено из stream, пока висело в PEL
+                continue
+            try:
+                event = BaseEventSchema.model_validate(decode_entry(fields))
+            except ValueError as e:
+                self.invalid += 1
+                logging.error(f"Invalid stream message {entry_id!r}: {e}")
+                continue
+            events.append(event.dict())
+        self.received += len(ids)
+
+        try:
+            await self.lanes.write(events)
+        except Exception as e:
+            if is_unavailable(e) or isinstance(e, OSError):
+                # Без подтверждения: сообщения заберет claim_pending
+                self.unacked += len(ids)
+                logging.error(f"Failed to write {len(events)} stream events: {e}")
+                return 0
+            self.failed += len(events)
+            logging.error(f"Dropped {len(events)} stream events: {e}")
+
+        await self.redis.xack(self.stream, self.group, *ids)
+        self.acked += len(ids)
+        return len(ids)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "consumer": self.consumer,
+            "running": self.is_running,
+            "received": self.received,
+            "acked": self.acked,
+            "invalid": self.invalid,
+            "failed": self.failed,
+            "unacked": self.unacked,
+            "claimed": self.claimed,
+        }
+
+    async def _consume(self) -> None:
+        while True:
+            unacked = self.unacked
+            try:
+                await self.read()
+            except RedisError as e:
+                logging.error(f"Failed to read stream <{self.stream}>: {e}")
+                await asyncio.sleep(self.retry_delay)
+                continue
+            if self.unacked > unacked:
+                # Пачку не записать: не набираем в PEL новые сообщения
+                await asyncio.sleep(self.retry_delay)
+
+    async def _claim_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.claim_interval)
+            try:
+                await self.claim_pending()
+            except RedisError as e:
+                logging.error(f"Failed to claim pending messages: {e}")
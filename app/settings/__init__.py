@@ -1,8 +1,13 @@
 from .app_settings import AppSettings
 from .base import BaseSettings
 from .broker_settings import BrokerSettings
+from .cache_settings import CacheSettings
+from .ingest_settings import IngestSettings
 from .log_settings import LogSettings
 from .mongo import MongoDBSettings
+from .processing_settings import ProcessingSettings
+from .rules_settings import RulesSettings
+from .stream_settings import StreamSettings
 
 
 class Config(BaseSettings):
@@ -10,6 +15,11 @@ class Config(BaseSettings):
     logging: LogSettings = LogSettings()
     app: AppSettings = AppSettings()
     broker: BrokerSettings = BrokerSettings()
+    ingest: IngestSettings = IngestSettings()
+    cache: CacheSettings = CacheSettings()
+    rules: RulesSettings = RulesSettings()
+    stream: StreamSettings = StreamSettings()
+    processing: ProcessingSettings = ProcessingSettings()
 
 
 config = Config()
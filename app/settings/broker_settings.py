@@ -20,6 +20,23 @@ class BrokerSettings(BaseSettings):
     incoming_event_channel: str = "events-channel"
     outgoing_notify_channel: str = "notify-channel"
 
+    # Пакетное чтение входящих событий (Redis Streams, Kafka, RabbitMQ)
+    consumer_group: str = "events-aggregator"  # группа потребителей
+    # макс к-во сообщений: XREADGROUP, poll Kafka, prefetch RabbitMQ
+    batch_size: int = 500
+    batch_timeout_ms: int = 200  # сколько Kafka ждет набора пачки
+
+    # Redis Streams с группой потребителей вместо pub/sub для входящих событий:
+    # incoming_event_channel - имя stream, воркеры делят сообщения между собой
+    redis_streams: bool = False
+    stream_block_ms: int = 1000  # сколько ждать новых сообщений
+    stream_claim_idle_ms: int = 60000  # когда сообщение считается зависшим
+    stream_claim_interval_ms: int = 30000  # как часто забирать зависшие
+
+    @property
+    def use_redis_streams(self) -> bool:
+        return self.type == BrokerTypeEnum.redis and self.redis_streams
+
     @property
     def engine(self) -> str:
         if self.type == BrokerTypeEnum.redis:
@@ -29,6 +46,7 @@ class BrokerSettings(BaseSettings):
             return "amqp://"
 
         if self.type == BrokerTypeEnum.kafka:
+            # Kafka принимает bootstrap-серверы без схемы
             return ""
 
     @property
@@ -41,7 +59,38 @@ class BrokerSettings(BaseSettings):
 
         return SecretStr(f"{self.engine}{credentials}{self.host}:{self.port}")
 
+    @property
+    def bootstrap_servers(self) -> str:
+        return f"{self.host}:{self.port}"
+
     @property
     def router_instance(self):
         if self.type == BrokerTypeEnum.redis:
             return RedisRouter(self.uri.get_secret_value())
+
+        # Драйверы Kafka и RabbitMQ нужны, только если брокер выбран
+        if self.type == BrokerTypeEnum.kafka:
+            from faststream.kafka.fastapi import KafkaRouter
+
+            return KafkaRouter(self.bootstrap_servers, security=self.kafka_security)
+
+        if self.type == BrokerTypeEnum.rabbit:
+            from faststream.rabbit.fastapi import RabbitRouter
+
+            # qos канала: столько сообщений обрабатывается одновременно
+            # и собирается в одну пачку до подтверждения
+            return RabbitRouter(
+                self.uri.get_secret_value(), max_consumers=self.batch_size
+            )
+
+    @property
+    def kafka_security(self):
+        if self.username is None or self.password is None:
+            return None
+
+        from faststream.security import SASLPlaintext
+
+        return SASLPlaintext(
+            username=self.username.get_secret_value(),
+            password=self.password.get_secret_value(),
+        )
@@ -0,0 +1,16 @@
+from pydantic_settings import SettingsConfigDict
+
+from app.settings.base import BaseSettings
+
+
+class CacheSettings(BaseSettings):
+    """Настройки внутрипроцессных кэшей."""
+
+    model_config = SettingsConfigDict(env_prefix="cache_")
+
+    catalogue_ttl_seconds: int = 60  # время жизни справочника типов и источников
+
+    query_ttl_seconds: float = 10.0  # время жизни результата запроса
+    query_max_entries: int = 1024  # макс к-во результатов в кэше
+    # через сколько устаревает результат, если записаны подходящие события
+    query_invalidation_window_seconds: float = 1.0
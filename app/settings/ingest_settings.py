@@ -0,0 +1,96 @@
+from typing import Any
+
+from pydantic_settings import SettingsConfigDict
+
+from app.settings.base import BaseSettings
+
+
+class IngestSettings(BaseSettings):
+    """Настройки приема событий из брокера сообщений."""
+
+    model_config = SettingsConfigDict(env_prefix="ingest_")
+
+    batch_size: int = 500  # макс к-во событий в одной пачке
+    flush_interval_ms: int = 50  # макс время ожидания пачки
+
+    # Полосы по критичности событий, иначе все события в одном буфере
+    # с параметрами batch_size, flush_interval_ms и medium_write_concern
+    lanes_enabled: bool = True
+    # critical: маленькие пачки, подтверждение большинством узлов
+    critical_batch_size: int = 50
+    critical_flush_interval_ms: int = 5
+    critical_write_concern: str = "majority"
+    # medium: параметры batch_size и flush_interval_ms
+    medium_write_concern: str = "majority"
+    # low: крупные пачки, подтверждение только от primary
+    low_batch_size: int = 2000
+    low_flush_interval_ms: int = 200
+    low_write_concern: str = "1"
+    write_concern_timeout_ms: int = 5000  # wtimeout подтверждения записи
+
+    # Шарды по user_id / session_id / source: порядок внутри ключа,
+    # параллельная запись разных ключей
+    shards_enabled: bool = False
+    shards: int = 8  # к-во шардов (задач-обработчиков)
+    shard_queue_size: int = 10000  # макс к-во событий в очереди шарда
+
+    dedup_enabled: bool = True  # отсекать повторные доставки по event_id
+    dedup_capacity: int = 1_000_000  # к-во event_id в одном поколении фильтра
+    dedup_error_rate: float = 0.001  # доля ложных срабатываний фильтра
+    dedup_window_seconds: float = 3600.0  # сколько помнить event_id (от 1 до 2 окон)
+
+    spool_enabled: bool = True  # журнал на диске, если MongoDB недоступна
+    spool_dir: str = "spool"  # каталог сегментов журнала
+    spool_segment_max_mb: int = 64  # размер сегмента, после которого начат новый
+    spool_fsync_interval_ms: int = 100  # макс окно потери журнала при падении
+    spool_saturation_ms: int = 500  # сколько ждать записи предыдущей пачки
+    spool_replay_interval_ms: int = 1000  # как часто проверять журнал
+    spool_replay_max_backoff_seconds: float = 30.0  # пауза при недоступной MongoDB
+    spool_replay_concurrency: int = 4  # пачек журнала, записываемых параллельно
+
+    @property
+    def flush_interval(self) -> float:
+        """Интервал сброса буфера в секундах"""
+        return self.flush_interval_ms / 1000.0
+
+    @property
+    def lanes(self) -> dict[str, dict[str, Any]]:
+        """Параметры буфера по полосе критичности"""
+        return {
+            "critical": {
+                "batch_size": self.critical_batch_size,
+                "flush_interval": self.critical_flush_interval_ms / 1000.0,
+                "w": self._parse_w(self.critical_write_concern),
+            },
+            "medium": {
+                "batch_size": self.batch_size,
+                "flush_interval": self.flush_interval,
+                "w": self._parse_w(self.medium_write_concern),
+            },
+            "low": {
+                "batch_size": self.low_batch_size,
+                "flush_interval": self.low_flush_interval_ms / 1000.0,
+                "w": self._parse_w(self.low_write_concern),
+            },
+        }
+
+    @staticmethod
+    def _parse_w(value: str) -> int | str:
+        """w: число узлов ("1") или имя режима ("majority")"""
+        return int(value) if value.isdigit() else value
+
+    @property
+    def spool_segment_max_bytes(self) -> int:
+        return self.spool_segment_max_mb * 1024 * 1024
+
+    @property
+    def spool_fsync_interval(self) -> float:
+        return self.spool_fsync_interval_ms / 1000.0
+
+    @property
+    def spool_saturation_timeout(self) -> float:
+        return self.spool_saturation_ms / 1000.0
+
+    @property
+    def spool_replay_interval(self) -> float:
+        return self.spool_replay_interval_ms / 1000.0
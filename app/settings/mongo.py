@@ -28,6 +28,12 @@ class MongoDBSettings(BaseSettings):
     expire_at_ttl_days_medium: int = 30
     expire_at_ttl_days_critical: int = 90
 
+    # Срок хранения rollup-метрик по размеру корзины
+    metrics_ttl_days_1m: int = 2
+    metrics_ttl_days_5m: int = 14
+    metrics_ttl_days_1h: int = 90
+    metrics_ttl_days_1d: int = 730
+
     @property
     def uri(self) -> str:
         return (
@@ -37,6 +43,16 @@ class MongoDBSettings(BaseSettings):
             f"{self.host}:{self.port}"
         )
 
+    @property
+    def metrics_ttl_days(self) -> dict[str, int]:
+        """Срок хранения rollup-метрик по периоду корзины"""
+        return {
+            "1m": self.metrics_ttl_days_1m,
+            "5m": self.metrics_ttl_days_5m,
+            "1h": self.metrics_ttl_days_1h,
+            "1d": self.metrics_ttl_days_1d,
+        }
+
     @property
     def pool_settings(self) -> dict[str, Any]:
         return {
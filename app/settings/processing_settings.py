@@ -0,0 +1,12 @@
+from pydantic_settings import SettingsConfigDict
+
+from app.settings.base import BaseSettings
+
+
+class ProcessingSettings(BaseSettings):
+    """Настройки очереди постобработки событий."""
+
+    model_config = SettingsConfigDict(env_prefix="processing_")
+
+    claim_batch_size: int = 100  # к-во событий в одной пачке по умолчанию
+    lease_seconds: float = 60.0  # время на обработку пачки до перехвата
@@ -0,0 +1,15 @@
+from pydantic_settings import SettingsConfigDict
+
+from app.settings.base import BaseSettings
+
+
+class RulesSettings(BaseSettings):
+    """Настройки движка правил."""
+
+    model_config = SettingsConfigDict(env_prefix="rules_")
+
+    enabled: bool = True  # проверять события правилами при записи
+    # через сколько перечитывать правила, измененные другими процессами
+    reload_interval_seconds: float = 30.0
+    # макс к-во ключей (user_id, source, ...) в окне одного правила
+    window_max_keys: int = 10000
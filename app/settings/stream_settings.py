@@ -0,0 +1,16 @@
+from pydantic_settings import SettingsConfigDict
+
+from app.settings.base import BaseSettings
+
+
+class StreamSettings(BaseSettings):
+    """Настройки live tail событий (SSE/WebSocket)."""
+
+    model_config = SettingsConfigDict(env_prefix="stream_")
+
+    # макс к-во событий в очереди клиента, старые вытесняются
+    queue_size: int = 100
+    max_clients: int = 500  # макс к-во подписчиков на воркер
+    heartbeat_seconds: float = 15.0  # keepalive, если событий нет
+    # пауза перед переоткрытием change stream после ошибки
+    reconnect_delay_seconds: float = 1.0
@@ -0,0 +1,88 @@
+import math
+import time
+from hashlib import blake2b
+
+
+class BloomFilter:
+    """Фильтр Блума: "точно не было" или "возможно было".
+
+    Размер и число хешей считаются по capacity и error_rate.
+    Индексы берутся двойным хешированием одного blake2b.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _indexes(self, key: str):
+        digest = blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for index in self._indexes(key):
+            self._bits[index >> 3] |= 1 << (index & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[index >> 3] & (1 << (index & 7)) for index in self._indexes(key)
+        )
+
+
+class RotatingBloomFilter:
+    """Фильтр Блума с ограниченным временем памяти.
+
+    Два поколения: новые ключи пишутся в текущее, проверяются оба.
+    Раз в window секунд (или при заполнении capacity) текущее поколение
+    становится предыдущим, а старое выбрасывается. Ключ помнится
+    от window до 2 * window, память не растет.
+
+    Usage:
+
+    seen = RotatingBloomFilter(capacity=1_000_000, window=3600)
+    if event_id not in seen:
+        ...  # точно новый
+    seen.add(event_id)
+    """
+
+    def __init__(
+        self, capacity: int, error_rate: float = 0.001, window: float = 3600.0
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.window = window
+
+        self._current = BloomFilter(capacity, error_rate)
+        self._previous: BloomFilter | None = None
+        self._rotated_at = time.monotonic()
+
+        self.rotations = 0
+
+    def _rotate_if_needed(self) -> None:
+        if (
+            self._current.count >= self.capacity
+            or time.monotonic() - self._rotated_at > self.window
+        ):
+            self._previous = self._current
+            self._current = BloomFilter(self.capacity, self.error_rate)
+            self._rotated_at = time.monotonic()
+            self.rotations += 1
+
+    def add(self, key: str) -> None:
+        self._rotate_if_needed()
+        self._current.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        if key in self._current:
+            return True
+        return self._previous is not None and key in self._previous
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._current._bits) * (1 if self._previous is None else 2)
@@ -47,3 +47,30 @@ class IndexStatusEnum(StrEnum):
     created = "created", "создан"
     skipped = "skipped", "пропущен"
     error = "error", "ошибка"
+
+
+class ExportFormatEnum(StrEnum):
+    ndjson = "ndjson", "NDJSON"
+    csv = "csv", "CSV"
+
+
+class CatalogueKindEnum(StrEnum):
+    type = "type", "тип события"
+    source = "source", "источник события"
+
+
+class SeverityBandEnum(StrEnum):
+    low = "low", "низкая"
+    medium = "medium", "средняя"
+    critical = "critical", "критическая"
+
+
+class MetricTypeEnum(StrEnum):
+    events_count = "EVENTS_COUNT", "количество событий"
+
+
+class MetricPeriodEnum(StrEnum):
+    minute = "1m", "1 минута"
+    five_minutes = "5m", "5 минут"
+    hour = "1h", "1 час"
+    day = "1d", "1 день"
@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator
+
+from bson.objectid import ObjectId
+
+from app.adapters.db.utils.pagination import get_by_path
+from app.utils.enums import ExportFormatEnum
+
+# Колонки CSV, если поля не заданы явно
+DEFAULT_EXPORT_COLUMNS = [
+    "_id",
+    "event_id",
+    "type",
+    "source",
+    "severity",
+    "timestamp",
+    "user_id",
+    "session_id",
+    "trace_id",
+    "payload",
+    "metadata",
+    "created_at",
+    "updated_at",
+    "expires_at",
+]
+
+MEDIA_TYPES = {
+    ExportFormatEnum.ndjson: "application/x-ndjson",
+    ExportFormatEnum.csv: "text/csv",
+}
+
+
+def default_serializer(obj: Any) -> str:
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    elif isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=default_serializer, ensure_ascii=False)
+    if isinstance(value, (ObjectId, datetime)):
+        return default_serializer(value)
+    return value
+
+
+async def ndjson_chunks(
+    documents: AsyncIterator[dict[str, Any]],
+    columns: list[str] | None = None,
+    chunk_size: int = 500,
+) -> AsyncIterator[str]:
+    """Документы в NDJSON: одна строка JSON на документ.
+
+    Строки копятся в пачку по chunk_size документов, чтобы не дергать
+    сокет на каждую строку. В памяти живет только одна пачка.
+
+    Args:
+        documents (AsyncIterator[dict[str, Any]]): документы из курсора
+        columns (list[str] | None): не используется, поля задает проекция
+        chunk_size (int): к-во документов в одном куске ответа
+    """
+    lines = []
+    async for document in documents:
+        lines.append(
+            json.dumps(document, default=default_serializer, ensure_ascii=False)
+        )
+        if len(lines) >= chunk_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+async def csv_chunks(
+    documents: AsyncIterator[dict[str, Any]],
+    columns: list[str] | None = None,
+    chunk_size: int = 500,
+) -> AsyncIterator[str]:
+    """Документы в CSV с заголовком.
+
+    Вложенные поля (payload, metadata) пишутся как JSON-строка.
+
+    Args:
+        documents (AsyncIterator[dict[str, Any]]): документы из курсора
+        columns (list[str] | None): колонки CSV
+        chunk_size (int): к-во документов в одном куске ответа
+    """
+    columns = columns or DEFAULT_EXPORT_COLUMNS
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    rows = 0
+    async for document in documents:
+        writer.writerow(
+            [_csv_value(get_by_path(document, column)) for column in columns]
+        )
+        rows += 1
+        if rows >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+EXPORTERS = {
+    ExportFormatEnum.ndjson: ndjson_chunks,
+    ExportFormatEnum.csv: csv_chunks,
+}
@@ -0,0 +1,181 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+from app import getLogger
+
+logging = getLogger("QueryCache")
+
+
+def split_values(value: Any) -> tuple | Any:
+    """"A,B" и "B,A" - один и тот же фильтр $in"""
+    if isinstance(value, str) and "," in value:
+        return tuple(sorted(set(value.split(","))))
+    return value
+
+
+def make_query_key(name: str, *params: dict[str, Any] | None) -> Hashable:
+    """Нормализованный ключ запроса.
+
+    Пустые параметры отбрасываются, списки через запятую сортируются,
+    поэтому одинаковые по смыслу запросы дают один ключ.
+
+    Args:
+        name (str): имя запроса, например "events_list"
+        params (dict[str, Any] | None): параметры запроса (фильтр, пагинация)
+
+    Returns:
+        Hashable:
+    """
+    normalized = []
+    for part in params:
+        normalized.append(
+            tuple(
+                (key, split_values(value))
+                for key, value in sorted((part or {}).items())
+                if value is not None
+            )
+        )
+    return (name, *normalized)
+
+
+def filter_values(filter: dict[str, Any] | None, field: str) -> frozenset | None:
+    """Значения фильтра $in или None, если фильтр по полю не задан"""
+    value = (filter or {}).get(field)
+    if not value:
+        return None
+    return frozenset(value.split(","))
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    value: Any
+    expires_at: float
+    # None - запрос без фильтра по полю, его затрагивает любое событие
+    types: frozenset | None = None
+    sources: frozenset | None = None
+
+    def is_affected(self, types: set[str], sources: set[str]) -> bool:
+        type_match = self.types is None or not self.types.isdisjoint(types)
+        source_match = self.sources is None or not self.sources.isdisjoint(sources)
+        return type_match and source_match
+
+
+class QueryCache:
+    """Кэш результатов запросов списка событий и аналитики.
+
+    LRU с ограничением по количеству записей и TTL. Когда процесс
+    записывает события подходящего типа или источника, время жизни
+    затронутых записей сокращается до invalidation_window: под постоянным
+    потоком событий кэш не сбрасывается на каждую пачку, а данные
+    отстают не больше чем на это окно.
+
+    Кэш живет внутри процесса: записи из других воркеров
+    его не инвалидируют, их видно после истечения TTL.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 10.0,
+        invalidation_window: float = 1.0,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.invalidation_window = invalidation_window
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._invalidated_at = 0.0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        filter: dict[str, Any] | None = None,
+    ) -> Any:
+        """Результат из кэша, либо выполнить запрос и сохранить результат.
+
+        Args:
+            key (Hashable): ключ из make_query_key
+            loader (Callable[[], Awaitable[Any]]): запрос к БД
+            filter (dict[str, Any] | None): фильтр запроса, для инвалидации
+
+        Returns:
+            Any: результат запроса
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > time.monotonic():
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            del self._entries[key]
+
+        self.misses += 1
+        started_at = time.monotonic()
+        value = await loader()
+        # События записаны, пока шел запрос: результат мог их не увидеть
+        ttl = self.invalidation_window if self._invalidated_at > started_at else None
+        self._store(key, value, filter, ttl)
+        return value
+
+    def invalidate(self, types: set[str], sources: set[str]) -> int:
+        """Сократить время жизни записей, которые затрагивают новые события.
+
+        Args:
+            types (set[str]): типы записанных событий
+            sources (set[str]): источники записанных событий
+
+        Returns:
+            int: количество затронутых записей
+        """
+        deadline = time.monotonic() + self.invalidation_window
+        affected = 0
+        for entry in self._entries.values():
+            if entry.expires_at > deadline and entry.is_affected(types, sources):
+                entry.expires_at = deadline
+                affected += 1
+
+        self._invalidated_at = time.monotonic()
+        self.invalidations += affected
+        return affected
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _store(
+        self,
+        key: Hashable,
+        value: Any,
+        filter: dict[str, Any] | None,
+        ttl: float | None = None,
+    ):
+        self._entries[key] = CacheEntry(
+            value=value,
+            expires_at=time.monotonic() + (self.ttl if ttl is None else ttl),
+            types=filter_values(filter, "event_type"),
+            sources=filter_values(filter, "source"),
+        )
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
@@ -0,0 +1,66 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+from app import getLogger
+
+logging = getLogger("SingleFlight")
+
+
+class SingleFlight:
+    """Схлопывание одинаковых одновременных запросов.
+
+    Пока запрос с ключом выполняется, повторные вызовы с тем же ключом
+    не идут в MongoDB, а ждут результат первого. После завершения ключ
+    освобождается: кэшированием результатов занимается QueryCache.
+
+    Запрос выполняется отдельной задачей, поэтому отмена одного
+    из ожидающих (клиент закрыл соединение) не отменяет его для остальных.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+
+        self.calls = 0
+        self.executions = 0
+        self.collapsed = 0
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Выполнить запрос или дождаться уже выполняющегося с тем же ключом.
+
+        Args:
+            key (Hashable): ключ из make_query_key
+            loader (Callable[[], Awaitable[Any]]): запрос к БД
+
+        Returns:
+            Any: результат запроса, общий для всех ожидающих
+        """
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.collapsed += 1
+            logging.debug(f"Joined in-flight query: {key[0]}")
+        else:
+            self.executions += 1
+            task = asyncio.ensure_future(loader())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Future):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Если все ожидающие отменились, ошибку больше некому забрать
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": len(self._in_flight),
+            "calls": self.calls,
+            "executions": self.executions,
+            "collapsed": self.collapsed,
+        }
@@ -0,0 +1,89 @@
+import time
+from collections import OrderedDict, deque
+from typing import Hashable
+
+from app import getLogger
+
+logging = getLogger("SlidingWindowCounter")
+
+
+class SlidingWindowCounter:
+    """Счетчик "threshold событий за window секунд" по ключу.
+
+    На ключ хранится не больше threshold отметок времени: порог достигнут,
+    когда очередь заполнена и самая старая отметка еще внутри окна.
+    После срабатывания очередь ключа очищается, следующее срабатывание
+    требует новых threshold событий.
+
+    Память ограничена max_keys: ключи упорядочены по последнему событию,
+    ключи без событий в окне удаляются при обращении, а при переполнении
+    вытесняется самый давний.
+
+    Usage:
+
+    counter = SlidingWindowCounter(threshold=5, window=600)
+    if counter.hit(event["user_id"]):
+        ...  # 5 событий за 10 минут
+    """
+
+    def __init__(self, threshold: int, window: float, max_keys: int = 10000):
+        self.threshold = threshold
+        self.window = window
+        self.max_keys = max_keys
+        self._keys: OrderedDict[Hashable, deque[float]] = OrderedDict()
+
+        self.fired = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def hit(self, key: Hashable, now: float | None = None) -> bool:
+        """Учесть событие по ключу.
+
+        Args:
+            key (Hashable): значение поля группировки
+            now (float | None): время события, по умолчанию time.monotonic()
+
+        Returns:
+            bool: порог достигнут этим событием
+        """
+        now = time.monotonic() if now is None else now
+        self.purge(now)
+
+        hits = self._keys.get(key)
+        if hits is None:
+            hits = self._keys[key] = deque(maxlen=self.threshold)
+        else:
+            self._keys.move_to_end(key)
+        hits.append(now)
+
+        if len(hits) == self.threshold and now - hits[0] <= self.window:
+            hits.clear()
+            self.fired += 1
+            return True
+
+        while len(self._keys) > self.max_keys:
+            self._keys.popitem(last=False)
+            self.evictions += 1
+        return False
+
+    def purge(self, now: float | None = None) -> int:
+        """Удалить ключи без событий в окне.
+
+        Ключи упорядочены по последнему событию, поэтому
+        проверяются только самые давние, пока не встретится живой.
+        """
+        now = time.monotonic() if now is None else now
+        deadline = now - self.window
+        purged = 0
+        while self._keys:
+            key, hits = next(iter(self._keys.items()))
+            if hits and hits[-1] >= deadline:
+                break
+            del self._keys[key]
+            purged += 1
+
+        self.expired += purged
+        return purged
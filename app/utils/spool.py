@@ -0,0 +1,176 @@
+import asyncio
+import os
+import time
+from datetime import timezone
+from pathlib import Path
+from typing import Any
+
+import bson
+from bson.codec_options import CodecOptions
+from bson.errors import InvalidBSON
+
+from app import getLogger
+
+logging = getLogger("SegmentSpool")
+
+SEGMENT_SUFFIX = ".seg"
+# Даты читаются такими же, какими пришли из брокера: с часовым поясом
+CODEC_OPTIONS = CodecOptions(tz_aware=True, tzinfo=timezone.utc)
+
+
+class SegmentSpool:
+    """Локальный журнал событий из append-only файлов-сегментов.
+
+    Документы пишутся в BSON подряд в активный сегмент. Когда он
+    дорастает до segment_max_bytes, сегмент закрывается и начинается
+    следующий. Читаются и удаляются только закрытые сегменты, от старых
+    к новым. fsync выполняется не чаще раза в fsync_interval секунд:
+    при падении процесса теряется не больше этого окна.
+
+    Файловые операции выполняются в потоке, чтобы не блокировать event loop.
+
+    Usage:
+
+    spool = SegmentSpool("spool")
+    await spool.open()
+    await spool.append(events)
+    segment = await spool.oldest_segment()
+    events = await spool.read(segment)
+    await spool.remove(segment)
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        fsync_interval: float = 0.1,
+    ):
+        self.directory = Path(directory)
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync_interval = fsync_interval
+
+        self._lock = asyncio.Lock()
+        self._file = None
+        self._sequence = 0
+        self._synced_at = 0.0
+        self._dirty = False
+        # к-во событий и размер по сегментам, включая активный
+        self._segments: dict[Path, list[int]] = {}
+
+    @property
+    def depth(self) -> int:
+        """Событий в журнале, ожидающих записи в MongoDB"""
+        return sum(events for events, _ in self._segments.values())
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(size for _, size in self._segments.values())
+
+    @property
+    def segments(self) -> int:
+        return len(self._segments)
+
+    async def open(self) -> None:
+        """Подхватить сегменты, оставшиеся от прошлого запуска"""
+        async with self._lock:
+            await asyncio.to_thread(self._open)
+
+    async def close(self) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self._close_active)
+
+    async def append(self, documents: list[dict[str, Any]]) -> None:
+        """Дописать документы в активный сегмент"""
+        if not documents:
+            return
+        data = b"".join(bson.encode(document) for document in documents)
+        async with self._lock:
+            await asyncio.to_thread(self._append, data, len(documents))
+
+    async def sync(self) -> None:
+        """Принудительный fsync активного сегмента"""
+        async with self._lock:
+            await asyncio.to_thread(self._sync)
+
+    async def oldest_segment(self) -> Path | None:
+        """Самый старый закрытый сегмент.
+
+        Если закрытых нет, активный закрывается, чтобы его можно было
+        прочитать: новые события пойдут в следующий сегмент.
+        """
+        async with self._lock:
+            active = Path(self._file.name) if self._file else None
+            sealed = [path for path in self._segments if path != active]
+            if sealed:
+                return min(sealed)
+            if active and self._segments[active][0]:
+                await asyncio.to_thread(self._close_active)
+                return active
+            return None
+
+    async def read(self, segment: Path) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self._read, segment)
+
+    async def remove(self, segment: Path) -> None:
+        async with self._lock:
+            await asyncio.to_thread(segment.unlink, True)
+            self._segments.pop(segment, None)
+
+    def _open(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}")):
+            self._sequence = max(self._sequence, int(path.stem))
+            self._segments[path] = [len(self._read(path)), path.stat().st_size]
+
+        if self._segments:
+            logging.warning(
+                f"Spool has {self.depth} events in {self.segments} segments to replay"
+            )
+
+    def _open_next(self) -> None:
+        self._sequence += 1
+        path = self.directory / f"{self._sequence:012d}{SEGMENT_SUFFIX}"
+        self._file = open(path, "ab")
+        self._segments[path] = [0, 0]
+
+    def _close_active(self) -> None:
+        if self._file is None:
+            return
+        self._sync()
+        self._file.close()
+        self._file = None
+
+    def _append(self, data: bytes, count: int) -> None:
+        if self._file is None:
+            self._open_next()
+
+        self._file.write(data)
+        self._dirty = True
+        stats = self._segments[Path(self._file.name)]
+        stats[0] += count
+        stats[1] += len(data)
+
+        if time.monotonic() - self._synced_at >= self.fsync_interval:
+            self._sync()
+        if stats[1] >= self.segment_max_bytes:
+            self._close_active()
+
+    def _sync(self) -> None:
+        if self._file is None or not self._dirty:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._synced_at = time.monotonic()
+        self._dirty = False
+
+    @staticmethod
+    def _read(segment: Path) -> list[dict[str, Any]]:
+        documents = []
+        with open(segment, "rb") as file:
+            try:
+                for document in bson.decode_file_iter(file, CODEC_OPTIONS):
+                    documents.append(document)
+            except InvalidBSON as e:
+                # Недописанный хвост после падения процесса
+                logging.error(f"Spool segment {segment.name} is truncated: {e}")
+        return documents
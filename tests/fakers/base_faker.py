@@ -2,6 +2,7 @@ from typing import Any, Dict, List, TypeVar
 
 from bson.objectid import ObjectId
 from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.write_concern import WriteConcern
 
 from app.adapters.db.cruds.base import BaseCRUD
 from app.adapters.schemas.base import BaseSchema
@@ -24,7 +25,7 @@ class FakeBaseCRUD(BaseCRUD):
     def create_id(self):
         return ObjectId()
 
-    async def create(self, data: _in | dict[str, Any]):
+    async def create(self, data: _in | dict[str, Any], verify: bool = False):
         pass
 
     async def get_by_id(self, item_id: ItemID) -> S_out:
@@ -83,7 +84,13 @@ class FakeBaseCRUD(BaseCRUD):
     async def exists(self, item_id: ItemID) -> bool:
         pass
 
-    async def bulk_create(self, data_list: List[Dict[str, Any]]) -> List[str]:
+    async def bulk_create(
+        self,
+        data_list: List[Dict[str, Any]],
+        ordered: bool = True,
+        skip_duplicates: bool = False,
+        write_concern: WriteConcern | None = None,
+    ) -> List[str]:
         """Массовое создание документов
         При создании каждого документа, надо присвоить ему _id
         """
@@ -0,0 +1,70 @@
+from redis.exceptions import ResponseError
+
+
+class FakeRedisStreams:
+    """Redis Streams в памяти: одна группа потребителей на stream.
+
+    Время для XAUTOCLAIM задается вручную через clock (мс).
+    """
+
+    def __init__(self):
+        self.clock = 0
+        self.entries: dict[str, list[tuple[bytes, dict[bytes, bytes]]]] = {}
+        self.groups: dict[tuple[str, str], int] = {}
+        # (stream, group) -> {id: [consumer, delivered_at]}
+        self.pending: dict[tuple[str, str], dict[bytes, list]] = {}
+        self._sequence = 0
+
+    async def xadd(self, name: str, fields: dict) -> bytes:
+        self._sequence += 1
+        entry_id = f"{self._sequence}-0".encode()
+        encoded = {
+            key.encode() if isinstance(key, str) else key: (
+                value.encode() if isinstance(value, str) else value
+            )
+            for key, value in fields.items()
+        }
+        self.entries.setdefault(name, []).append((entry_id, encoded))
+        return entry_id
+
+    async def xgroup_create(self, name, groupname, id="$", mkstream=False):
+        if (name, groupname) in self.groups:
+            raise ResponseError("BUSYGROUP Consumer Group name already exists")
+        self.entries.setdefault(name, [])
+        self.groups[(name, groupname)] = 0
+        self.pending[(name, groupname)] = {}
+
+    async def xreadgroup(self, groupname, consumername, streams, count, block):
+        response = []
+        for name in streams:
+            offset = self.groups[(name, groupname)]
+            entries = self.entries[name][offset : offset + count]
+            self.groups[(name, groupname)] = offset + len(entries)
+            for entry_id, _ in entries:
+                self.pending[(name, groupname)][entry_id] = [consumername, self.clock]
+            if entries:
+                response.append([name.encode(), entries])
+        return response
+
+    async def xack(self, name, groupname, *ids) -> int:
+        pending = self.pending[(name, groupname)]
+        return sum(pending.pop(entry_id, None) is not None for entry_id in ids)
+
+    async def xautoclaim(
+        self,
+        name,
+        groupname,
+        consumername,
+        min_idle_time,
+        start_id="0-0",
+        count=None,
+    ):
+        pending = self.pending[(name, groupname)]
+        by_id = dict(self.entries[name])
+        claimed = []
+        for entry_id, owner in pending.items():
+            if self.clock - owner[1] < min_idle_time:
+                continue
+            owner[:] = [consumername, self.clock]
+            claimed.append((entry_id, by_id.get(entry_id)))
+        return [b"0-0", claimed, []]
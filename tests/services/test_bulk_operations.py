@@ -0,0 +1,96 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bson.objectid import ObjectId
+from pymongo import DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.adapters.db.cruds.event import EventCRUD
+
+
+@pytest.fixture
+def event_crud():
+    crud = EventCRUD(MagicMock())
+    crud.table = MagicMock()
+    crud.table.update_many = AsyncMock()
+    crud.table.bulk_write = AsyncMock()
+    return crud
+
+
+class TestBulkOperations:
+    async def test_update_many_by_ids(self, event_crud):
+        ids = [ObjectId(), ObjectId()]
+        event_crud.table.update_many.return_value = MagicMock(modified_count=2)
+
+        modified = await event_crud.update_many_by_ids(
+            [str(_id) for _id in ids], {"severity": 1}
+        )
+
+        assert modified == 2
+        id_filter, update = event_crud.table.update_many.call_args.args
+        assert id_filter == {"_id": {"$in": ids}}
+        assert update["$set"]["severity"] == 1
+        assert "updated_at" in update["$set"]
+
+    async def test_update_many_by_empty_ids(self, event_crud):
+        assert await event_crud.update_many_by_ids([], {"severity": 1}) == 0
+        event_crud.table.update_many.assert_not_called()
+
+    async def test_bulk_update_builds_one_operation_per_document(self, event_crud):
+        first, second = ObjectId(), ObjectId()
+        event_crud.table.bulk_write.return_value = MagicMock(
+            bulk_api_result={"nMatched": 2, "nModified": 2}
+        )
+
+        result = await event_crud.bulk_update(
+            [(first, {"severity": 1}), (str(second), {"severity": 9})]
+        )
+
+        assert result.modified == 2
+        assert result.ok
+        operations = event_crud.table.bulk_write.call_args.args[0]
+        assert [op._filter for op in operations] == [{"_id": first}, {"_id": second}]
+        assert event_crud.table.bulk_write.call_args.kwargs == {"ordered": False}
+
+    async def test_per_item_errors(self, event_crud):
+        event_crud.table.bulk_write.side_effect = BulkWriteError(
+            {
+                "nInserted": 1,
+                "nMatched": 1,
+                "nModified": 1,
+                "nRemoved": 0,
+                "writeErrors": [
+                    {"index": 1, "code": 11000, "errmsg": "E11000 duplicate key"}
+                ],
+            }
+        )
+
+        result = await event_crud.bulk_write(
+            [
+                InsertOne({"event_id": "1"}),
+                InsertOne({"event_id": "1"}),
+                UpdateOne({"event_id": "2"}, {"$set": {"severity": 1}}),
+            ]
+        )
+
+        assert not result.ok
+        assert result.inserted == 1
+        assert result.modified == 1
+        assert [(e.index, e.code) for e in result.errors] == [(1, 11000)]
+
+    async def test_empty_bulk_write(self, event_crud):
+        result = await event_crud.bulk_write([])
+
+        assert result.ok
+        event_crud.table.bulk_write.assert_not_called()
+
+    async def test_mixed_operations_counts(self, event_crud):
+        event_crud.table.bulk_write.return_value = MagicMock(
+            bulk_api_result={"nInserted": 1, "nRemoved": 1, "nUpserted": 0}
+        )
+
+        result = await event_crud.bulk_write(
+            [InsertOne({"event_id": "1"}), DeleteOne({"event_id": "2"})]
+        )
+
+        assert (result.inserted, result.deleted) == (1, 1)
@@ -0,0 +1,101 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.adapters.db.cruds.catalogue import CatalogueCRUD
+from app.adapters.db.utils.catalogue_cache import CatalogueCache
+from app.services.events_service import EventService
+from app.utils.enums import CatalogueKindEnum
+
+
+@pytest.fixture(autouse=True)
+def clear_catalogue_cache():
+    CatalogueCache().clear()
+    yield
+    CatalogueCache().clear()
+
+
+@pytest.fixture
+def catalogue_crud():
+    crud = CatalogueCRUD(MagicMock())
+    crud.table = MagicMock()
+    crud.table.bulk_write = AsyncMock()
+    return crud
+
+
+class TestCatalogueCache:
+    def test_empty_cache(self):
+        assert CatalogueCache().get(CatalogueKindEnum.type) is None
+
+    def test_add_merges_only_into_loaded_values(self):
+        cache = CatalogueCache()
+        cache.add(CatalogueKindEnum.type, {"A"})
+        assert cache.get(CatalogueKindEnum.type) is None
+
+        cache.store(CatalogueKindEnum.type, ["B"])
+        cache.add(CatalogueKindEnum.type, {"A"})
+        assert cache.get(CatalogueKindEnum.type) == ["A", "B"]
+
+    def test_expired_values(self, monkeypatch):
+        cache = CatalogueCache()
+        cache.store(CatalogueKindEnum.source, ["auth-service"])
+        monkeypatch.setattr(CatalogueCache, "ttl", -1)
+
+        assert cache.get(CatalogueKindEnum.source) is None
+
+
+class TestCatalogueCRUD:
+    async def test_register_events_upserts_counts(self, catalogue_crud):
+        events = [
+            {"type": "USER_LOGIN_SUCCESS", "source": "auth-service"},
+            {"type": "USER_LOGIN_SUCCESS", "source": "auth-service"},
+            {"type": "PAYMENT_FAILED", "source": "payment-service"},
+        ]
+
+        await catalogue_crud.register_events(events)
+
+        operations = catalogue_crud.table.bulk_write.call_args.args[0]
+        # 2 типа + 2 источника, одна операция на значение
+        assert len(operations) == 4
+        upserts = {
+            (op._filter["kind"], op._filter["value"]): op._doc["$inc"]["count"]
+            for op in operations
+        }
+        assert upserts[("type", "USER_LOGIN_SUCCESS")] == 2
+        assert upserts[("source", "payment-service")] == 1
+
+    async def test_values_are_read_from_cache(self, catalogue_crud):
+        catalogue_crud.cache.store(CatalogueKindEnum.type, ["B", "A"])
+
+        assert await catalogue_crud.get_values(CatalogueKindEnum.type) == ["A", "B"]
+        catalogue_crud.table.find.assert_not_called()
+
+
+class TestEventServiceCatalogue:
+    async def test_ingest_updates_catalogue(self, mock_event_crud, event_data):
+        catalogue = AsyncMock()
+        service = EventService(mock_event_crud, catalogue)
+        mock_event_crud.bulk_create.return_value = ["id1"]
+
+        await service.ingest_events([event_data])
+
+        catalogue.register_events.assert_called_once_with([event_data])
+
+    async def test_catalogue_failure_does_not_break_ingest(
+        self, mock_event_crud, event_data
+    ):
+        catalogue = AsyncMock()
+        catalogue.register_events.side_effect = RuntimeError("boom")
+        service = EventService(mock_event_crud, catalogue)
+        mock_event_crud.bulk_create.return_value = ["id1"]
+
+        assert await service.ingest_events([event_data]) == 1
+
+    async def test_types_are_read_from_catalogue(self, mock_event_crud):
+        catalogue = AsyncMock()
+        catalogue.get_values.return_value = ["A"]
+        service = EventService(mock_event_crud, catalogue)
+
+        assert await service.get_event_types() == ["A"]
+        catalogue.get_values.assert_called_once_with(CatalogueKindEnum.type)
+        mock_event_crud.get_event_types.assert_not_called()
@@ -0,0 +1,96 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bson.objectid import ObjectId
+from pymongo.errors import BulkWriteError
+
+from app.adapters.db.cruds.event import EventCRUD
+from app.services.event_deduplicator import EventDeduplicator
+from app.services.events_service import EventService
+
+
+def make_events(*event_ids: str) -> list[dict]:
+    return [{"event_id": event_id, "type": "ORDER_CREATED"} for event_id in event_ids]
+
+
+class TestEventDeduplicator:
+    async def test_new_events_skip_lookup(self):
+        dedup = EventDeduplicator(capacity=1000)
+        find_existing = AsyncMock()
+
+        new = await dedup.filter_new(make_events("a", "b"), find_existing)
+
+        assert [event["event_id"] for event in new] == ["a", "b"]
+        find_existing.assert_not_called()
+
+    async def test_duplicates_in_batch(self):
+        dedup = EventDeduplicator(capacity=1000)
+
+        new = await dedup.filter_new(make_events("a", "a", "b"), AsyncMock())
+
+        assert len(new) == 2
+        assert dedup.stats()["batch_duplicates"] == 1
+
+    async def test_redelivery_is_confirmed_and_dropped(self):
+        dedup = EventDeduplicator(capacity=1000)
+        dedup.remember(make_events("a", "b"), inserted=2)
+        find_existing = AsyncMock(return_value={"a"})
+
+        new = await dedup.filter_new(make_events("a", "c"), find_existing)
+
+        assert [event["event_id"] for event in new] == ["c"]
+        find_existing.assert_called_once_with(["a"])
+        assert dedup.stats()["filter_duplicates"] == 1
+
+    async def test_false_positive_is_not_lost(self):
+        dedup = EventDeduplicator(capacity=1000)
+        dedup.remember(make_events("a"), inserted=1)
+
+        # В фильтре есть, в MongoDB нет (например, вставка упала)
+        new = await dedup.filter_new(make_events("a"), AsyncMock(return_value=set()))
+
+        assert len(new) == 1
+        assert dedup.stats()["false_positives"] == 1
+
+
+class TestIngestDeduplication:
+    async def test_redelivered_events_are_not_ingested_twice(self, mock_event_crud):
+        dedup = EventDeduplicator(capacity=1000)
+        service = EventService(mock_event_crud, dedup=dedup)
+        mock_event_crud.bulk_create.side_effect = lambda events, **kwargs: [
+            str(ObjectId()) for _ in events
+        ]
+        mock_event_crud.get_existing_event_ids.return_value = {"a"}
+
+        assert await service.ingest_events(make_events("a")) == 1
+        assert await service.ingest_events(make_events("a")) == 0
+
+        assert mock_event_crud.bulk_create.call_args.args[0] == []
+
+    async def test_unique_index_duplicates_are_skipped(self):
+        crud = EventCRUD(MagicMock())
+        crud.table = MagicMock()
+        crud.table.insert_many = AsyncMock(
+            side_effect=BulkWriteError(
+                {"writeErrors": [{"index": 1, "code": 11000, "errmsg": "dup"}]}
+            )
+        )
+        events = make_events("a", "b", "c")
+        for event in events:
+            event["_id"] = ObjectId()
+
+        ids = await crud.bulk_create(events, ordered=False, skip_duplicates=True)
+
+        assert ids == [str(events[0]["_id"]), str(events[2]["_id"])]
+
+    async def test_other_write_errors_are_raised(self):
+        crud = EventCRUD(MagicMock())
+        crud.table = MagicMock()
+        crud.table.insert_many = AsyncMock(
+            side_effect=BulkWriteError(
+                {"writeErrors": [{"index": 0, "code": 121, "errmsg": "validation"}]}
+            )
+        )
+
+        with pytest.raises(BulkWriteError):
+            await crud.bulk_create(make_events("a"), skip_duplicates=True)
@@ -11,23 +11,46 @@ class TestEventService:
         self, event_service_mocked, mock_event_crud, event_data
     ):
         events = [event_data for _ in range(10)]
-        mock_ids = ["id1", "id2"]
         mock_events = [Event(**event) for event in events]
 
-        mock_event_crud.bulk_create.return_value = mock_ids
-        mock_event_crud.get_all.return_value = mock_events
+        mock_event_crud.bulk_create_entities.return_value = mock_events
 
         result = await event_service_mocked.create_events(events)
 
         # методы должны быть вызваны
-        mock_event_crud.bulk_create.assert_called_once_with(events)
-        mock_event_crud.get_all.assert_called_once_with({"_id": {"$in": mock_ids}})
+        mock_event_crud.bulk_create_entities.assert_called_once_with(
+            events, verify=False
+        )
+        mock_event_crud.get_all.assert_not_called()
 
         for res in result:
             # сервисный слой должен возвращать словари
             assert isinstance(res, dict)
             assert isinstance(res.get("_id"), str)
 
+    async def test_create_events_without_read_after_write(
+        self, event_service_fake, fake_event_crud, event_data
+    ):
+        events = [dict(event_data) for _ in range(10)]
+
+        result = await event_service_fake.create_events(events)
+
+        # только вставка, без повторного чтения
+        assert fake_event_crud.called_count == 1
+        assert len(result) == 10
+        assert [res["_id"] for res in result] == [str(e["_id"]) for e in events]
+
+    async def test_create_events_verify_reads_server_copy(
+        self, event_service_fake, fake_event_crud, event_data
+    ):
+        events = [dict(event_data) for _ in range(10)]
+
+        result = await event_service_fake.create_events(events, verify=True)
+
+        # вставка + чтение вставленных документов
+        assert fake_event_crud.called_count == 2
+        assert len(result) == 10
+
     async def test_get_recent_events_calls_correct_methods(
         self, mock_event_crud, event_data, event_service_mocked
     ):
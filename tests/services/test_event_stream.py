@@ -0,0 +1,80 @@
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.adapters.db.utils.mongo_filter import EventFilters
+from app.services.event_stream import EventStreamHub, TooManySubscribersError
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    hub = EventStreamHub(MagicMock(), queue_size=3, max_clients=2)
+
+    async def watch():
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(hub, "_watch", watch)
+    return hub
+
+
+class TestEventStreamHub:
+    async def test_filters_are_applied_in_process(self, hub, event_data):
+        payments = hub.subscribe({"event_type": "PAYMENT_FAILED", "priority": "high"})
+        everything = hub.subscribe()
+
+        hub.publish({**event_data, "type": "PAYMENT_FAILED", "severity": 8})
+        hub.publish({**event_data, "type": "PAYMENT_FAILED", "severity": 2})
+        hub.publish({**event_data, "type": "USER_LOGIN"})
+
+        assert payments.pending == 1
+        assert everything.pending == 3
+        message, dropped = await payments.get()
+        assert json.loads(message)["severity"] == 8
+        assert dropped == 0
+        await hub.close()
+
+    async def test_slow_client_drops_oldest(self, hub, event_data):
+        subscription = hub.subscribe()
+
+        for severity in range(1, 6):
+            hub.publish({**event_data, "severity": severity})
+
+        message, dropped = await subscription.get()
+        assert dropped == 2
+        assert json.loads(message)["severity"] == 3
+        assert subscription.pending == 2
+        await hub.close()
+
+    async def test_one_change_stream_for_all_clients(self, hub):
+        async with hub.subscription():
+            task = hub._task
+            async with hub.subscription():
+                assert hub._task is task
+
+        # последний клиент ушел - поток закрыт
+        assert not hub.is_running
+        assert hub.stats()["subscribers"] == 0
+
+    async def test_clients_limit(self, hub):
+        hub.subscribe()
+        hub.subscribe()
+
+        with pytest.raises(TooManySubscribersError):
+            hub.subscribe()
+        await hub.close()
+
+
+class TestMatchFilter:
+    def test_no_time_window_and_text_search(self):
+        filters = EventFilters(hours=1, search="Visa stripe", event_type="A,B")
+
+        match_filter = filters.to_match_filter()
+
+        assert "created_at" not in match_filter
+        assert "$text" not in match_filter
+        assert match_filter["type"] == {"$in": ["A", "B"]}
+        assert {"payload.card_brand": {"$regex": "Visa", "$options": "i"}} in (
+            match_filter["$or"]
+        )
@@ -0,0 +1,272 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from pymongo.errors import AutoReconnect
+
+from app.services.ingest_buffer import IngestBuffer
+from app.utils.spool import SegmentSpool
+
+
+@pytest.fixture
+def mock_service():
+    return AsyncMock()
+
+
+class TestIngestBuffer:
+    """Тестирование буфера микро-батчей."""
+
+    async def test_flush_on_batch_size(self, mock_service, event_data):
+        buffer = IngestBuffer(mock_service, batch_size=3, flush_interval=60)
+
+        for _ in range(2):
+            await buffer.put(dict(event_data))
+        mock_service.ingest_events.assert_not_called()
+
+        await buffer.put(dict(event_data))
+
+        mock_service.ingest_events.assert_called_once()
+        assert len(mock_service.ingest_events.call_args.args[0]) == 3
+        assert buffer.pending == 0
+
+    async def test_flush_on_interval(self, mock_service, event_data):
+        buffer = IngestBuffer(mock_service, batch_size=100, flush_interval=0.01)
+        await buffer.start()
+
+        await buffer.put(dict(event_data))
+        await asyncio.sleep(0.05)
+
+        mock_service.ingest_events.assert_called_once()
+        assert buffer.flushed_events == 1
+        await buffer.stop()
+
+    async def test_stop_drains_buffer(self, mock_service, event_data):
+        buffer = IngestBuffer(mock_service, batch_size=100, flush_interval=60)
+        await buffer.start()
+
+        for _ in range(5):
+            await buffer.put(dict(event_data))
+        await buffer.stop()
+
+        mock_service.ingest_events.assert_called_once()
+        assert buffer.pending == 0
+        assert buffer.flushed_events == 5
+        assert not buffer.is_running
+
+    async def test_failed_flush_is_counted(self, mock_service, event_data):
+        mock_service.ingest_events.side_effect = RuntimeError("mongo is down")
+        buffer = IngestBuffer(mock_service, batch_size=2, flush_interval=60)
+
+        await buffer.put(dict(event_data))
+        await buffer.put(dict(event_data))
+
+        assert buffer.failed_events == 2
+        assert buffer.flushed_events == 0
+
+
+@pytest.fixture
+async def spool(tmp_path):
+    spool = SegmentSpool(tmp_path)
+    await spool.open()
+    return spool
+
+
+class TestIngestSpool:
+    """Тестирование журнала пачек при недоступной MongoDB."""
+
+    async def test_unavailable_mongo_spools_batch(
+        self, mock_service, spool, event_data
+    ):
+        mock_service.ingest_events.side_effect = AutoReconnect("failover")
+        buffer = IngestBuffer(
+            mock_service, batch_size=2, flush_interval=60, spool=spool
+        )
+
+        await buffer.put(dict(event_data))
+        await buffer.put(dict(event_data))
+
+        assert buffer.degraded
+        assert buffer.failed_events == 0
+        assert buffer.spooled_events == 2
+        assert spool.depth == 2
+
+        # Пока MongoDB недоступна, пачки идут сразу в журнал
+        await buffer.put(dict(event_data))
+        await buffer.put(dict(event_data))
+        assert mock_service.ingest_events.call_count == 1
+        assert spool.depth == 4
+
+    async def test_data_errors_are_not_spooled(self, mock_service, spool, event_data):
+        mock_service.ingest_events.side_effect = ValueError("bad event")
+        buffer = IngestBuffer(
+            mock_service, batch_size=1, flush_interval=60, spool=spool
+        )
+
+        await buffer.put(dict(event_data))
+
+        assert buffer.failed_events == 1
+        assert spool.depth == 0
+
+    async def test_replay_after_recovery(self, mock_service, spool, event_data):
+        mock_service.ingest_events.side_effect = AutoReconnect("failover")
+        buffer = IngestBuffer(
+            mock_service, batch_size=2, flush_interval=60, spool=spool
+        )
+        for _ in range(4):
+            await buffer.put(dict(event_data))
+
+        mock_service.ingest_events.side_effect = None
+        mock_service.ingest_events.reset_mock()
+
+        assert await buffer.replay() == 4
+        assert not buffer.degraded
+        assert spool.depth == 0
+        assert spool.segments == 0
+        assert buffer.replayed_events == 4
+        assert buffer.replay_rate > 0
+        # Сегмент дописан пачками по batch_size
+        assert mock_service.ingest_events.call_count == 2
+
+    async def test_replay_keeps_segment_while_unavailable(
+        self, mock_service, spool, event_data
+    ):
+        mock_service.ingest_events.side_effect = AutoReconnect("failover")
+        buffer = IngestBuffer(
+            mock_service, batch_size=2, flush_interval=60, spool=spool
+        )
+        await buffer.put(dict(event_data))
+        await buffer.put(dict(event_data))
+
+        with pytest.raises(AutoReconnect):
+            await buffer.replay()
+
+        assert buffer.degraded
+        assert spool.depth == 2
+
+    async def test_saturated_mongo_spools_batch(self, spool, event_data):
+        release = asyncio.Event()
+
+        async def slow_ingest(batch, write_concern=None):
+            await release.wait()
+
+        service = AsyncMock()
+        service.ingest_events.side_effect = slow_ingest
+        buffer = IngestBuffer(
+            service,
+            batch_size=1,
+            flush_interval=60,
+            spool=spool,
+            saturation_timeout=0.01,
+        )
+
+        first = asyncio.create_task(buffer.put(dict(event_data)))
+        await asyncio.sleep(0)
+        await buffer.put(dict(event_data))
+
+        assert buffer.saturated == 1
+        assert spool.depth == 1
+
+        release.set()
+        await first
+        assert buffer.flushed_events == 1
+
+    async def test_stop_and_start_replay_leftovers(
+        self, mock_service, tmp_path, event_data
+    ):
+        mock_service.ingest_events.side_effect = AutoReconnect("failover")
+        buffer = IngestBuffer(
+            mock_service,
+            batch_size=100,
+            flush_interval=60,
+            spool=SegmentSpool(tmp_path),
+            replay_interval=60,
+        )
+        await buffer.start()
+        for _ in range(3):
+            await buffer.put(dict(event_data))
+        await buffer.stop()
+
+        mock_service.ingest_events.side_effect = None
+        restarted = IngestBuffer(
+            mock_service,
+            batch_size=100,
+            flush_interval=60,
+            spool=SegmentSpool(tmp_path),
+            replay_interval=0.01,
+        )
+        await restarted.start()
+        await asyncio.sleep(0.1)
+        await restarted.stop()
+
+        assert restarted.replayed_events == 3
+        assert restarted.spool.depth == 0
+
+    async def test_write_spools_durably_when_unavailable(
+        self, mock_service, spool, event_data
+    ):
+        mock_service.ingest_events.side_effect = AutoReconnect("failover")
+        buffer = IngestBuffer(mock_service, spool=spool)
+
+        assert await buffer.write([dict(event_data)]) == 0
+
+        assert buffer.degraded
+        assert spool.depth == 1
+
+    async def test_write_raises_without_spool(self, mock_service, event_data):
+        mock_service.ingest_events.side_effect = AutoReconnect("failover")
+        buffer = IngestBuffer(mock_service)
+
+        with pytest.raises(AutoReconnect):
+            await buffer.write([dict(event_data)])
+
+    async def test_waiters_get_spooled_batch(self, mock_service, spool, event_data):
+        mock_service.ingest_events.side_effect = AutoReconnect("failover")
+        buffer = IngestBuffer(
+            mock_service, batch_size=2, flush_interval=60, spool=spool
+        )
+
+        await asyncio.gather(
+            buffer.put(dict(event_data), wait=True),
+            buffer.put(dict(event_data), wait=True),
+        )
+
+        assert spool.depth == 2
+
+
+class TestAckAfterWrite:
+    """Тестирование ожидания записи пачки обработчиками брокера."""
+
+    async def test_waiters_are_released_by_flush(self, mock_service, event_data):
+        buffer = IngestBuffer(mock_service, batch_size=3, flush_interval=60)
+
+        waiters = [
+            asyncio.create_task(buffer.put(dict(event_data), wait=True))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        assert not any(waiter.done() for waiter in waiters)
+
+        await buffer.put(dict(event_data), wait=True)
+        await asyncio.gather(*waiters)
+
+        mock_service.ingest_events.assert_called_once()
+
+    async def test_waiters_get_write_error(self, mock_service, event_data):
+        mock_service.ingest_events.side_effect = AutoReconnect("failover")
+        buffer = IngestBuffer(mock_service, batch_size=2, flush_interval=60)
+
+        results = await asyncio.gather(
+            buffer.put(dict(event_data), wait=True),
+            buffer.put(dict(event_data), wait=True),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, AutoReconnect) for result in results)
+        assert buffer.failed_events == 2
+
+    async def test_put_without_wait_does_not_block(self, mock_service, event_data):
+        buffer = IngestBuffer(mock_service, batch_size=3, flush_interval=60)
+
+        await buffer.put(dict(event_data))
+
+        assert buffer.pending == 1
@@ -0,0 +1,128 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pymongo.write_concern import WriteConcern
+
+from app.adapters.db.cruds.event import EventCRUD
+from app.services.ingest_buffer import IngestBuffer
+from app.services.ingest_lanes import IngestLanes
+from app.utils.enums import SeverityBandEnum
+
+MAJORITY = WriteConcern(w="majority")
+W1 = WriteConcern(w=1)
+
+
+@pytest.fixture
+def mock_service():
+    return AsyncMock()
+
+
+@pytest.fixture
+def lanes(mock_service):
+    bulk = IngestBuffer(
+        mock_service, batch_size=3, flush_interval=60, write_concern=W1, name="bulk"
+    )
+    return IngestLanes(
+        {
+            SeverityBandEnum.critical: IngestBuffer(
+                mock_service,
+                batch_size=1,
+                flush_interval=60,
+                write_concern=MAJORITY,
+                name="critical",
+            ),
+            SeverityBandEnum.medium: bulk,
+            SeverityBandEnum.low: bulk,
+        }
+    )
+
+
+class TestIngestLanes:
+    """Тестирование полос приема по критичности."""
+
+    async def test_critical_event_is_written_immediately(
+        self, lanes, mock_service, event_data
+    ):
+        await lanes.put({**event_data, "severity": 9})
+
+        mock_service.ingest_events.assert_called_once()
+        batch, write_concern = mock_service.ingest_events.call_args.args
+        assert len(batch) == 1
+        assert write_concern == MAJORITY
+
+    async def test_low_events_are_batched_with_w1(
+        self, lanes, mock_service, event_data
+    ):
+        await lanes.put({**event_data, "severity": 1})
+        await lanes.put({**event_data, "severity": 6})
+        mock_service.ingest_events.assert_not_called()
+        assert lanes.pending == 2
+
+        await lanes.put({**event_data, "severity": None})
+
+        batch, write_concern = mock_service.ingest_events.call_args.args
+        assert len(batch) == 3
+        assert write_concern == W1
+
+    async def test_stats_per_lane(self, lanes, event_data):
+        await lanes.put({**event_data, "severity": 10})
+        await lanes.put({**event_data, "severity": 2})
+
+        stats = lanes.stats()
+
+        assert set(stats) == {"critical", "bulk"}
+        assert stats["critical"]["flushed_events"] == 1
+        assert stats["bulk"]["pending"] == 1
+
+    async def test_stop_drains_all_lanes(self, lanes, mock_service, event_data):
+        await lanes.start()
+        await lanes.put({**event_data, "severity": 2})
+        await lanes.stop()
+
+        assert lanes.pending == 0
+        mock_service.ingest_events.assert_called_once()
+
+    def test_every_band_needs_a_lane(self, mock_service):
+        with pytest.raises(ValueError):
+            IngestLanes({SeverityBandEnum.critical: IngestBuffer(mock_service)})
+
+
+class TestWriteConcern:
+    async def test_bulk_create_uses_write_concern(self):
+        crud = EventCRUD(MagicMock())
+        crud.table = MagicMock()
+        lane_table = crud.table.with_options.return_value
+        lane_table.insert_many = AsyncMock()
+        lane_table.insert_many.return_value.inserted_ids = ["id"]
+
+        await crud.bulk_create([{"event_id": "a"}], write_concern=W1)
+
+        crud.table.with_options.assert_called_once_with(write_concern=W1)
+        lane_table.insert_many.assert_awaited_once()
+
+    async def test_bulk_create_keeps_client_write_concern(self):
+        crud = EventCRUD(MagicMock())
+        crud.table = MagicMock()
+        crud.table.insert_many = AsyncMock()
+        crud.table.insert_many.return_value.inserted_ids = ["id"]
+
+        await crud.bulk_create([{"event_id": "a"}])
+
+        crud.table.with_options.assert_not_called()
+
+
+class TestOrderedWrite:
+    async def test_ordered_write_keeps_event_order(self, lanes, mock_service):
+        events = [{"severity": 1}, {"severity": 9}, {"severity": 2}, {"severity": 3}]
+
+        await lanes.write(events, ordered=True)
+
+        batches = [call.args[0] for call in mock_service.ingest_events.call_args_list]
+        assert batches == [events[:1], events[1:2], events[2:]]
+
+    async def test_unordered_write_batches_per_lane(self, lanes, mock_service):
+        events = [{"severity": 1}, {"severity": 9}, {"severity": 2}]
+
+        await lanes.write(events)
+
+        assert mock_service.ingest_events.call_count == 2
@@ -0,0 +1,107 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.ingest_shards import IngestShards, partition_key
+
+
+class RecordingLanes:
+    """Полосы, запоминающие порядок записи; запись ждет gate"""
+
+    def __init__(self):
+        self.written: list[dict] = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.active = 0
+        self.max_active = 0
+
+    async def write(self, events, ordered=False):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await self.gate.wait()
+        self.written.extend(events)
+        self.active -= 1
+        return len(events)
+
+
+def keys_on_different_shards(shards: IngestShards) -> tuple[str, str]:
+    first = shards.shard({"user_id": "user-0"})
+    for i in range(1, 100):
+        if shards.shard({"user_id": f"user-{i}"}) is not first:
+            return "user-0", f"user-{i}"
+    raise AssertionError("All keys on one shard")
+
+
+@pytest.fixture
+async def shards():
+    shards = IngestShards(RecordingLanes(), shards=4, batch_size=10)
+    await shards.start()
+    yield shards
+    shards.lanes.gate.set()
+    await shards.stop()
+
+
+class TestIngestShards:
+    """Тестирование шардирования по ключу партиционирования."""
+
+    def test_partition_key_fallback(self):
+        assert partition_key({"user_id": "u", "session_id": "s"}) == "user_id:u"
+        assert partition_key({"session_id": "s", "source": "api"}) == "session_id:s"
+        assert partition_key({"user_id": None, "source": "api"}) == "source:api"
+        assert partition_key({}) == ""
+
+    def test_same_key_same_shard(self, shards):
+        event = {"user_id": "user-1", "source": "api"}
+
+        assert shards.shard(event) is shards.shard({**event, "source": "web"})
+
+    async def test_order_within_key(self, shards):
+        for i in range(30):
+            await shards.put({"user_id": "user-1", "n": i})
+        await shards.stop()
+
+        assert [event["n"] for event in shards.lanes.written] == list(range(30))
+
+    async def test_keys_run_in_parallel(self, shards):
+        first, second = keys_on_different_shards(shards)
+        shards.lanes.gate.clear()
+
+        await shards.put({"user_id": first})
+        await shards.put({"user_id": second})
+        await asyncio.sleep(0.01)
+
+        assert shards.lanes.max_active == 2
+        shards.lanes.gate.set()
+
+    async def test_depth_shows_hot_shard(self, shards):
+        first, _ = keys_on_different_shards(shards)
+        shards.lanes.gate.clear()
+
+        for _ in range(5):
+            await shards.put({"user_id": first})
+        await asyncio.sleep(0.01)
+
+        depths = {stats["shard"]: stats["depth"] for stats in shards.stats()}
+        hot = shards.shard({"user_id": first}).index
+        # Одно событие пишется, остальные ждут в очереди своего шарда
+        assert depths[hot] == 4
+        assert sum(depths.values()) == 4
+        shards.lanes.gate.set()
+
+    async def test_wait_for_write(self, shards):
+        await shards.put({"user_id": "user-1"}, wait=True)
+
+        assert len(shards.lanes.written) == 1
+
+    async def test_wait_gets_write_error(self):
+        lanes = AsyncMock()
+        lanes.write.side_effect = RuntimeError("mongo is down")
+        shards = IngestShards(lanes, shards=2)
+        await shards.start()
+
+        with pytest.raises(RuntimeError):
+            await shards.put({"user_id": "user-1"}, wait=True)
+
+        assert sum(stats["failed"] for stats in shards.stats()) == 1
+        await shards.stop()
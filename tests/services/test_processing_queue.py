@@ -0,0 +1,103 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from bson.objectid import ObjectId
+
+from app.adapters.db.cruds.event import EventCRUD
+from app.services.events_service import EventService
+
+
+@pytest.fixture
+def event_crud():
+    crud = EventCRUD(MagicMock())
+    crud.table = MagicMock()
+    crud.table.update_many = AsyncMock()
+    crud.table.bulk_write = AsyncMock()
+    crud.table.insert_many = AsyncMock()
+    return crud
+
+
+def mock_candidates(crud: EventCRUD, ids: list[ObjectId]):
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=[{"_id": _id} for _id in ids])
+    crud.table.find.return_value = cursor
+    return cursor
+
+
+class TestClaimUnprocessedEvents:
+    async def test_claim_uses_unprocessed_filter(self, event_crud):
+        ids = [ObjectId(), ObjectId()]
+        mock_candidates(event_crud, ids)
+        event_crud.table.update_many.return_value = MagicMock(modified_count=2)
+        event_crud.get_all = AsyncMock(return_value=["event-1", "event-2"])
+
+        lease = await event_crud.claim_unprocessed_events(limit=2, lease_seconds=30)
+
+        available = event_crud.table.find.call_args.args[0]
+        # processed=False в фильтре нужен, чтобы запрос шел по частичному индексу
+        assert available["processed"] is False
+        update_filter, update = event_crud.table.update_many.call_args.args
+        assert update_filter["_id"] == {"$in": ids}
+        assert update["$set"]["lease_id"] == lease.lease_id
+        assert event_crud.get_all.call_args.args[0]["lease_id"] == lease.lease_id
+        assert lease.items == ["event-1", "event-2"]
+
+    async def test_claim_lost_race(self, event_crud):
+        mock_candidates(event_crud, [ObjectId()])
+        event_crud.table.update_many.return_value = MagicMock(modified_count=0)
+        event_crud.get_all = AsyncMock()
+
+        lease = await event_crud.claim_unprocessed_events()
+
+        assert lease.items == []
+        event_crud.get_all.assert_not_called()
+
+    async def test_empty_queue(self, event_crud):
+        mock_candidates(event_crud, [])
+
+        lease = await event_crud.claim_unprocessed_events()
+
+        assert lease.items == []
+        event_crud.table.update_many.assert_not_called()
+
+
+class TestAckEvents:
+    async def test_ack_and_release_in_one_bulk_write(self, event_crud):
+        processed, released = ObjectId(), ObjectId()
+        event_crud.table.bulk_write.return_value = MagicMock(
+            bulk_api_result={"nMatched": 2, "nModified": 2}
+        )
+
+        modified = await event_crud.ack_events(
+            "lease", [str(processed)], [str(released)]
+        )
+
+        assert modified == 2
+        event_crud.table.bulk_write.assert_called_once()
+        ack, release = event_crud.table.bulk_write.call_args.args[0]
+        assert ack._filter == {"_id": {"$in": [processed]}, "lease_id": "lease"}
+        assert ack._doc["$set"]["processed"] is True
+        assert "processed" not in release._doc["$set"]
+        assert release._doc["$unset"] == {"lease_id": "", "lease_until": ""}
+
+    async def test_nothing_to_ack(self, event_crud):
+        assert await event_crud.ack_events("lease", []) == 0
+        event_crud.table.bulk_write.assert_not_called()
+
+
+class TestProcessedFlag:
+    async def test_new_events_are_unprocessed(self, event_crud, event_data):
+        event_data.pop("_id")
+        event_crud.table.insert_many.return_value = MagicMock(inserted_ids=[ObjectId()])
+
+        await event_crud.bulk_create([event_data])
+
+        assert event_crud.table.insert_many.call_args.args[0][0]["processed"] is False
+
+    async def test_service_ack_reports_lost_leases(self, mock_event_crud):
+        mock_event_crud.ack_events.return_value = 1
+        service = EventService(mock_event_crud)
+
+        assert await service.ack_events("lease", ["a", "b"]) == 1
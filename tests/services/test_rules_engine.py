@@ -0,0 +1,170 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+from bson.objectid import ObjectId
+
+from app.entities.rule import Rule
+from app.services.events_service import EventService
+from app.services.rules_engine import RulesEngine, RulesIndex
+
+
+def make_rule(name: str, conditions: dict, priority: int = 0) -> Rule:
+    now = datetime.now(timezone.utc)
+    return Rule(
+        _id=ObjectId(),
+        created_at=now,
+        updated_at=now,
+        name=name,
+        conditions=conditions,
+        actions=[{"type": "SEND_NOTIFICATION", "config": {}}],
+        priority=priority,
+    )
+
+
+@pytest.fixture
+def rules():
+    return [
+        make_rule(
+            "Critical Payment Failures",
+            {"type": "PAYMENT_FAILED", "payload.amount": {"$gte": 1000}},
+            priority=1,
+        ),
+        make_rule("Any critical", {"severity": {"$gte": 9}}, priority=5),
+        make_rule("Login failures", {"type": {"$in": ["USER_LOGIN_FAILED"]}}),
+        make_rule("Broken", {"severity": {"$near": 1}}),
+    ]
+
+
+@pytest.fixture
+def rules_crud(rules):
+    mock = AsyncMock()
+    mock.get_enabled_rules.return_value = rules
+    return mock
+
+
+class TestRulesIndex:
+    def test_candidates_by_type(self, rules):
+        index = RulesIndex(rules)
+
+        names = [rule.rule.name for rule in index.candidates("PAYMENT_FAILED")]
+        assert names == ["Any critical", "Critical Payment Failures"]
+        assert [r.rule.name for r in index.candidates("ORDER_CREATED")] == [
+            "Any critical"
+        ]
+        assert index.size == 3
+        assert index.skipped == 1
+
+    def test_candidates_do_not_grow_with_other_types(self):
+        rules = [
+            make_rule(f"rule {i}", {"type": f"TYPE_{i}", "severity": {"$gte": 5}})
+            for i in range(5000)
+        ]
+        index = RulesIndex(rules)
+
+        assert len(index.candidates("TYPE_42")) == 1
+        assert index.match({"type": "TYPE_42", "severity": 7})[0].rule.name == "rule 42"
+
+    def test_match(self, rules):
+        index = RulesIndex(rules)
+        event = {"type": "PAYMENT_FAILED", "severity": 9, "payload": {"amount": 10}}
+
+        assert [rule.rule.name for rule in index.match(event)] == ["Any critical"]
+
+
+class TestRulesEngine:
+    async def test_publishes_matches(self, rules_crud, event_data):
+        publisher = AsyncMock()
+        engine = RulesEngine(rules_crud, publisher=publisher)
+        event = {
+            **event_data,
+            "type": "PAYMENT_FAILED",
+            "severity": 4,
+            "payload": {"amount": 5000},
+        }
+
+        await engine.register_events([event, {**event, "type": "ORDER_CREATED"}])
+
+        publisher.assert_called_once()
+        notification = publisher.call_args.args[0]
+        assert notification.message == "Critical Payment Failures"
+        assert notification.params["event"]["event_id"] == event["event_id"]
+        assert engine.stats()["published"] == 1
+
+    async def test_rules_are_loaded_once(self, rules_crud):
+        engine = RulesEngine(rules_crud, publisher=AsyncMock())
+
+        await engine.register_events([{"type": "ORDER_CREATED"}])
+        await engine.register_events([{"type": "ORDER_CREATED"}])
+
+        rules_crud.get_enabled_rules.assert_called_once()
+
+    async def test_publish_errors_are_counted(self, rules_crud):
+        publisher = AsyncMock(side_effect=ConnectionError("broker is down"))
+        engine = RulesEngine(rules_crud, publisher=publisher)
+
+        await engine.register_events([{"type": "ORDER_CREATED", "severity": 10}])
+
+        assert engine.stats()["failed"] == 1
+
+    async def test_event_service_runs_rules_on_ingest(
+        self, mock_event_crud, rules_crud, event_data
+    ):
+        publisher = AsyncMock()
+        engine = RulesEngine(rules_crud, publisher=publisher)
+        service = EventService(mock_event_crud, rules=engine)
+        mock_event_crud.bulk_create.return_value = ["id"]
+
+        await service.ingest_events([{**event_data, "severity": 10}])
+
+        publisher.assert_called_once()
+
+
+class TestWindowedRules:
+    @pytest.fixture
+    def window_rule(self):
+        rule = make_rule("Brute force", {"type": "USER_LOGIN_FAILED"})
+        rule.window = {"count": 3, "minutes": 10, "group_by": "user_id"}
+        return rule
+
+    async def test_fires_after_threshold_per_key(self, window_rule):
+        crud = AsyncMock()
+        crud.get_enabled_rules.return_value = [window_rule]
+        publisher = AsyncMock()
+        engine = RulesEngine(crud, publisher=publisher)
+        login_failed = {"type": "USER_LOGIN_FAILED", "user_id": "user-1"}
+
+        await engine.register_events([login_failed, login_failed])
+        await engine.register_events([{**login_failed, "user_id": "user-2"}])
+        publisher.assert_not_called()
+
+        await engine.register_events([login_failed])
+
+        publisher.assert_called_once()
+        window = publisher.call_args.args[0].params["window"]
+        assert window["key"] == "user-1"
+        assert window["count"] == 3
+
+    async def test_events_without_key_are_ignored(self, window_rule):
+        crud = AsyncMock()
+        crud.get_enabled_rules.return_value = [window_rule]
+        publisher = AsyncMock()
+        engine = RulesEngine(crud, publisher=publisher)
+
+        await engine.register_events([{"type": "USER_LOGIN_FAILED"}] * 5)
+
+        publisher.assert_not_called()
+
+    async def test_counters_survive_reload(self, window_rule):
+        crud = AsyncMock()
+        crud.get_enabled_rules.return_value = [window_rule]
+        publisher = AsyncMock()
+        engine = RulesEngine(crud, publisher=publisher)
+        login_failed = {"type": "USER_LOGIN_FAILED", "user_id": "user-1"}
+
+        await engine.register_events([login_failed, login_failed])
+        await engine.reload()
+        await engine.register_events([login_failed])
+
+        publisher.assert_called_once()
+        assert engine.stats()["window_keys"] == 1
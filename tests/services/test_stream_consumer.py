@@ -0,0 +1,108 @@
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from pymongo.errors import AutoReconnect
+
+from tests.fakers.fake_redis_streams import FakeRedisStreams
+
+from app.services.stream_consumer import RedisStreamConsumer, decode_entry
+
+STREAM = "events-channel"
+GROUP = "aggregator"
+
+
+@pytest.fixture
+def redis():
+    return FakeRedisStreams()
+
+
+@pytest.fixture
+def lanes():
+    return AsyncMock()
+
+
+def make_consumer(redis, lanes, name: str) -> RedisStreamConsumer:
+    return RedisStreamConsumer(
+        redis, lanes, STREAM, GROUP, consumer=name, claim_idle_ms=1000
+    )
+
+
+def faststream_fields(event: dict) -> dict:
+    """Сообщение в формате публикации faststream"""
+    envelope = {"data": json.dumps(event, default=str), "headers": {}}
+    return {"__data__": json.dumps(envelope)}
+
+
+class TestRedisStreamConsumer:
+    """Тестирование чтения событий из Redis Streams группой."""
+
+    async def test_batch_is_acked_after_write(self, redis, lanes, event_data):
+        consumer = make_consumer(redis, lanes, "worker-1")
+        await consumer.create_group()
+        for _ in range(3):
+            await redis.xadd(STREAM, faststream_fields(event_data))
+
+        assert await consumer.read() == 3
+
+        events = lanes.write.call_args.args[0]
+        assert len(events) == 3
+        assert events[0]["event_id"] == event_data["event_id"]
+        assert not redis.pending[(STREAM, GROUP)]
+
+    async def test_workers_share_the_stream(self, redis, lanes, event_data):
+        first = make_consumer(redis, lanes, "worker-1")
+        second = make_consumer(redis, lanes, "worker-2")
+        await first.create_group()
+        await second.create_group()
+        for _ in range(4):
+            await redis.xadd(STREAM, faststream_fields(event_data))
+
+        first.batch_size = 3
+        assert await first.read() == 3
+        assert await second.read() == 1
+
+    async def test_failed_write_is_not_acked(self, redis, lanes, event_data):
+        lanes.write.side_effect = AutoReconnect("failover")
+        consumer = make_consumer(redis, lanes, "worker-1")
+        await consumer.create_group()
+        await redis.xadd(STREAM, faststream_fields(event_data))
+
+        assert await consumer.read() == 0
+
+        assert consumer.unacked == 1
+        assert len(redis.pending[(STREAM, GROUP)]) == 1
+
+    async def test_pending_of_dead_consumer_is_claimed(
+        self, redis, lanes, event_data
+    ):
+        dead = make_consumer(redis, AsyncMock(), "worker-1")
+        dead.lanes.write.side_effect = AutoReconnect("killed")
+        alive = make_consumer(redis, lanes, "worker-2")
+        await dead.create_group()
+        await redis.xadd(STREAM, faststream_fields(event_data))
+        await dead.read()
+
+        # Сообщение еще не зависло
+        assert await alive.claim_pending() == 0
+
+        redis.clock += 1000
+        assert await alive.claim_pending() == 1
+        lanes.write.assert_called_once()
+        assert not redis.pending[(STREAM, GROUP)]
+
+    async def test_invalid_message_is_acked(self, redis, lanes, event_data):
+        consumer = make_consumer(redis, lanes, "worker-1")
+        await consumer.create_group()
+        await redis.xadd(STREAM, {"__data__": "not json"})
+        await redis.xadd(STREAM, faststream_fields(event_data))
+
+        assert await consumer.read() == 2
+
+        assert consumer.invalid == 1
+        assert len(lanes.write.call_args.args[0]) == 1
+
+    def test_decode_flat_fields(self):
+        event = decode_entry({b"event_id": b"1", b"severity": b"5"})
+
+        assert event == {"event_id": "1", "severity": "5"}
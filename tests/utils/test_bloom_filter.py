@@ -0,0 +1,53 @@
+from app.utils.bloom_filter import BloomFilter, RotatingBloomFilter
+
+
+class TestBloomFilter:
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000)
+        keys = [f"event-{i}" for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+
+        assert all(key in bloom for key in keys)
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(capacity=10000, error_rate=0.01)
+        for i in range(10000):
+            bloom.add(f"event-{i}")
+
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        assert false_positives < 300
+
+
+class TestRotatingBloomFilter:
+    def test_keys_survive_one_rotation(self):
+        seen = RotatingBloomFilter(capacity=10)
+        seen.add("event-1")
+        for i in range(9):
+            seen.add(f"filler-{i}")
+
+        assert seen.rotations == 0
+        seen.add("event-2")
+
+        assert seen.rotations == 1
+        assert "event-1" in seen
+
+    def test_keys_are_forgotten_after_two_rotations(self):
+        seen = RotatingBloomFilter(capacity=10)
+        seen.add("event-1")
+        for i in range(25):
+            seen.add(f"filler-{i}")
+
+        assert seen.rotations == 2
+        assert "event-1" not in seen
+
+    def test_rotation_by_time(self, monkeypatch):
+        seen = RotatingBloomFilter(capacity=10, window=60)
+        seen.add("event-1")
+
+        monkeypatch.setattr(
+            "app.utils.bloom_filter.time.monotonic", lambda: seen._rotated_at + 61
+        )
+        seen.add("event-2")
+
+        assert seen.rotations == 1
@@ -0,0 +1,86 @@
+import pytest
+
+from app.adapters.db.utils.conditions import (
+    RuleConditionError,
+    compile_conditions,
+    indexed_values,
+)
+
+EVENT = {
+    "type": "PAYMENT_FAILED",
+    "source": "payment-service",
+    "severity": 8,
+    "user_id": None,
+    "payload": {"amount": 1500, "currency": "USD", "tags": ["card", "retry"]},
+}
+
+
+class TestCompileConditions:
+    @pytest.mark.parametrize(
+        "conditions, expected",
+        [
+            ({}, True),
+            ({"type": "PAYMENT_FAILED"}, True),
+            ({"type": "USER_LOGIN"}, False),
+            ({"severity": {"$gte": 7}}, True),
+            ({"severity": {"$gt": 8}}, False),
+            ({"severity": {"$gte": 5, "$lt": 8}}, False),
+            ({"payload.amount": {"$gte": 1000}}, True),
+            ({"payload.amount": {"$lte": 1000}}, False),
+            ({"payload.currency": {"$in": ["USD", "EUR"]}}, True),
+            ({"payload.currency": {"$nin": ["USD", "EUR"]}}, False),
+            ({"payload.tags": "retry"}, True),
+            ({"payload.tags": {"$in": ["cash"]}}, False),
+            ({"payload.missing": {"$exists": False}}, True),
+            ({"payload.amount": {"$exists": True}}, True),
+            ({"payload.missing": {"$ne": 1}}, True),
+            ({"payload.missing": {"$gte": 0}}, False),
+            ({"user_id": None}, True),
+            ({"trace_id": None}, True),
+            ({"source": {"$regex": "^PAY", "$options": "i"}}, True),
+            ({"severity": {"$not": {"$lt": 5}}}, True),
+            ({"payload.currency": {"$gte": 5}}, False),
+            ({"$or": [{"type": "USER_LOGIN"}, {"severity": {"$gte": 8}}]}, True),
+            ({"$and": [{"type": "PAYMENT_FAILED"}, {"severity": {"$lt": 5}}]}, False),
+            ({"$nor": [{"type": "USER_LOGIN"}]}, True),
+            (
+                {
+                    "type": "PAYMENT_FAILED",
+                    "severity": {"$gte": 7},
+                    "payload.amount": {"$gte": 1000},
+                },
+                True,
+            ),
+        ],
+    )
+    def test_matches(self, conditions, expected):
+        assert compile_conditions(conditions)(EVENT) is expected
+
+    @pytest.mark.parametrize(
+        "conditions",
+        [
+            {"severity": {"$near": 5}},
+            {"$where": "this.severity > 5"},
+            {"type": {"$in": "PAYMENT_FAILED"}},
+            {"$or": []},
+            {"source": {"$regex": "("}},
+        ],
+    )
+    def test_invalid_conditions(self, conditions):
+        with pytest.raises(RuleConditionError):
+            compile_conditions(conditions)
+
+
+class TestIndexedValues:
+    @pytest.mark.parametrize(
+        "conditions, expected",
+        [
+            ({"type": "A"}, ["A"]),
+            ({"type": {"$eq": "A"}}, ["A"]),
+            ({"type": {"$in": ["A", "B"]}}, ["A", "B"]),
+            ({"type": {"$ne": "A"}}, None),
+            ({"severity": {"$gte": 5}}, None),
+        ],
+    )
+    def test_indexed_values(self, conditions, expected):
+        assert indexed_values(conditions, "type") == expected
@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+
+from app.utils.export import csv_chunks, ndjson_chunks
+
+
+async def stream(documents):
+    for document in documents:
+        yield document
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+class TestNDJSONExport:
+    async def test_one_line_per_document(self, event_data):
+        documents = [dict(event_data) for _ in range(5)]
+
+        chunks = await collect(ndjson_chunks(stream(documents), chunk_size=2))
+
+        # 5 документов пачками по 2 => 3 куска
+        assert len(chunks) == 3
+        lines = "".join(chunks).splitlines()
+        assert len(lines) == 5
+        row = json.loads(lines[0])
+        assert row["_id"] == str(event_data["_id"])
+        assert row["type"] == event_data["type"]
+
+    async def test_empty_result(self):
+        assert await collect(ndjson_chunks(stream([]))) == []
+
+
+class TestCSVExport:
+    async def test_header_and_rows(self, event_data):
+        documents = [dict(event_data) for _ in range(3)]
+        columns = ["type", "severity", "payload", "metadata.region"]
+
+        chunks = await collect(csv_chunks(stream(documents), columns, chunk_size=2))
+
+        rows = list(csv.reader(io.StringIO("".join(chunks))))
+        assert rows[0] == columns
+        assert len(rows) == 4
+        assert rows[1][0] == event_data["type"]
+        assert rows[1][1] == str(event_data["severity"])
+        # вложенные поля пишутся JSON-строкой
+        assert json.loads(rows[1][2]) == json.loads(
+            json.dumps(event_data["payload"], default=str)
+        )
+
+    async def test_header_only_for_empty_result(self):
+        chunks = await collect(csv_chunks(stream([]), ["type"]))
+        assert chunks == ["type\r\n"]
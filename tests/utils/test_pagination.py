@@ -0,0 +1,76 @@
+from datetime import datetime
+
+import pytest
+from bson.objectid import ObjectId
+
+from app.adapters.db.utils.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+    merge_filters,
+)
+
+FIRST = datetime(2025, 1, 1, 12, 0, 0, 123000)
+SECOND = datetime(2025, 1, 1, 11, 0, 0)
+
+
+@pytest.fixture
+def documents():
+    return [
+        {"_id": ObjectId(), "created_at": FIRST},
+        {"_id": ObjectId(), "created_at": SECOND},
+        {"_id": ObjectId(), "created_at": SECOND},
+    ]
+
+
+class TestCursor:
+    def test_round_trip(self, documents):
+        token = encode_cursor("created_at", -1, documents)
+        position = decode_cursor(token, "created_at", -1)
+
+        assert position["value"] == SECOND
+        # все строки с последним значением уже отданы
+        assert position["ids"] == [documents[1]["_id"], documents[2]["_id"]]
+
+    def test_tie_group_accumulates_between_pages(self, documents):
+        previous = decode_cursor(encode_cursor("created_at", -1, documents), "created_at", -1)
+        next_page = [{"_id": ObjectId(), "created_at": SECOND}]
+
+        token = encode_cursor("created_at", -1, next_page, previous)
+        position = decode_cursor(token, "created_at", -1)
+
+        assert len(position["ids"]) == 3
+
+    @pytest.mark.parametrize(
+        "sort_field, sort_order",
+        [("severity", -1), ("created_at", 1)],
+    )
+    def test_other_sorting_is_rejected(self, documents, sort_field, sort_order):
+        token = encode_cursor("created_at", -1, documents)
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(token, sort_field, sort_order)
+
+    @pytest.mark.parametrize("token", ["not-a-token", "e30=", ""])
+    def test_malformed_token_is_rejected(self, token):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(token, "created_at", -1)
+
+
+class TestKeysetFilter:
+    def test_descending(self):
+        ids = [ObjectId()]
+        result = keyset_filter("created_at", -1, {"value": FIRST, "ids": ids})
+        assert result == {"created_at": {"$lte": FIRST}, "_id": {"$nin": ids}}
+
+    def test_ascending_by_id(self):
+        last_id = ObjectId()
+        result = keyset_filter("_id", 1, {"value": last_id, "ids": [last_id]})
+        assert result == {"_id": {"$gt": last_id}}
+
+    def test_merge_keeps_both_conditions_on_same_field(self):
+        base = {"type": {"$in": ["A"]}, "created_at": {"$gte": SECOND}}
+        extra = {"created_at": {"$lte": FIRST}, "_id": {"$nin": []}}
+
+        assert merge_filters(base, extra) == {"$and": [base, extra]}
+        assert merge_filters({"type": "A"}, {"_id": 1}) == {"type": "A", "_id": 1}
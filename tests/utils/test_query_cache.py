@@ -0,0 +1,101 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.events_service import EventService
+from app.utils.query_cache import QueryCache, make_query_key
+
+
+@pytest.fixture
+def loader():
+    return AsyncMock(return_value=["result"])
+
+
+class TestQueryKey:
+    def test_same_query_same_key(self):
+        first = make_query_key("events", {"event_type": "A,B", "hours": 1}, {"limit": 10})
+        second = make_query_key("events", {"hours": 1, "event_type": "B,A"}, {"limit": 10})
+        assert first == second
+
+    def test_empty_values_are_ignored(self):
+        assert make_query_key("events", {"source": None}) == make_query_key("events", {})
+
+    def test_pagination_is_part_of_key(self):
+        assert make_query_key("events", {}, {"offset": 1}) != make_query_key(
+            "events", {}, {"offset": 2}
+        )
+
+
+class TestQueryCache:
+    async def test_hit_and_miss(self, loader):
+        cache = QueryCache()
+        key = make_query_key("events", {})
+
+        assert await cache.get_or_load(key, loader) == ["result"]
+        assert await cache.get_or_load(key, loader) == ["result"]
+
+        loader.assert_called_once()
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    async def test_expired_entry_is_reloaded(self, loader):
+        cache = QueryCache(ttl=0)
+        key = make_query_key("events", {})
+
+        await cache.get_or_load(key, loader)
+        await cache.get_or_load(key, loader)
+
+        assert loader.call_count == 2
+
+    async def test_lru_eviction(self, loader):
+        cache = QueryCache(max_entries=2)
+        for page in (1, 2, 3):
+            await cache.get_or_load(make_query_key("events", {"offset": page}), loader)
+
+        assert len(cache) == 2
+        assert cache.stats()["evictions"] == 1
+
+    async def test_invalidation_by_type(self, loader):
+        cache = QueryCache(invalidation_window=0)
+        payments = {"event_type": "PAYMENT_FAILED"}
+        logins = {"event_type": "USER_LOGIN_FAILED"}
+        await cache.get_or_load(make_query_key("events", payments), loader, payments)
+        await cache.get_or_load(make_query_key("events", logins), loader, logins)
+        await cache.get_or_load(make_query_key("events", {}), loader, {})
+
+        affected = cache.invalidate(types={"PAYMENT_FAILED"}, sources={"payment-service"})
+
+        # фильтр по платежам и запрос без фильтра
+        assert affected == 2
+        await cache.get_or_load(make_query_key("events", logins), loader, logins)
+        assert loader.call_count == 3
+
+    async def test_invalidation_by_source(self, loader):
+        cache = QueryCache(invalidation_window=0)
+        auth = {"source": "auth-service"}
+        await cache.get_or_load(make_query_key("events", auth), loader, auth)
+
+        assert cache.invalidate(types={"ORDER_CREATED"}, sources={"order-service"}) == 0
+        assert cache.invalidate(types={"USER_LOGIN_FAILED"}, sources={"auth-service"}) == 1
+
+
+class TestEventServiceCache:
+    async def test_events_list_is_cached(self, mock_event_crud):
+        service = EventService(mock_event_crud, cache=QueryCache())
+
+        await service.get_events_list({"event_type": "A"}, {"limit": 10})
+        await service.get_events_list({"event_type": "A"}, {"limit": 10})
+
+        mock_event_crud.get_filtered_events.assert_called_once()
+
+    async def test_ingest_invalidates_cache(self, mock_event_crud, event_data):
+        cache = QueryCache(invalidation_window=0)
+        service = EventService(mock_event_crud, cache=cache)
+        mock_event_crud.bulk_create.return_value = ["id1"]
+        filter = {"event_type": event_data["type"]}
+
+        await service.get_events_list(filter, {})
+        await service.ingest_events([event_data])
+        await service.get_events_list(filter, {})
+
+        assert mock_event_crud.get_filtered_events.call_count == 2
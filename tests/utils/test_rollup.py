@@ -0,0 +1,96 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.adapters.db.cruds.metrics import MetricsCRUD
+from app.adapters.db.utils.expire import get_severity_band
+from app.adapters.db.utils.rollup import ROLLUP_PERIODS, bucket_start, rollup_events
+from app.utils.enums import MetricPeriodEnum, SeverityBandEnum
+
+MOMENT = datetime(2025, 3, 14, 15, 9, 26, tzinfo=timezone.utc)
+
+
+class TestBucketStart:
+    @pytest.mark.parametrize(
+        "period, expected",
+        [
+            (MetricPeriodEnum.minute, datetime(2025, 3, 14, 15, 9, tzinfo=timezone.utc)),
+            (MetricPeriodEnum.five_minutes, datetime(2025, 3, 14, 15, 5, tzinfo=timezone.utc)),
+            (MetricPeriodEnum.hour, datetime(2025, 3, 14, 15, tzinfo=timezone.utc)),
+            (MetricPeriodEnum.day, datetime(2025, 3, 14, tzinfo=timezone.utc)),
+        ],
+    )
+    def test_bucket_start(self, period, expected):
+        assert bucket_start(MOMENT, period) == expected
+
+    def test_naive_datetime_is_utc(self):
+        naive = MOMENT.replace(tzinfo=None)
+        assert bucket_start(naive, MetricPeriodEnum.hour) == bucket_start(
+            MOMENT, MetricPeriodEnum.hour
+        )
+
+
+class TestSeverityBand:
+    @pytest.mark.parametrize(
+        "severity, band",
+        [
+            (None, SeverityBandEnum.low),
+            ("jjjj", SeverityBandEnum.low),
+            (4, SeverityBandEnum.low),
+            ("5", SeverityBandEnum.medium),
+            (7, SeverityBandEnum.medium),
+            (8, SeverityBandEnum.critical),
+        ],
+    )
+    def test_band(self, severity, band):
+        assert get_severity_band(severity) == band
+
+
+class TestRollupEvents:
+    def test_events_are_counted_per_bucket(self):
+        events = [
+            {"type": "A", "source": "s", "severity": 2, "created_at": MOMENT},
+            {"type": "A", "source": "s", "severity": 3, "created_at": MOMENT},
+            {"type": "B", "source": "s", "severity": 9, "created_at": MOMENT},
+        ]
+
+        counters = rollup_events(events)
+
+        # 2 ключа (A/low, B/critical) в каждом периоде
+        assert len(counters) == 2 * len(ROLLUP_PERIODS)
+        hour_a = next(
+            counter
+            for key, counter in counters.items()
+            if key.period == MetricPeriodEnum.hour and key.event_type == "A"
+        )
+        assert hour_a.count == 2
+        assert hour_a.severity_sum == 5
+        assert hour_a.last_event == MOMENT
+
+
+class TestMetricsCRUD:
+    async def test_register_events_upserts_buckets(self):
+        crud = MetricsCRUD(MagicMock())
+        crud.table = MagicMock()
+        crud.table.bulk_write = AsyncMock()
+        events = [{"type": "A", "source": "s", "severity": 9, "created_at": MOMENT}]
+
+        await crud.register_events(events)
+
+        operations = crud.table.bulk_write.call_args.args[0]
+        assert len(operations) == len(ROLLUP_PERIODS)
+        day = next(op for op in operations if op._filter["period"] == "1d")
+        assert day._filter["timestamp"] == datetime(2025, 3, 14, tzinfo=timezone.utc)
+        assert day._filter["dimensions.severity_band"] == "critical"
+        assert day._doc["$inc"] == {"value": 1, "severity_sum": 9}
+        assert day._upsert
+
+    async def test_nothing_to_register(self):
+        crud = MetricsCRUD(MagicMock())
+        crud.table = MagicMock()
+        crud.table.bulk_write = AsyncMock()
+
+        await crud.register_events([])
+
+        crud.table.bulk_write.assert_not_called()
@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from app.services.events_service import EventService
+from app.utils.query_cache import make_query_key
+from app.utils.single_flight import SingleFlight
+
+
+class SlowLoader:
+    def __init__(self, result=None, error: Exception | None = None):
+        self.calls = 0
+        self.result = result
+        self.error = error
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return self.result
+
+
+class TestSingleFlight:
+    async def test_concurrent_calls_are_collapsed(self):
+        single_flight = SingleFlight()
+        loader = SlowLoader(result=["event"])
+        key = make_query_key("events_list", {"event_type": "PAYMENT_FAILED"})
+
+        waiters = [
+            asyncio.ensure_future(single_flight.do(key, loader)) for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        loader.release.set()
+
+        assert await asyncio.gather(*waiters) == [["event"]] * 5
+        assert loader.calls == 1
+        assert single_flight.stats() == {
+            "in_flight": 0,
+            "calls": 5,
+            "executions": 1,
+            "collapsed": 4,
+        }
+
+    async def test_different_keys_are_not_collapsed(self):
+        single_flight = SingleFlight()
+        loader = SlowLoader()
+        loader.release.set()
+
+        await asyncio.gather(
+            single_flight.do(make_query_key("events_list", {"source": "a"}), loader),
+            single_flight.do(make_query_key("events_list", {"source": "b"}), loader),
+        )
+
+        assert loader.calls == 2
+
+    async def test_key_is_released_after_completion(self):
+        single_flight = SingleFlight()
+        loader = SlowLoader()
+        loader.release.set()
+        key = make_query_key("types_statistics")
+
+        await single_flight.do(key, loader)
+        await single_flight.do(key, loader)
+
+        assert loader.calls == 2
+        assert len(single_flight) == 0
+
+    async def test_error_is_shared(self):
+        single_flight = SingleFlight()
+        loader = SlowLoader(error=RuntimeError("mongo is down"))
+        key = make_query_key("types_statistics")
+
+        waiters = [
+            asyncio.ensure_future(single_flight.do(key, loader)) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        loader.release.set()
+
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert loader.calls == 1
+
+    async def test_cancelled_waiter_does_not_cancel_query(self):
+        single_flight = SingleFlight()
+        loader = SlowLoader(result="ok")
+        key = make_query_key("types_statistics")
+
+        first = asyncio.ensure_future(single_flight.do(key, loader))
+        second = asyncio.ensure_future(single_flight.do(key, loader))
+        await asyncio.sleep(0)
+        first.cancel()
+        loader.release.set()
+
+        assert await second == "ok"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+
+class TestEventServiceSingleFlight:
+    async def test_concurrent_list_requests_share_query(self, mock_event_crud):
+        release = asyncio.Event()
+
+        async def get_filtered_events(filter, pagination):
+            await release.wait()
+            return ["page"]
+
+        mock_event_crud.get_filtered_events.side_effect = get_filtered_events
+        service = EventService(mock_event_crud, single_flight=SingleFlight())
+
+        waiters = [
+            asyncio.ensure_future(
+                service.get_events_list({"event_type": "A,B"}, {"limit": 10})
+            ),
+            asyncio.ensure_future(
+                service.get_events_list({"event_type": "B,A"}, {"limit": 10})
+            ),
+        ]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == [["page"], ["page"]]
+        mock_event_crud.get_filtered_events.assert_called_once()
@@ -0,0 +1,53 @@
+from app.utils.sliding_window import SlidingWindowCounter
+
+
+class TestSlidingWindowCounter:
+    def test_fires_on_threshold_within_window(self):
+        counter = SlidingWindowCounter(threshold=3, window=60)
+
+        assert counter.hit("user-1", now=0) is False
+        assert counter.hit("user-1", now=10) is False
+        assert counter.hit("user-1", now=20) is True
+        assert counter.fired == 1
+
+    def test_counter_is_reset_after_firing(self):
+        counter = SlidingWindowCounter(threshold=2, window=60)
+
+        counter.hit("user-1", now=0)
+        assert counter.hit("user-1", now=1) is True
+        assert counter.hit("user-1", now=2) is False
+
+    def test_old_events_slide_out(self):
+        counter = SlidingWindowCounter(threshold=3, window=60)
+
+        counter.hit("user-1", now=0)
+        counter.hit("user-1", now=30)
+        assert counter.hit("user-1", now=61) is False
+        # В окне [30, 90] три события
+        assert counter.hit("user-1", now=90) is True
+
+    def test_keys_are_counted_separately(self):
+        counter = SlidingWindowCounter(threshold=2, window=60)
+
+        assert counter.hit("user-1", now=0) is False
+        assert counter.hit("user-2", now=1) is False
+        assert counter.hit("user-1", now=2) is True
+
+    def test_expired_keys_are_purged(self):
+        counter = SlidingWindowCounter(threshold=5, window=60)
+        counter.hit("user-1", now=0)
+        counter.hit("user-2", now=50)
+
+        counter.hit("user-3", now=100)
+
+        assert len(counter) == 2
+        assert counter.expired == 1
+
+    def test_memory_is_bounded(self):
+        counter = SlidingWindowCounter(threshold=5, window=600, max_keys=100)
+
+        for i in range(1000):
+            counter.hit(f"user-{i}", now=i * 0.1)
+
+        assert len(counter) == 100
+        assert counter.evictions == 900
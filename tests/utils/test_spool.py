@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+
+from app.utils.spool import SegmentSpool
+
+
+def make_events(count: int) -> list[dict]:
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [{"event_id": f"event-{i}", "timestamp": timestamp} for i in range(count)]
+
+
+class TestSegmentSpool:
+    async def test_append_and_read_segment(self, tmp_path):
+        spool = SegmentSpool(tmp_path)
+        await spool.open()
+        events = make_events(3)
+
+        await spool.append(events)
+
+        assert spool.depth == 3
+        segment = await spool.oldest_segment()
+        assert await spool.read(segment) == events
+
+        await spool.remove(segment)
+        assert spool.depth == 0
+        assert await spool.oldest_segment() is None
+        assert not list(tmp_path.iterdir())
+
+    async def test_segments_rotate_by_size(self, tmp_path):
+        spool = SegmentSpool(tmp_path, segment_max_bytes=1)
+        await spool.open()
+
+        await spool.append(make_events(2))
+        await spool.append(make_events(3))
+
+        assert spool.segments == 2
+        first = await spool.oldest_segment()
+        assert len(await spool.read(first)) == 2
+
+    async def test_reopen_picks_up_segments(self, tmp_path):
+        spool = SegmentSpool(tmp_path, fsync_interval=60)
+        await spool.open()
+        await spool.append(make_events(4))
+        await spool.close()
+
+        reopened = SegmentSpool(tmp_path)
+        await reopened.open()
+        await reopened.append(make_events(1))
+
+        assert reopened.depth == 5
+        assert reopened.segments == 2
+
+    async def test_truncated_tail_is_skipped(self, tmp_path):
+        spool = SegmentSpool(tmp_path)
+        await spool.open()
+        await spool.append(make_events(2))
+        segment = await spool.oldest_segment()
+        with open(segment, "ab") as file:
+            file.write(b"\x20\x00\x00")
+
+        assert len(await spool.read(segment)) == 2